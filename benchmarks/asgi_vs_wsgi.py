@@ -0,0 +1,279 @@
+"""
+Compare the throughput of the read-heavy pages served by gunicorn (WSGI,
+sync views) and by uvicorn with the ASGI profile (async views).
+
+    python -m benchmarks.asgi_vs_wsgi --tasks 50000 --concurrency 64
+    python -m benchmarks.asgi_vs_wsgi --slow-clients 200
+
+Both servers run against the same seeded test database, an SQLite file
+unless `DATABASE_URL` points elsewhere. `--slow-clients` keeps that many
+extra connections busy trickling their request headers in, like clients
+on a bad network, while the measured clients hammer the pages.
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from .utils import seed, setup_django, test_database
+
+ROUTES = [
+    ("index", None),
+    ("task-list", None),
+    ("task-detail", "Task"),
+    ("employee-list", None),
+    ("employee-detail", "Employee"),
+]
+
+SCHEMES = {"postgresql": "postgres", "mysql": "mysql", "sqlite": "sqlite"}
+
+
+def database_url(connection) -> str:
+    settings = connection.settings_dict
+
+    if connection.vendor == "sqlite":
+        return f"sqlite:///{settings['NAME']}"
+
+    return (
+        f"{SCHEMES[connection.vendor]}://{settings['USER']}:"
+        f"{settings['PASSWORD']}@{settings['HOST']}:{settings['PORT']}/"
+        f"{settings['NAME']}"
+    )
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def server_command(kind: str, port: int, args) -> tuple[list, dict]:
+    if kind == "wsgi":
+        command = [
+            "gunicorn",
+            "coordinate.wsgi:application",
+            f"--bind=127.0.0.1:{port}",
+            f"--workers={args.workers}",
+            f"--threads={args.threads}",
+        ]
+        settings_module = "coordinate.settings"
+    else:
+        command = [
+            "uvicorn",
+            "coordinate.asgi:application",
+            f"--port={port}",
+            f"--workers={args.workers}",
+            "--no-access-log",
+        ]
+        settings_module = "coordinate.settings_asgi"
+
+    return command, {"DJANGO_SETTINGS_MODULE": settings_module}
+
+
+def wait_for_port(port: int, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), 0.2).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+
+    raise RuntimeError(f"Server did not start on port {port}")
+
+
+async def fetch(port: int, path: str, cookie: str) -> int:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+
+    try:
+        writer.write(
+            f"GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\n"
+            f"Cookie: {cookie}\r\nConnection: close\r\n\r\n".encode()
+        )
+        await writer.drain()
+        status_line = await reader.readline()
+        await reader.read()
+    finally:
+        writer.close()
+
+    return int(status_line.split()[1])
+
+
+async def slow_client(port: int, path: str, interval: float) -> None:
+    request = f"GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\n".encode()
+
+    while True:
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+
+            for byte in request:
+                writer.write(bytes([byte]))
+                await writer.drain()
+                await asyncio.sleep(interval)
+
+            writer.close()
+        except OSError:
+            await asyncio.sleep(interval)
+
+
+async def load(port: int, path: str, cookie: str, args) -> dict:
+    latencies, errors = [], 0
+    deadline = time.monotonic() + args.duration
+
+    async def client():
+        nonlocal errors
+
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+
+            try:
+                status = await fetch(port, path, cookie)
+            except OSError:
+                status = None
+
+            if status == 200:
+                latencies.append(time.perf_counter() - start)
+            else:
+                errors += 1
+
+    slow = [
+        asyncio.create_task(slow_client(port, path, args.slow_interval))
+        for _ in range(args.slow_clients)
+    ]
+    await asyncio.gather(*(client() for _ in range(args.concurrency)))
+
+    for task in slow:
+        task.cancel()
+
+    latencies.sort()
+
+    return {
+        "rps": len(latencies) / args.duration,
+        "p50": statistics.median(latencies) * 1000 if latencies else 0.0,
+        "p95": (
+            latencies[int(len(latencies) * 0.95)] * 1000 if latencies else 0.0
+        ),
+        "errors": errors,
+    }
+
+
+def benchmark(kind: str, paths: list, cookie: str, url: str, args) -> dict:
+    port = free_port()
+    command, env = server_command(kind, port, args)
+    server = subprocess.Popen(
+        command,
+        env={
+            **os.environ,
+            **env,
+            "DATABASE_URL": url,
+            "DJANGO_DEBUG": "False",
+        },
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+    try:
+        wait_for_port(port)
+
+        return {
+            path: asyncio.run(load(port, path, cookie, args)) for path in paths
+        }
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--tasks", type=int, default=20_000)
+    parser.add_argument("--employees", type=int, default=500)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--slow-clients", type=int, default=0)
+    parser.add_argument(
+        "--slow-interval",
+        type=float,
+        default=0.5,
+        help="Seconds between two bytes sent by a slow client.",
+    )
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=8,
+        help="Threads per gunicorn worker.",
+    )
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.apps import apps
+    from django.conf import settings
+    from django.test import Client
+    from django.urls import reverse
+
+    with tempfile.TemporaryDirectory() as directory, test_database(
+        str(Path(directory) / "benchmark.sqlite3")
+    ) as connection:
+        print(f"Seeding {args.tasks} tasks on {connection.vendor}...")
+        seed(tasks=args.tasks, employees=args.employees)
+
+        paths = [
+            reverse(
+                f"task_manager:{name}",
+                args=(
+                    [apps.get_model("task_manager", model).objects.first().pk]
+                    if model
+                    else []
+                ),
+            )
+            for name, model in ROUTES
+        ]
+        client = Client()
+        client.force_login(
+            apps.get_model("task_manager", "Employee").objects.first()
+        )
+        cookie = (
+            f"{settings.SESSION_COOKIE_NAME}="
+            f"{client.cookies[settings.SESSION_COOKIE_NAME].value}"
+        )
+        url = database_url(connection)
+        connection.close()
+
+        results = {
+            kind: benchmark(kind, paths, cookie, url, args)
+            for kind in ("wsgi", "asgi")
+        }
+
+    print(
+        f"\n{args.concurrency} clients, {args.slow_clients} slow clients, "
+        f"{args.workers} workers, {args.duration:.0f} s per page\n"
+    )
+    print(
+        f"{'page':<24} {'server':<6} {'req/s':>9} {'p50 ms':>9} "
+        f"{'p95 ms':>9} {'errors':>7}"
+    )
+
+    for path in paths:
+        for kind, pages in results.items():
+            result = pages[path]
+            print(
+                f"{path:<24} {kind:<6} {result['rps']:>9.1f} "
+                f"{result['p50']:>9.1f} {result['p95']:>9.1f} "
+                f"{result['errors']:>7}"
+            )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""
+Measure the per-request cost of the session and authentication
+middleware, with the database session store and `ModelBackend` they
+replaced, and with the cached ones of `task_manager/auth.py`.
+
+    python -m benchmarks.auth_overhead --requests 2000
+"""
+
+import argparse
+
+from .utils import best_of, seed, setup_django, test_database
+
+CONFIGURATIONS = [
+    (
+        "database",
+        "django.contrib.sessions.backends.db",
+        "django.contrib.auth.backends.ModelBackend",
+    ),
+    (
+        "cached",
+        "django.contrib.sessions.backends.cached_db",
+        "task_manager.auth.CachedModelBackend",
+    ),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=1_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from importlib import import_module
+
+    from django.conf import settings
+    from django.contrib.auth import (
+        BACKEND_SESSION_KEY,
+        HASH_SESSION_KEY,
+        SESSION_KEY,
+    )
+    from django.contrib.auth.middleware import AuthenticationMiddleware
+    from django.contrib.sessions.middleware import SessionMiddleware
+    from django.http import HttpResponse
+    from django.test import RequestFactory, override_settings
+    from django.test.utils import CaptureQueriesContext
+
+    from task_manager.models import Employee
+
+    def view(request):
+        # The user, with their position, as the pages show them.
+        str(request.user.position)
+        return HttpResponse()
+
+    with test_database() as connection:
+        print(f"Seeding employees on {connection.vendor}...")
+        seed(tasks=0, employees=100)
+        employee = Employee.objects.get(username="employee0")
+        factory = RequestFactory()
+
+        for name, engine, backend in CONFIGURATIONS:
+            with override_settings(
+                SESSION_ENGINE=engine, AUTHENTICATION_BACKENDS=[backend]
+            ):
+                session = import_module(engine).SessionStore()
+                session[SESSION_KEY] = str(employee.pk)
+                session[BACKEND_SESSION_KEY] = backend
+                session[HASH_SESSION_KEY] = employee.get_session_auth_hash()
+                session.save()
+
+                handler = SessionMiddleware(AuthenticationMiddleware(view))
+
+                def request():
+                    request = factory.get("/")
+                    request.COOKIES[settings.SESSION_COOKIE_NAME] = (
+                        session.session_key
+                    )
+                    handler(request)
+
+                def run():
+                    for _ in range(args.requests):
+                        request()
+
+                # Warm the caches up.
+                request()
+
+                with CaptureQueriesContext(connection) as queries:
+                    request()
+
+                milliseconds = best_of(run, args.repeat)
+
+            print(
+                f"{name}: {milliseconds * 1000 / args.requests:.1f} µs "
+                f"and {len(queries)} queries per request"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Time the deadline digests for a large headcount, with the dummy email
+backend, and record the queries and the peak Python memory. The dummy
+backend drops the messages, where the local memory one would keep them
+all in memory.
+
+    python -m benchmarks.deadline_digests --employees 100000
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from .utils import seed, setup_django, test_database
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--employees", type=int, default=100_000)
+    parser.add_argument("--tasks", type=int, default=200_000)
+    parser.add_argument("--days", type=int, default=3)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from datetime import timedelta
+
+    from django.core import mail
+    from django.test.utils import CaptureQueriesContext
+
+    from task_manager.digests import send_deadline_digests
+
+    with test_database() as connection:
+        print(
+            f"Seeding {args.employees} employees and {args.tasks} tasks "
+            f"on {connection.vendor}..."
+        )
+        seed(tasks=args.tasks, employees=args.employees)
+
+        backend = mail.get_connection(
+            "django.core.mail.backends.dummy.EmailBackend"
+        )
+        tracemalloc.start()
+        start = time.perf_counter()
+
+        with CaptureQueriesContext(connection) as queries:
+            sent = send_deadline_digests(
+                timedelta(days=args.days), connection=backend
+            )
+
+        seconds = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print(
+            f"{sent} digests in {seconds:.1f} s, {len(queries)} queries, "
+            f"{peak / 2**20:.1f} MiB peak memory"
+        )
+
+
+if __name__ == "__main__":
+    main()
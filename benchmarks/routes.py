@@ -0,0 +1,269 @@
+"""
+Drive every named route in `task_manager/urls.py` through the test
+client against a seeded database, recording wall time, query count and
+peak Python memory per route.
+
+    python -m benchmarks.routes --tasks 100000 --output bench.json
+    python -m benchmarks.routes --compare bench.json
+
+Results are written as JSON, so runs on different commits can be
+diffed or compared with `--compare`.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from itertools import cycle
+
+from .utils import seed, setup_django, test_database
+
+# Tasks changed at once by the bulk action.
+BULK_TASKS = 50
+
+
+def bulk_payload():
+    """
+    Set the priority of the first `BULK_TASKS` tasks, alternating between
+    two priorities so that every request changes all of them.
+    """
+    from task_manager.models import Task
+
+    task_ids = list(
+        Task.objects.order_by("id").values_list("id", flat=True)[:BULK_TASKS]
+    )
+    priorities = cycle([Task.HIGH, Task.LOW])
+
+    return lambda: {
+        "tasks": task_ids,
+        "action": "set_priority",
+        "priority": next(priorities),
+    }
+
+
+# Routes that only accept POST, and the factories of their payload
+# builders, called once per run and then once per request.
+POST_ROUTES = {
+    "toggle-task-assign-json": lambda: dict,
+    "task-bulk": bulk_payload,
+}
+
+# Query strings of the routes that do no work without one.
+QUERY_PARAMS = {"employee-autocomplete": {"q": "employee1"}}
+
+# URL name prefixes and the model whose primary key they take.
+PK_MODELS = [
+    ("api-task-type", "TaskType"),
+    ("api-task", "Task"),
+    ("api-employee", "Employee"),
+    ("api-position", "Position"),
+    ("task-type", "TaskType"),
+    ("toggle-task", "Task"),
+    ("task", "Task"),
+    ("employee", "Employee"),
+    ("position", "Position"),
+]
+
+# Values for the other path converters.
+KWARG_VALUES = {"export_format": "csv"}
+
+
+def named_routes():
+    from task_manager import urls
+
+    return [pattern for pattern in urls.urlpatterns if pattern.name]
+
+
+def route_kwargs(pattern, sample_pks):
+    kwargs = {}
+
+    for name in pattern.pattern.converters:
+        if name == "pk":
+            model = next(
+                model
+                for prefix, model in PK_MODELS
+                if pattern.name.startswith(prefix)
+            )
+            kwargs[name] = sample_pks[model]
+        else:
+            kwargs[name] = KWARG_VALUES[name]
+
+    return kwargs
+
+
+def request(client, method, url, data):
+    response = getattr(client, method)(url, data())
+
+    if response.streaming:
+        size = sum(len(chunk) for chunk in response.streaming_content)
+    else:
+        size = len(response.content)
+
+    return response.status_code, size
+
+
+def measure(client, method, url, data):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    with CaptureQueriesContext(connection) as queries:
+        start = time.perf_counter()
+        status, size = request(client, method, url, data)
+        elapsed = time.perf_counter() - start
+
+    return {
+        "status": status,
+        "bytes": size,
+        "ms": elapsed * 1000,
+        "queries": len(queries),
+    }
+
+
+def peak_memory(client, method, url, data):
+    """
+    Peak Python memory of a request, in KiB. It is measured on a separate
+    request, as tracing slows everything down.
+    """
+    tracemalloc.start()
+    request(client, method, url, data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return peak / 1024
+
+
+def run(args):
+    from django.apps import apps
+    from django.test import Client
+    from django.urls import reverse
+
+    results = {}
+
+    with test_database() as connection:
+        print(f"Seeding {args.tasks} tasks on {connection.vendor}...")
+        seed(
+            tasks=args.tasks,
+            employees=args.employees,
+            assignees_per_task=args.assignees,
+        )
+
+        sample_pks = {
+            name: apps.get_model("task_manager", name)
+            .objects.order_by("id")
+            .values_list("id", flat=True)
+            .first()
+            for _, name in PK_MODELS
+        }
+        client = Client()
+        client.force_login(
+            apps.get_model("task_manager", "Employee").objects.first()
+        )
+
+        for pattern in named_routes():
+            url = reverse(
+                f"task_manager:{pattern.name}",
+                kwargs=route_kwargs(pattern, sample_pks),
+            )
+            if pattern.name in POST_ROUTES:
+                method, data = "post", POST_ROUTES[pattern.name]()
+            else:
+                params = QUERY_PARAMS.get(pattern.name, {})
+                method, data = "get", lambda: params
+
+            measure(client, method, url, data)  # Warm up caches.
+            runs = [
+                measure(client, method, url, data) for _ in range(args.repeat)
+            ]
+
+            results[pattern.name] = {
+                "url": url,
+                "method": method.upper(),
+                "status": runs[-1]["status"],
+                "bytes": runs[-1]["bytes"],
+                "queries": max(run["queries"] for run in runs),
+                "median_ms": statistics.median(run["ms"] for run in runs),
+                "min_ms": min(run["ms"] for run in runs),
+                "peak_kib": peak_memory(client, method, url, data),
+            }
+            print(
+                f"{pattern.name:28} {results[pattern.name]['status']:>4} "
+                f"{results[pattern.name]['median_ms']:>9.2f} ms "
+                f"{results[pattern.name]['queries']:>4} queries "
+                f"{results[pattern.name]['peak_kib']:>9.0f} KiB"
+            )
+
+        vendor = connection.vendor
+
+    return {
+        "commit": git_commit(),
+        "created": datetime.now(timezone.utc).isoformat(),
+        "vendor": vendor,
+        "dataset": {
+            "tasks": args.tasks,
+            "employees": args.employees,
+            "assignees_per_task": args.assignees,
+        },
+        "repeat": args.repeat,
+        "routes": results,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(previous, current):
+    print(f"\nCompared with {previous.get('commit') or 'previous run'}:")
+
+    for name, result in current["routes"].items():
+        if (before := previous["routes"].get(name)) is None:
+            print(f"{name:28} new route")
+            continue
+
+        change = (result["median_ms"] / before["median_ms"] - 1) * 100
+        queries = result["queries"] - before["queries"]
+        print(
+            f"{name:28} {change:>+8.1f}% time {queries:>+5} queries "
+            f"{result['peak_kib'] - before['peak_kib']:>+9.0f} KiB"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument("--tasks", type=int, default=10_000)
+    parser.add_argument("--employees", type=int, default=500)
+    parser.add_argument("--assignees", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="Write the results to this file.")
+    parser.add_argument(
+        "--compare", help="Results file of a previous run to compare with."
+    )
+    args = parser.parse_args()
+
+    setup_django()
+    results = run(args)
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+
+    if args.compare:
+        with open(args.compare) as previous:
+            compare(json.load(previous), results)
+
+
+if __name__ == "__main__":
+    main()
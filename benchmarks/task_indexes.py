@@ -0,0 +1,86 @@
+"""
+Compare query plans and timings of the hot `Task` queries with and
+without the indexes declared on `Task.Meta`.
+
+    python -m benchmarks.task_indexes --tasks 200000
+"""
+
+import argparse
+from datetime import date
+
+from .utils import best_of, seed, setup_django, test_database
+
+
+def hot_queries():
+    from task_manager.models import Task
+    from task_manager.pagination import keyset_filter
+
+    today = date.today()
+    ordering = ("is_completed", "deadline", "id")
+    open_tasks = Task.objects.filter(is_completed=False).order_by()
+    first_page = Task.objects.order_by(*ordering)
+    # The position a cursor would point at 90% of the way through the list.
+    deep_position = list(
+        first_page.values_list(*ordering)[Task.objects.count() * 9 // 10]
+    )
+
+    return {
+        "open tasks": open_tasks,
+        "open urgent tasks": open_tasks.filter(priority=Task.URGENT),
+        "open outdated tasks": open_tasks.filter(deadline__lt=today),
+        "list, first page": first_page[:10],
+        "list, deep keyset page": first_page.filter(
+            keyset_filter(ordering, deep_position)
+        )[:10],
+    }
+
+
+def analyze(connection) -> None:
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+
+
+def report(connection, title: str, repeat: int) -> None:
+    print(f"\n=== {title} ===")
+
+    for name, queryset in hot_queries().items():
+        if queryset.query.is_sliced:
+            run = lambda: list(queryset.all())  # noqa: E731
+        else:
+            run = queryset.count
+        milliseconds = best_of(run, repeat)
+
+        print(f"\n-- {name}: {milliseconds:.2f} ms")
+        print(queryset.explain())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=200_000)
+    parser.add_argument("--employees", type=int, default=1_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from task_manager.models import Task
+
+    with test_database() as connection:
+        print(f"Seeding {args.tasks} tasks on {connection.vendor}...")
+        seed(tasks=args.tasks, employees=args.employees)
+
+        with connection.schema_editor() as editor:
+            for index in Task._meta.indexes:
+                editor.remove_index(Task, index)
+        analyze(connection)
+        report(connection, "without Task indexes", args.repeat)
+
+        with connection.schema_editor() as editor:
+            for index in Task._meta.indexes:
+                editor.add_index(Task, index)
+        analyze(connection)
+        report(connection, "with Task indexes", args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Compare the full-text task search with the `icontains` lookup it
+replaced.
+
+    python -m benchmarks.task_search --tasks 1000000
+"""
+
+import argparse
+
+from .utils import best_of, seed, setup_django, test_database
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=200_000)
+    parser.add_argument("--query", default="4242")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.db.models import Q
+
+    from task_manager.models import Task
+    from task_manager.search import search_tasks
+
+    with test_database() as connection:
+        print(f"Seeding {args.tasks} tasks on {connection.vendor}...")
+        seed(tasks=args.tasks, employees=100, assignees_per_task=0)
+
+        queryset = Task.objects.select_related("task_type")
+        condition = Q()
+        for term in args.query.split():
+            condition &= Q(name__icontains=term) | Q(
+                description__icontains=term
+            )
+
+        for name, results in [
+            ("icontains", queryset.filter(condition)),
+            ("full-text", search_tasks(queryset, args.query)),
+        ]:
+            page = results[:10]
+            milliseconds = best_of(lambda: list(page.all()), args.repeat)
+
+            print(f"\n-- {name}: {milliseconds:.2f} ms")
+            print(page.explain())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Every benchmark runs against a throwaway test database created from the
+configured `default` connection, so the development database is never
+touched. Run them from the project root, e.g.
+`python -m benchmarks.task_indexes --tasks 200000`.
+"""
+
+import os
+import random
+import time
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+import django
+
+DEFAULT_PASSWORD = "benchmark-password"
+
+
+def setup_django(settings_module: str = "coordinate.settings") -> None:
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+    django.setup()
+
+
+@contextmanager
+def test_database(name: str = None):
+    """
+    Pass `name` to choose the test database name, e.g. an SQLite file that
+    other processes can open, instead of an in-memory database.
+    """
+    from django.conf import settings
+    from django.db import connection
+
+    # The test environment's instrumented template rendering and the debug
+    # toolbar would both skew timings.
+    settings.DEBUG = False
+    settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, "testserver"]
+    old_name = connection.settings_dict["NAME"]
+
+    if name is not None:
+        connection.settings_dict["TEST"]["NAME"] = name
+
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def seed(
+    tasks: int = 10_000,
+    employees: int = 100,
+    assignees_per_task: int = 2,
+    batch_size: int = 5_000,
+    seed_value: int = 0,
+) -> None:
+    from django.contrib.auth.hashers import make_password
+
+    from task_manager.models import Employee, Position, Task, TaskType
+
+    rng = random.Random(seed_value)
+    priorities = [code for code, _ in Task.PRIORITY_CHOICES]
+    today = date.today()
+
+    positions = Position.objects.bulk_create(
+        Position(name=f"Position {number}") for number in range(10)
+    )
+    task_types = TaskType.objects.bulk_create(
+        TaskType(name=f"Type {number}") for number in range(10)
+    )
+
+    password = make_password(DEFAULT_PASSWORD)
+    employee_ids = [
+        employee.id
+        for employee in Employee.objects.bulk_create(
+            (
+                Employee(
+                    username=f"employee{number}",
+                    first_name="Employee",
+                    last_name=str(number),
+                    email=f"employee{number}@example.com",
+                    password=password,
+                    position=rng.choice(positions),
+                )
+                for number in range(employees)
+            ),
+            batch_size=batch_size,
+        )
+    ]
+
+    through = Task.assignees.through
+
+    for start in range(0, tasks, batch_size):
+        created = Task.objects.bulk_create(
+            Task(
+                name=f"Task {number}",
+                description=f"Seeded task number {number}",
+                deadline=today + timedelta(days=rng.randint(-365, 365)),
+                is_completed=rng.random() < 0.8,
+                priority=rng.choice(priorities),
+                task_type=rng.choice(task_types),
+            )
+            for number in range(start, min(start + batch_size, tasks))
+        )
+        through.objects.bulk_create(
+            (
+                through(task_id=task.id, employee_id=employee_id)
+                for task in created
+                for employee_id in rng.sample(
+                    employee_ids, min(assignees_per_task, len(employee_ids))
+                )
+            ),
+            batch_size=batch_size,
+        )
+
+
+def best_of(func, repeat: int = 5) -> float:
+    """Return the fastest of `repeat` runs of `func`, in milliseconds."""
+    timings = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    return min(timings) * 1000
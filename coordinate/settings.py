@@ -49,6 +49,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.humanize",
     "debug_toolbar",
     "widget_tweaks",
     "crispy_forms",
@@ -58,6 +59,8 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    "task_manager.query_budget.QueryBudgetMiddleware",
+    "task_manager.db_router.ReplicaRoutingMiddleware",
     "debug_toolbar.middleware.DebugToolbarMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -103,6 +106,50 @@ DATABASES = {
 db_from_env = dj_database_url.config(conn_max_age=500)
 DATABASES["default"].update(db_from_env)
 
+# Read replicas, as space separated URLs, e.g. two SQLite files locally:
+# DATABASE_REPLICA_URLS="sqlite:////tmp/replica1.sqlite3 sqlite:///..."
+# See `task_manager/db_router.py`.
+DATABASE_REPLICAS = []
+
+for number, url in enumerate(
+    os.environ.get("DATABASE_REPLICA_URLS", "").split(), start=1
+):
+    DATABASE_REPLICAS.append(f"replica{number}")
+    DATABASES[f"replica{number}"] = {
+        **dj_database_url.parse(url, conn_max_age=500),
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_ROUTERS = ["task_manager.db_router.PrimaryReplicaRouter"]
+
+# After a write, the client reads from the primary for this many seconds,
+# so that it sees its own writes despite the replication lag.
+DATABASE_REPLICA_STICKY_SECONDS = int(
+    os.environ.get("DATABASE_REPLICA_STICKY_SECONDS", 10)
+)
+
+# Seconds between two health checks of a replica.
+DATABASE_REPLICA_HEALTH_CHECK_INTERVAL = 30
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.1/topics/cache/
+# The local memory cache is per process: with several workers, set REDIS_URL
+# (requires the `redis` package), so that invalidation reaches all of them.
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "OPTIONS": {"MAX_ENTRIES": 50_000},
+    }
+}
+
+if REDIS_URL := os.environ.get("REDIS_URL"):
+    CACHES["default"] = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": REDIS_URL,
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
@@ -124,8 +171,46 @@ AUTH_PASSWORD_VALIDATORS = [
 
 AUTH_USER_MODEL = "task_manager.Employee"
 
+# Sessions and logged in users are read from the cache, see
+# `task_manager/auth.py`. Sessions store the backend that logged them in,
+# so `ModelBackend` stays for those started before the cached one.
+AUTHENTICATION_BACKENDS = [
+    "task_manager.auth.CachedModelBackend",
+    "django.contrib.auth.backends.ModelBackend",
+]
+
+SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
+
 LOGIN_REDIRECT_URL = "/"
 
+# Email
+# https://docs.djangoproject.com/en/4.1/topics/email/
+# Prints the messages by default, set DJANGO_EMAIL_BACKEND and EMAIL_HOST
+# to send them, e.g. "django.core.mail.backends.smtp.EmailBackend".
+
+EMAIL_BACKEND = os.environ.get(
+    "DJANGO_EMAIL_BACKEND", "django.core.mail.backends.console.EmailBackend"
+)
+
+EMAIL_HOST = os.environ.get("EMAIL_HOST", "localhost")
+
+DEFAULT_FROM_EMAIL = os.environ.get(
+    "DEFAULT_FROM_EMAIL", "coordinate@localhost"
+)
+
+# Base of the absolute links in emails, see `task_manager/digests.py`.
+SITE_URL = os.environ.get("SITE_URL", "http://127.0.0.1:8000")
+
+# Query budgets
+# Views declare them with `task_manager.query_budget.query_budget`. Override
+# them by URL name here, e.g.
+# {"task_manager:task-list": {"max_queries": 5, "max_time": 0.5}}.
+
+QUERY_BUDGETS = {}
+
+# Raise instead of logging a warning when a view goes over its budget.
+QUERY_BUDGET_RAISE = False
+
 # Internationalization
 # https://docs.djangoproject.com/en/4.1/topics/i18n/
 
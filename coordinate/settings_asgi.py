@@ -0,0 +1,39 @@
+"""
+ASGI deployment profile, serving the async views of
+`task_manager/async_views.py`:
+
+    REDIS_URL=redis://localhost:6379 \
+        DJANGO_SETTINGS_MODULE=coordinate.settings_asgi \
+        uvicorn coordinate.asgi:application --workers 4
+
+Several workers need the shared cache of REDIS_URL, see `CACHES`.
+
+Every middleware left is async capable, so async views run on the event
+loop and a slow client does not hold a thread.
+"""
+
+from .settings import *  # noqa: F401, F403
+from .settings import DATABASES, INSTALLED_APPS, MIDDLEWARE
+
+ROOT_URLCONF = "coordinate.urls_asgi"
+
+# Sync-only middleware would run each request, the view included, in a
+# thread of its own. WhiteNoise does not support ASGI, so static files
+# have to be served by the reverse proxy from STATIC_ROOT.
+SYNC_ONLY_MIDDLEWARE = [
+    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "debug_toolbar.middleware.DebugToolbarMiddleware",
+]
+
+MIDDLEWARE = [
+    middleware
+    for middleware in MIDDLEWARE
+    if middleware not in SYNC_ONLY_MIDDLEWARE
+]
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app != "debug_toolbar"]
+
+# Async views do not reuse persistent connections, so they would only
+# pile up until they expire. Use a connection pooler instead.
+for database in DATABASES.values():
+    database["CONN_MAX_AGE"] = 0
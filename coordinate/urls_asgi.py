@@ -0,0 +1,10 @@
+"""coordinate URL Configuration of the ASGI profile"""
+
+from django.contrib import admin
+from django.urls import path, include
+
+urlpatterns = [
+    path("admin/", admin.site.urls),
+    path("accounts/", include("django.contrib.auth.urls")),
+    path("", include("task_manager.urls_async", namespace="task_manager")),
+]
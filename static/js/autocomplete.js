@@ -0,0 +1,89 @@
+// Progressive enhancement for the autocomplete widgets: adds a search box
+// above every `select[data-autocomplete-url]`, and a click on a suggestion
+// adds it to the selection, or replaces it for single selects. Clicking a
+// selected option removes it. Only selected options are ever in the
+// `select`, so the form submits their IDs.
+document.addEventListener("DOMContentLoaded", () => {
+  document
+    .querySelectorAll("select[data-autocomplete-url]")
+    .forEach((select) => {
+      const input = document.createElement("input");
+      const results = document.createElement("div");
+      let request = null;
+
+      input.type = "search";
+      input.className = "form-control mb-1";
+      input.placeholder = "Type to search...";
+      input.autocomplete = "off";
+      results.className = "list-group mb-2";
+      select.before(input, results);
+
+      select.querySelectorAll("option").forEach((option) => {
+        option.selected = true;
+      });
+
+      const addOption = (result) => {
+        if (!select.multiple) {
+          select.replaceChildren();
+        }
+
+        if (!select.querySelector(`option[value="${result.id}"]`)) {
+          select.add(new Option(result.text, result.id, true, true));
+        }
+      };
+
+      const showResults = (items) => {
+        results.replaceChildren(
+          ...items.map((result) => {
+            const button = document.createElement("button");
+            button.type = "button";
+            button.className = "list-group-item list-group-item-action";
+            button.textContent = result.text;
+            button.addEventListener("click", () => {
+              addOption(result);
+              results.replaceChildren();
+              input.value = "";
+              input.focus();
+            });
+            return button;
+          })
+        );
+      };
+
+      input.addEventListener("input", () => {
+        const query = input.value.trim();
+
+        if (request) {
+          request.abort();
+        }
+
+        if (!query) {
+          showResults([]);
+          return;
+        }
+
+        request = new AbortController();
+        const url = new URL(select.dataset.autocompleteUrl, location.href);
+        url.searchParams.set("q", query);
+
+        fetch(url, { signal: request.signal })
+          .then((response) => response.json())
+          .then((data) => showResults(data.results))
+          .catch(() => {});
+      });
+
+      select.addEventListener("mousedown", (event) => {
+        if (event.target.tagName === "OPTION") {
+          event.preventDefault();
+          event.target.remove();
+        }
+      });
+
+      // Options were removed, not deselected: keep the rest submitted.
+      select.form.addEventListener("submit", () => {
+        select.querySelectorAll("option").forEach((option) => {
+          option.selected = true;
+        });
+      });
+    });
+});
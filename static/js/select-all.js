@@ -0,0 +1,15 @@
+// A checkbox with `data-select-all="<name>"` checks or unchecks every
+// checkbox named `<name>` in its form.
+document.addEventListener("change", (event) => {
+  const name = event.target.dataset && event.target.dataset.selectAll;
+
+  if (!name) {
+    return;
+  }
+
+  event.target.form
+    .querySelectorAll(`input[type="checkbox"][name="${name}"]`)
+    .forEach((checkbox) => {
+      checkbox.checked = event.target.checked;
+    });
+});
@@ -0,0 +1,99 @@
+// Keeps the task table inside `[data-task-board]` up to date with the
+// Server-Sent Events stream at the URL of that attribute, see
+// `task_manager/events.py`. Rows are patched in place; new tasks are
+// announced above the table, as their position depends on the page.
+document.addEventListener("DOMContentLoaded", () => {
+  const board = document.querySelector("[data-task-board]");
+
+  if (!board || !window.EventSource) {
+    return;
+  }
+
+  const employeeId = Number(board.dataset.employeeId) || null;
+  const source = new EventSource(board.dataset.taskBoard);
+
+  const findRow = (task) =>
+    board.querySelector(`tr[data-task-id="${task.id}"]`);
+
+  const setText = (row, field, value) => {
+    const cell = row.querySelector(`[data-field="${field}"]`);
+
+    if (cell && value !== null && value !== undefined) {
+      cell.textContent = value;
+    }
+  };
+
+  const announce = (task, text) => {
+    const notice = document.createElement("div");
+    const link = document.createElement("a");
+
+    notice.className = "alert alert-info";
+    link.href = `/tasks/${task.id}/`;
+    link.textContent = task.name;
+    notice.append(`${text}: `, link);
+    board.prepend(notice);
+  };
+
+  const patch = (task) => {
+    const row = findRow(task);
+
+    if (!row) {
+      return;
+    }
+
+    setText(row, "name", task.name);
+    setText(row, "task_type", task.task_type);
+    setText(row, "priority", task.priority);
+    setText(row, "deadline", task.deadline);
+    row.classList.toggle("table-success", task.is_completed);
+
+    const toggle = row.querySelector('[data-field="toggle"]');
+
+    if (toggle) {
+      toggle.classList.toggle("btn-outline-danger", task.is_completed);
+      toggle.classList.toggle("btn-outline-success", !task.is_completed);
+      toggle.querySelector("i").className = task.is_completed
+        ? "bi bi-x-square"
+        : "bi bi-check-square";
+    }
+  };
+
+  const concernsEmployee = (task) =>
+    employeeId !== null && (task.employees || []).includes(employeeId);
+
+  ["updated", "completed", "reopened", "assigned"].forEach((kind) => {
+    source.addEventListener(kind, (event) => {
+      const task = JSON.parse(event.data);
+
+      if (kind === "assigned" && concernsEmployee(task) && !findRow(task)) {
+        announce(task, "Newly assigned");
+      } else {
+        patch(task);
+      }
+    });
+  });
+
+  source.addEventListener("created", (event) => {
+    if (employeeId === null) {
+      announce(JSON.parse(event.data), "New task");
+    }
+  });
+
+  source.addEventListener("unassigned", (event) => {
+    const task = JSON.parse(event.data);
+
+    if (concernsEmployee(task) && findRow(task)) {
+      findRow(task).remove();
+    } else {
+      patch(task);
+    }
+  });
+
+  source.addEventListener("deleted", (event) => {
+    const row = findRow(JSON.parse(event.data));
+
+    if (row) {
+      row.remove();
+    }
+  });
+});
@@ -0,0 +1,133 @@
+"""
+Activity log of the task changes: who completed, reopened, reassigned or
+re-prioritised which task, and when.
+
+Views `record()` the changes they make. Once the transaction of a change
+commits, its entries join a per-process buffer, written with a single
+`bulk_create()` when it holds `BUFFER_SIZE` entries, when its oldest
+entry is `FLUSH_INTERVAL` seconds old, or when the process exits, so a
+change costs no `INSERT` of its own. The age is enforced by a timer
+thread, so idle processes flush too.
+
+The history pages flush the buffer of their process first. Entries
+buffered by other processes show up within `FLUSH_INTERVAL`, or are lost
+if their process dies before flushing them.
+"""
+
+import atexit
+import logging
+import threading
+import time
+
+from django.db import DatabaseError, connections, transaction
+from django.utils import timezone
+
+from .models import ActivityLog
+
+logger = logging.getLogger(__name__)
+
+BUFFER_SIZE = 100
+
+FLUSH_INTERVAL = 5.0
+
+
+class ActivityBuffer:
+    """Thread-safe buffer of unsaved `ActivityLog` entries."""
+
+    def __init__(
+        self, size: int = BUFFER_SIZE, interval: float = FLUSH_INTERVAL
+    ):
+        self.size = size
+        self.interval = interval
+        self._entries = []
+        self._oldest = None
+        self._timer = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, entries) -> None:
+        with self._lock:
+            if not self._entries:
+                self._oldest = time.monotonic()
+
+            self._entries.extend(entries)
+            due = (
+                len(self._entries) >= self.size
+                or time.monotonic() - self._oldest >= self.interval
+            )
+
+            if not due and self._timer is None:
+                self._timer = threading.Timer(self.interval, self._on_timer)
+                self._timer.daemon = True
+                self._timer.start()
+
+        if due:
+            self.flush()
+
+    def _on_timer(self) -> None:
+        with self._lock:
+            self._timer = None
+
+        try:
+            self.flush()
+        finally:
+            # The thread's own connection would never be reused.
+            connections.close_all()
+
+    def take(self) -> list:
+        """Empty the buffer and return its entries."""
+        with self._lock:
+            entries, self._entries = self._entries, []
+
+        return entries
+
+    def flush(self) -> int:
+        """Write the buffered entries and return how many there were."""
+        entries = self.take()
+
+        if not entries:
+            return 0
+
+        try:
+            ActivityLog.objects.bulk_create(entries)
+        except DatabaseError:
+            # The change itself is done, so its request must not fail.
+            logger.exception("Lost %d activity log entries", len(entries))
+
+            return 0
+
+        return len(entries)
+
+
+buffer = ActivityBuffer()
+
+atexit.register(buffer.flush)
+
+
+def record(action: str, tasks, actor=None, **data) -> None:
+    """
+    Log `action` on every task of `tasks` by `actor`, the user of the
+    request, with the details of `data`.
+    """
+    now = timezone.now()
+    entries = [
+        ActivityLog(
+            ts=now,
+            # `None` for anonymous users too.
+            actor_id=getattr(actor, "pk", None),
+            task_id=task.id,
+            task_name=task.name,
+            action=action,
+            data=data,
+        )
+        for task in tasks
+    ]
+
+    # Rolled back changes are not logged.
+    transaction.on_commit(lambda: buffer.add(entries))
+
+
+def flush() -> int:
+    return buffer.flush()
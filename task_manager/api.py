@@ -0,0 +1,232 @@
+"""
+Read-only JSON API.
+
+Only the columns named in `?fields=` are selected, lists are paginated
+with cursors, and responses carry an `ETag` computed from the fetched
+rows, so that a matching `If-None-Match` gets a 304 before anything is
+serialized.
+"""
+
+import hashlib
+from functools import wraps
+
+from django.http import Http404, JsonResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+
+from .models import Employee, Position, Task, TaskType
+from .pagination import CursorPaginator, InvalidCursor
+from .query_budget import query_budget
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+
+
+class BadRequest(Exception):
+    pass
+
+
+class Resource:
+    """
+    A model exposed through the API. `fields` maps the public field
+    names to the lookups passed to `QuerySet.values()`.
+    """
+
+    ordering = ("id",)
+
+    def __init__(self, queryset, fields, many_to_many=None):
+        self.queryset = queryset
+        self.fields = fields
+        self.many_to_many = many_to_many or set()
+
+    def parse_fields(self, request) -> list:
+        if not (requested := request.GET.get("fields")):
+            return [*self.fields, *self.many_to_many]
+
+        names = [name for name in map(str.strip, requested.split(",")) if name]
+        unknown = set(names) - self.fields.keys() - self.many_to_many
+
+        if unknown:
+            raise BadRequest(f"Unknown fields: {', '.join(sorted(unknown))}")
+
+        return names
+
+    def fetch_many_to_many(self, names, ids) -> dict:
+        return {
+            name: self.fetch_related(name, ids)
+            for name in names
+            if name in self.many_to_many
+        }
+
+    def values(self, names):
+        lookups = {self.fields[name] for name in names if name in self.fields}
+        lookups.update(self.ordering)
+
+        return self.queryset.values(*lookups)
+
+    def serialize(self, rows, names, related) -> list:
+        return [
+            {
+                name: (
+                    related[name].get(row["id"], [])
+                    if name in related
+                    else row[self.fields[name]]
+                )
+                for name in names
+            }
+            for row in rows
+        ]
+
+    def fetch_related(self, name, ids) -> dict:
+        field = self.queryset.model._meta.get_field(name)
+        through = field.remote_field.through
+        source = field.m2m_field_name()
+        target = field.m2m_reverse_field_name()
+        related = {}
+
+        if not ids:
+            return related
+
+        for source_id, target_id in (
+            through.objects.filter(**{f"{source}_id__in": ids})
+            .order_by(f"{target}_id")
+            .values_list(f"{source}_id", f"{target}_id")
+        ):
+            related.setdefault(source_id, []).append(target_id)
+
+        return related
+
+
+RESOURCES = {
+    "tasks": Resource(
+        Task.objects.all(),
+        {
+            "id": "id",
+            "name": "name",
+            "description": "description",
+            "deadline": "deadline",
+            "is_completed": "is_completed",
+            "priority": "priority",
+            "task_type": "task_type_id",
+            "task_type_name": "task_type__name",
+        },
+        many_to_many={"assignees"},
+    ),
+    "employees": Resource(
+        Employee.objects.all(),
+        {
+            "id": "id",
+            "username": "username",
+            "first_name": "first_name",
+            "last_name": "last_name",
+            "email": "email",
+            "position": "position_id",
+            "position_name": "position__name",
+        },
+    ),
+    "positions": Resource(
+        Position.objects.all(), {"id": "id", "name": "name"}
+    ),
+    "task-types": Resource(
+        TaskType.objects.all(), {"id": "id", "name": "name"}
+    ),
+}
+
+
+def _etag(*parts) -> str:
+    return quote_etag(hashlib.md5(repr(parts).encode()).hexdigest())
+
+
+def api_view(view):
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return JsonResponse(
+                {"error": "Authentication required"}, status=401
+            )
+
+        if request.method not in ("GET", "HEAD"):
+            return JsonResponse({"error": "Method not allowed"}, status=405)
+
+        try:
+            return view(request, *args, **kwargs)
+        except BadRequest as error:
+            return JsonResponse({"error": str(error)}, status=400)
+        except Http404 as error:
+            return JsonResponse({"error": str(error)}, status=404)
+
+    return wrapper
+
+
+def _respond(request, etag, build_payload):
+    if response := get_conditional_response(request, etag=etag):
+        return response
+
+    response = JsonResponse(build_payload())
+    response["ETag"] = etag
+
+    return response
+
+
+@query_budget(4)
+@api_view
+def resource_list(request, resource):
+    resource = RESOURCES[resource]
+    names = resource.parse_fields(request)
+
+    try:
+        limit = min(int(request.GET.get("limit", DEFAULT_LIMIT)), MAX_LIMIT)
+    except ValueError:
+        raise BadRequest("limit must be an integer")
+
+    if limit < 1:
+        raise BadRequest("limit must be positive")
+
+    paginator = CursorPaginator(
+        resource.values(names), limit, resource.ordering
+    )
+
+    try:
+        page = paginator.page(request.GET.get("cursor"))
+    except InvalidCursor:
+        raise BadRequest("Invalid cursor")
+
+    rows = list(page)
+    related = resource.fetch_many_to_many(names, [row["id"] for row in rows])
+    etag = _etag(
+        names,
+        [sorted(row.items()) for row in rows],
+        sorted(related.items()),
+        page.next_cursor,
+        page.previous_cursor,
+    )
+
+    return _respond(
+        request,
+        etag,
+        lambda: {
+            "results": resource.serialize(rows, names, related),
+            "next": page.next_cursor,
+            "previous": page.previous_cursor,
+        },
+    )
+
+
+@query_budget(4)
+@api_view
+def resource_detail(request, resource, pk):
+    resource = RESOURCES[resource]
+    names = resource.parse_fields(request)
+    rows = list(resource.values(names).filter(pk=pk))
+
+    if not rows:
+        raise Http404(f"No {resource.queryset.model.__name__} with id {pk}")
+
+    related = resource.fetch_many_to_many(names, [pk])
+    etag = _etag(names, sorted(rows[0].items()), sorted(related.items()))
+
+    return _respond(
+        request,
+        etag,
+        lambda: resource.serialize(rows, names, related)[0],
+    )
@@ -0,0 +1,111 @@
+"""
+Archive of the completed tasks.
+
+Tasks completed long ago are moved out of `Task` into `ArchivedTask`,
+with their assignees, so the hot table and its indexes only hold the
+tasks that the lists mostly show. The task pages include the archive on
+request, see `views.include_archived()`.
+
+There is no completion date: a completed task is archived once it has
+not changed for `ARCHIVE_AFTER`, its completion being its last change.
+"""
+
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from . import conditional, events
+from .models import ArchivedTask, Task, TaskEvent
+from .signals import tasks_bulk_changed
+
+ARCHIVE_AFTER = timedelta(days=90)
+
+# Tasks moved per transaction, so that no transaction holds locks on the
+# task tables for long.
+BATCH_SIZE = 1_000
+
+ARCHIVED_FIELDS = [
+    "id",
+    "name",
+    "description",
+    "deadline",
+    "priority",
+    "priority_rank",
+    "task_type_id",
+    "updated_at",
+]
+
+
+def archivable_tasks(older_than: timedelta = ARCHIVE_AFTER):
+    return Task.objects.filter(
+        is_completed=True, updated_at__lt=timezone.now() - older_than
+    )
+
+
+def archive_batch(task_ids) -> int:
+    """
+    Move the completed tasks of `task_ids` to the archive, in one
+    transaction, and return how many were moved.
+    """
+    through = Task.assignees.through
+    archived_through = ArchivedTask.assignees.through
+    archived_at = timezone.now()
+
+    with transaction.atomic(), events.batched():
+        # Lock the rows, and drop those reopened or deleted meanwhile.
+        tasks = list(
+            Task.objects.select_for_update()
+            .filter(id__in=task_ids, is_completed=True)
+            .order_by("id")
+            .values(*ARCHIVED_FIELDS)
+        )
+        task_ids = [task["id"] for task in tasks]
+
+        ArchivedTask.objects.bulk_create(
+            ArchivedTask(**task, archived_at=archived_at) for task in tasks
+        )
+        archived_through.objects.bulk_create(
+            archived_through(archivedtask_id=task_id, employee_id=employee_id)
+            for task_id, employee_id in through.objects.filter(
+                task_id__in=task_ids
+            ).values_list("task_id", "employee_id")
+        )
+        Task.delete_many(task_ids)
+
+        tasks_bulk_changed.send(
+            sender=Task,
+            task_ids=task_ids,
+            event=TaskEvent.DELETED,
+            tasks=[Task(**task, is_completed=True) for task in tasks],
+        )
+        conditional.touch(ArchivedTask, archived_through)
+
+    return len(task_ids)
+
+
+def archive_tasks(
+    older_than: timedelta = ARCHIVE_AFTER, batch_size: int = BATCH_SIZE
+):
+    """
+    Archive the tasks completed more than `older_than` ago, one batch of
+    `batch_size` tasks per transaction, and yield the size of every
+    batch.
+    """
+    last_id = 0
+
+    while True:
+        # Keyset iteration: batches never rescan archived ids.
+        task_ids = list(
+            archivable_tasks(older_than)
+            .filter(id__gt=last_id)
+            .order_by("id")
+            .values_list("id", flat=True)[:batch_size]
+        )
+
+        if not task_ids:
+            return
+
+        last_id = task_ids[-1]
+
+        yield archive_batch(task_ids)
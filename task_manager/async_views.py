@@ -0,0 +1,151 @@
+"""
+Async versions of the read-heavy views, routed by `urls_async.py` in the
+ASGI profile (`coordinate.settings_asgi`).
+
+They reuse the querysets and context of their synchronous counterparts in
+`views.py`, but fetch rows with the async ORM methods, so waiting on the
+database does not hold a thread. Templates are still rendered by Django
+in a worker thread.
+"""
+
+import asyncio
+import inspect
+import time
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.views import redirect_to_login
+from django.http import Http404
+from django.shortcuts import render
+
+from . import events, views
+from .counters import aget_counters
+from .query_budget import query_budget
+
+
+async def is_authenticated(request) -> bool:
+    # `request.user` is loaded lazily from the session, which is blocking.
+    return await sync_to_async(lambda: request.user.is_authenticated)()
+
+
+def async_login_required(view):
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if not await is_authenticated(request):
+            return redirect_to_login(request.get_full_path())
+
+        return await view(request, *args, **kwargs)
+
+    return wrapper
+
+
+class AsyncLoginRequiredMixin:
+    """
+    Load the user before `LoginRequiredMixin` checks it, so the check
+    does not query the database from the event loop.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        await is_authenticated(request)
+        response = super().dispatch(request, *args, **kwargs)
+
+        if inspect.isawaitable(response):
+            response = await response
+
+        return response
+
+
+class AsyncListMixin(AsyncLoginRequiredMixin):
+    async def get(self, request, *args, **kwargs):
+        self.object_list = self.get_queryset()
+        self.pagination = await self.apaginate_queryset(
+            self.object_list, self.get_paginate_by(self.object_list)
+        )
+
+        return self.render_to_response(self.get_context_data())
+
+    def paginate_queryset(self, queryset, page_size):
+        # Already paginated by `get()`, without blocking.
+        return self.pagination
+
+
+class AsyncDetailMixin(AsyncLoginRequiredMixin):
+    async def get(self, request, *args, **kwargs):
+        self.object = await self.aget_object()
+
+        return self.render_to_response(self.get_context_data())
+
+    async def aget_object(self, queryset=None):
+        if queryset is None:
+            queryset = self.get_queryset()
+
+        try:
+            return await queryset.aget(pk=self.kwargs[self.pk_url_kwarg])
+        except queryset.model.DoesNotExist:
+            raise Http404(
+                f"No {queryset.model._meta.verbose_name} found matching "
+                "the query"
+            )
+
+
+@query_budget(4)
+@async_login_required
+async def index(request):
+    context = await aget_counters()
+
+    return render(request, "task_manager/index.html", context=context)
+
+
+class TaskTypeListView(AsyncListMixin, views.TaskTypeListView):
+    pass
+
+
+class PositionListView(AsyncListMixin, views.PositionListView):
+    pass
+
+
+class TaskListView(AsyncListMixin, views.TaskListView):
+    pass
+
+
+class EmployeeListView(AsyncListMixin, views.EmployeeListView):
+    pass
+
+
+class TaskDetailView(AsyncDetailMixin, views.TaskDetailView):
+    async def aget_object(self, queryset=None):
+        try:
+            return await super().aget_object(queryset)
+        except Http404:
+            if not views.include_archived(self.request.GET):
+                raise
+
+        return await super().aget_object(self.archived_queryset)
+
+
+class EmployeeDetailView(AsyncDetailMixin, views.EmployeeDetailView):
+    pass
+
+
+@query_budget(3)
+@async_login_required
+async def task_events(request):
+    """
+    Long-polling variant of `views.task_events`: waits for events without
+    holding a thread, answers with them and lets the client reconnect at
+    once.
+    """
+    last_event_id = await sync_to_async(events.parse_last_event_id)(request)
+    deadline = time.monotonic() + events.LONG_POLL_DURATION
+
+    while True:
+        batch = [event async for event in events.events_after(last_event_id)]
+
+        if batch or time.monotonic() >= deadline:
+            break
+
+        await asyncio.sleep(events.POLL_INTERVAL)
+
+    return views.event_stream_response(
+        events.render(last_event_id, batch, retry=0)
+    )
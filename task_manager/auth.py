@@ -0,0 +1,76 @@
+"""
+Cached authentication.
+
+Sessions live in the cache in front of the database (the `cached_db`
+engine), and `CachedModelBackend` keeps every logged in employee, with
+their position, in the cache too, so authenticating a request costs no
+query on a warm cache.
+
+Users are cached per employee rather than per session, so that a save
+or a deletion of the employee, their password change included, has a
+single key to invalidate. A password change also changes the session
+auth hash, which `django.contrib.auth.get_user()` still checks against
+the cached user, so the other sessions of the employee end.
+"""
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.exceptions import PermissionDenied
+from django.core.cache import cache
+from django.db import transaction
+
+CACHE_KEY_PREFIX = "task_manager:auth-user"
+
+# Saves and deletions invalidate users, the timeout only bounds how long
+# a signal-less write (e.g. `QuerySet.update()`) can stay unnoticed.
+CACHE_TIMEOUT = 15 * 60
+
+
+def _user_key(user_id) -> str:
+    return f"{CACHE_KEY_PREFIX}:{user_id}"
+
+
+def invalidate_users(user_ids, using=None) -> None:
+    """
+    Forget the cached users of `user_ids`, now and once the current
+    transaction commits, so no concurrent request caches them again as
+    they were before the commit.
+    """
+    keys = [_user_key(user_id) for user_id in user_ids]
+
+    if keys:
+        cache.delete_many(keys)
+        transaction.on_commit(lambda: cache.delete_many(keys), using=using)
+
+
+class CachedModelBackend(ModelBackend):
+    """`ModelBackend` loading the users of the sessions from the cache."""
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        user = super().authenticate(request, username, password, **kwargs)
+
+        if user is None and password is not None:
+            # `ModelBackend` follows in the settings only to load the users
+            # of the sessions it logged in. Stop there, rather than let it
+            # hash the wrong password once more.
+            raise PermissionDenied
+
+        return user
+
+    def get_user(self, user_id):
+        key = _user_key(user_id)
+        user = cache.get(key)
+
+        if user is None:
+            user_model = get_user_model()
+
+            try:
+                user = user_model._default_manager.select_related(
+                    "position"
+                ).get(pk=user_id)
+            except user_model.DoesNotExist:
+                return None
+
+            cache.set(key, user, CACHE_TIMEOUT)
+
+        return user if self.user_can_authenticate(user) else None
@@ -0,0 +1,168 @@
+"""
+Conditional responses for the list and detail pages.
+
+Every table has a "last changed" marker in the cache, set to the current
+time after each committed write to it, including the assignments of the
+`Task.assignees` through table. A page declares the models it shows in
+`conditional_models`, and its `ETag` and `Last-Modified` derive from
+their latest marker, so a client revalidating an unchanged page gets a
+304 after a single cache read, before the view runs any of its queries.
+
+A missing marker, e.g. evicted or not yet set by this process, is set to
+the current time: this costs clients a full response, but never serves a
+stale page.
+
+The markers must be shared by every worker, or a write in one of them
+would leave the others answering 304 with stale pages: the
+`task_manager.W001` check warns about the per-process local memory cache
+outside of `DEBUG`.
+"""
+
+import hashlib
+import inspect
+import time
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.core import checks
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.middleware.csrf import get_token
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from . import db_router
+
+KEY_PREFIX = "task_manager:table-changed"
+
+# Markers outlive the pages of the browser caches.
+MARKER_TIMEOUT = 7 * 24 * 60 * 60
+
+
+def _marker_key(model) -> str:
+    return f"{KEY_PREFIX}:{model._meta.db_table}"
+
+
+@checks.register(checks.Tags.caches)
+def check_shared_cache(**kwargs) -> list:
+    """Warn when the markers are not shared by the worker processes."""
+    # `cache` is a proxy to this cache.
+    if settings.DEBUG or not isinstance(
+        caches[DEFAULT_CACHE_ALIAS], LocMemCache
+    ):
+        return []
+
+    return [
+        checks.Warning(
+            "The table change markers are in the local memory cache, "
+            "which every worker process has its own copy of.",
+            hint=(
+                "Set REDIS_URL, or point CACHES['default'] at another "
+                "shared cache, when running several workers."
+            ),
+            id="task_manager.W001",
+        )
+    ]
+
+
+def touch(*models, using=None) -> None:
+    """
+    Mark the tables of `models` as changed once the current transaction
+    commits, so no client validates a page rendered before the commit.
+    """
+    keys = [_marker_key(model) for model in models]
+
+    transaction.on_commit(
+        lambda: cache.set_many(
+            dict.fromkeys(keys, time.time()), MARKER_TIMEOUT
+        ),
+        using=using,
+    )
+
+
+def last_changed(models) -> float:
+    """Time of the latest change to the tables of `models`."""
+    keys = [_marker_key(model) for model in models]
+    markers = cache.get_many(keys)
+
+    for key in keys:
+        if key not in markers:
+            # `add()`, so a concurrent `touch()` wins.
+            now = time.time()
+            cache.add(key, now, MARKER_TIMEOUT)
+            markers[key] = cache.get(key, now)
+
+    return max(markers.values())
+
+
+class ConditionalResponseMixin:
+    """
+    Answer conditional GET requests with 304 while none of the tables of
+    `conditional_models` changed. Goes after `LoginRequiredMixin`, as
+    pages depend on the user.
+    """
+
+    conditional_models = ()
+
+    def dispatch(self, request, *args, **kwargs):
+        # Pending messages are shown by the next full render.
+        if request.method not in ("GET", "HEAD") or len(get_messages(request)):
+            return super().dispatch(request, *args, **kwargs)
+
+        changed_at = last_changed(self.conditional_models)
+        etag = self.get_etag(request, changed_at)
+        # HTTP dates are in whole seconds, so clients only sending
+        # `If-Modified-Since` miss changes made within the same second.
+        # Browsers send the `If-None-Match` that takes precedence.
+        last_modified = int(changed_at)
+
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+
+        if response is None:
+            # Row fragments and facets are cached under the markers.
+            if db_router.replicas_may_lag(changed_at):
+                db_router.pin_to_primary()
+
+            response = super().dispatch(request, *args, **kwargs)
+
+        if inspect.isawaitable(response):
+            return self._afinalize(response, etag, last_modified)
+
+        return self.finalize(response, etag, last_modified)
+
+    def get_etag_parts(self) -> tuple:
+        """What the page depends on, besides the tables."""
+        # Forms embed a token of the CSRF secret, which logins rotate.
+        # Created here if missing, so the first page has the same one.
+        get_token(self.request)
+
+        return (
+            self.__class__.__name__,
+            self.request.user.pk,
+            self.request.META["CSRF_COOKIE"],
+        )
+
+    def get_etag(self, request, changed_at: float) -> str:
+        return quote_etag(
+            hashlib.md5(
+                repr((*self.get_etag_parts(), changed_at)).encode()
+            ).hexdigest()
+        )
+
+    def finalize(self, response, etag, last_modified):
+        if response.status_code in (200, 304):
+            response.headers.setdefault("ETag", etag)
+            response.headers.setdefault(
+                "Last-Modified", http_date(last_modified)
+            )
+            # Revalidate every time, rather than reuse the page for a
+            # heuristic freshness lifetime.
+            patch_cache_control(response, private=True, no_cache=True)
+
+        return response
+
+    async def _afinalize(self, response, etag, last_modified):
+        return self.finalize(await response, etag, last_modified)
@@ -0,0 +1,128 @@
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import Count, F, Func, Max, Q, Subquery
+
+from . import db_router
+from .models import Task
+
+CACHE_KEY_PREFIX = "task_manager:dashboard-counters"
+
+# Counters are invalidated by model signals, so the timeout only bounds
+# how long a drift caused by signal-less writes (e.g. `QuerySet.update()`)
+# can stay visible.
+CACHE_TIMEOUT = 60
+
+
+def _cache_key() -> str:
+    # The "outdated" counter depends on the current date, so the key rolls
+    # over at midnight on its own.
+    return f"{CACHE_KEY_PREFIX}:{date.today().isoformat()}"
+
+
+def _open_task_counts() -> dict:
+    return {
+        "number_of_tasks": Count("id"),
+        "urgent_tasks": Count("id", filter=Q(priority=Task.URGENT)),
+        "outdated_tasks": Count("id", filter=Q(deadline__lt=date.today())),
+    }
+
+
+def _employee_count() -> Max:
+    """
+    The headcount as an aggregate of the task counts query, so a cache
+    miss costs one query. The scalar subquery is the same on every row,
+    and its own value when there are no open tasks to aggregate.
+    """
+    headcount = Subquery(
+        get_user_model()
+        .objects.order_by()
+        .values(count=Func(F("pk"), function="COUNT"))
+    )
+
+    return Max(headcount, default=headcount)
+
+
+def workload_counts() -> dict:
+    """
+    Task counts to annotate employees with. Computed in the same GROUP BY
+    query as the employees, instead of prefetching their tasks.
+    """
+    open_tasks = Q(tasks__is_completed=False)
+
+    return {
+        "open_tasks": Count("tasks", filter=open_tasks),
+        "urgent_tasks": Count(
+            "tasks", filter=open_tasks & Q(tasks__priority=Task.URGENT)
+        ),
+        "overdue_tasks": Count(
+            "tasks", filter=open_tasks & Q(tasks__deadline__lt=date.today())
+        ),
+        "completed_tasks": Count("tasks", filter=Q(tasks__is_completed=True)),
+    }
+
+
+def compute_counters() -> dict:
+    return Task.objects.filter(is_completed=False).aggregate(
+        **_open_task_counts(), number_of_employees=_employee_count()
+    )
+
+
+async def acompute_counters() -> dict:
+    # There is no async `aggregate()`, but grouping the open tasks on
+    # `is_completed` computes the same counts in a single row.
+    rows = [
+        row
+        async for row in Task.objects.filter(is_completed=False)
+        .order_by()
+        .values("is_completed")
+        .annotate(**_open_task_counts(), number_of_employees=_employee_count())
+    ]
+
+    if not rows:
+        counters = dict.fromkeys(_open_task_counts(), 0)
+        counters["number_of_employees"] = (
+            await get_user_model().objects.acount()
+        )
+
+        return counters
+
+    counters = rows[0]
+    del counters["is_completed"]
+
+    return counters
+
+
+def get_counters() -> dict:
+    counters = cache.get(_cache_key())
+
+    if counters is None:
+        counters = rebuild_counters()
+
+    return counters
+
+
+async def aget_counters() -> dict:
+    counters = await cache.aget(_cache_key())
+
+    if counters is None:
+        db_router.pin_to_primary()
+        counters = await acompute_counters()
+        await cache.aset(_cache_key(), counters, CACHE_TIMEOUT)
+
+    return counters
+
+
+def rebuild_counters() -> dict:
+    # The cache was invalidated by a commit that the replicas may not
+    # have replayed yet.
+    db_router.pin_to_primary()
+    counters = compute_counters()
+    cache.set(_cache_key(), counters, CACHE_TIMEOUT)
+
+    return counters
+
+
+def invalidate_counters() -> None:
+    cache.delete(_cache_key())
@@ -0,0 +1,203 @@
+"""
+Send the read queries of web requests to the read replicas.
+
+Replicas are configured as `DATABASE_REPLICAS` aliases (see
+`DATABASE_REPLICA_URLS` in the settings) and picked round-robin among
+those passing their periodic health check. The primary serves every
+write, the reads of transactions, sessions, and the reads outside of
+requests, e.g. in management commands.
+
+A request that writes sets a cookie pinning its client to the primary
+for `DATABASE_REPLICA_STICKY_SECONDS`, so users read their own writes
+despite the replication lag.
+
+The caches shared by all clients (counters, facets, row fragments and
+the markers of conditional responses) are invalidated when the primary
+commits. Requests refilling them read from the primary while the
+replicas may lag behind the change, so a lagging replica never puts
+stale data back in the cache under fresh keys, see `pin_to_primary()`.
+"""
+
+import asyncio
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.utils.deprecation import MiddlewareMixin
+
+STICKY_COOKIE_NAME = "primary_until"
+
+# Session reads often follow their writes closely, e.g. right at login.
+PRIMARY_ONLY_APPS = {"sessions"}
+
+
+class RoutingState:
+    def __init__(self, pinned: bool = False):
+        # Whether reads go to the primary.
+        self.pinned = pinned
+        self.wrote = False
+
+
+# Set for the duration of a request. A mutable state, rather than flags
+# in context variables, so that writes made from the worker threads of
+# async views pin the rest of the request too.
+current_state = ContextVar("replica_routing_state", default=None)
+
+
+@contextmanager
+def replica_reads(pinned: bool = False):
+    """Let the reads of the block use the replicas, as in a request."""
+    state = RoutingState(pinned)
+    token = current_state.set(state)
+
+    try:
+        yield state
+    finally:
+        current_state.reset(token)
+
+
+def pin_to_primary() -> None:
+    """Send the remaining reads of the current request to the primary."""
+    if (state := current_state.get()) is not None:
+        state.pinned = True
+
+
+def replicas_may_lag(changed_at: float) -> bool:
+    """
+    Whether the replicas may not have replayed a change committed at
+    `changed_at` yet. The lag is assumed shorter than the stickiness of
+    the writers' own reads.
+    """
+    return time.time() - changed_at < settings.DATABASE_REPLICA_STICKY_SECONDS
+
+
+class ReplicaPool:
+    """Round-robin over the replicas that passed their last check."""
+
+    def __init__(self, aliases, check_interval: float):
+        self.aliases = list(aliases)
+        self.check_interval = check_interval
+        self.checks = {}
+        self.counter = itertools.count()
+        self.lock = threading.Lock()
+
+    def check(self, alias) -> bool:
+        try:
+            with connections[alias].cursor() as cursor:
+                cursor.execute("SELECT 1")
+        except DatabaseError:
+            connections[alias].close()
+            return False
+
+        return True
+
+    def is_healthy(self, alias) -> bool:
+        now = time.monotonic()
+
+        with self.lock:
+            healthy, checked_at = self.checks.get(alias, (None, None))
+
+            if checked_at is not None and now - checked_at < (
+                self.check_interval
+            ):
+                return healthy
+
+            # Other threads keep the last result while this one checks.
+            self.checks[alias] = (bool(healthy), now)
+
+        healthy = self.check(alias)
+
+        with self.lock:
+            self.checks[alias] = (healthy, now)
+
+        return healthy
+
+    def choose(self):
+        for _ in self.aliases:
+            alias = self.aliases[next(self.counter) % len(self.aliases)]
+
+            if self.is_healthy(alias):
+                return alias
+
+        return None
+
+
+class PrimaryReplicaRouter:
+    def __init__(self):
+        self.pool = ReplicaPool(
+            settings.DATABASE_REPLICAS,
+            settings.DATABASE_REPLICA_HEALTH_CHECK_INTERVAL,
+        )
+
+    def db_for_read(self, model, **hints):
+        state = current_state.get()
+
+        if (
+            state is None
+            or state.pinned
+            or not self.pool.aliases
+            or "instance" in hints
+            or model._meta.app_label in PRIMARY_ONLY_APPS
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return None
+
+        return self.pool.choose()
+
+    def db_for_write(self, model, **hints):
+        state = current_state.get()
+
+        if state and model._meta.app_label not in PRIMARY_ONLY_APPS:
+            state.pinned = state.wrote = True
+
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *self.pool.aliases}
+
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+
+        return None
+
+
+class ReplicaRoutingMiddleware(MiddlewareMixin):
+    # Async capable, as it has to set the routing state in the context of
+    # the request itself.
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        with replica_reads(self.is_pinned(request)) as state:
+            response = self.get_response(request)
+
+        return self.finish(state, response)
+
+    async def __acall__(self, request):
+        with replica_reads(self.is_pinned(request)) as state:
+            response = await self.get_response(request)
+
+        return self.finish(state, response)
+
+    def is_pinned(self, request) -> bool:
+        try:
+            return float(request.COOKIES[STICKY_COOKIE_NAME]) > time.time()
+        except (KeyError, ValueError):
+            return False
+
+    def finish(self, state, response):
+        if state.wrote and settings.DATABASE_REPLICA_STICKY_SECONDS:
+            response.set_cookie(
+                STICKY_COOKIE_NAME,
+                str(time.time() + settings.DATABASE_REPLICA_STICKY_SECONDS),
+                max_age=settings.DATABASE_REPLICA_STICKY_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+
+        return response
@@ -0,0 +1,119 @@
+"""
+Deadline digests: one email per employee, listing their open tasks that
+are overdue or due within a few days.
+
+A single query streams the assignments of these tasks ordered by
+employee, so the digests are built one employee at a time whatever the
+headcount, and they are sent in batches over one connection to the mail
+server.
+"""
+
+from datetime import date, timedelta
+from itertools import groupby
+
+from django.conf import settings
+from django.core import mail
+from django.template.loader import render_to_string
+from django.urls import reverse
+
+from .models import Task
+
+DUE_WITHIN = timedelta(days=3)
+
+# Messages per call to the email backend.
+BATCH_SIZE = 100
+
+# Rows fetched per round-trip while streaming the assignments.
+CHUNK_SIZE = 2_000
+
+
+def due_assignments(due_within: timedelta = DUE_WITHIN, today: date = None):
+    """
+    Stream the assignments of the open tasks due by `today + due_within`,
+    overdue ones included, to active employees with an email address,
+    ordered by employee then deadline.
+    """
+    today = today or date.today()
+
+    return (
+        Task.assignees.through.objects.filter(
+            task__is_completed=False,
+            task__deadline__lte=today + due_within,
+            employee__is_active=True,
+        )
+        .exclude(employee__email="")
+        .order_by("employee_id", "task__deadline", "task_id")
+        .values_list(
+            "employee_id",
+            "employee__username",
+            "employee__first_name",
+            "employee__email",
+            "task_id",
+            "task__name",
+            "task__deadline",
+            "task__priority",
+            named=True,
+        )
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+
+
+def build_digest(rows: list, today: date) -> mail.EmailMessage:
+    """The digest of the assignments of `rows`, all of one employee."""
+    priorities = dict(Task.PRIORITY_CHOICES)
+    employee = rows[0]
+    tasks = [
+        {
+            "name": row.task__name,
+            "deadline": row.task__deadline,
+            "priority": priorities.get(row.task__priority, row.task__priority),
+            "url": settings.SITE_URL
+            + reverse("task_manager:task-detail", args=[row.task_id]),
+        }
+        for row in rows
+    ]
+    context = {
+        "name": employee.employee__first_name or employee.employee__username,
+        "overdue": [task for task in tasks if task["deadline"] < today],
+        "upcoming": [task for task in tasks if task["deadline"] >= today],
+    }
+
+    return mail.EmailMessage(
+        subject=render_to_string(
+            "task_manager/email/deadline_digest_subject.txt", context
+        ).strip(),
+        body=render_to_string(
+            "task_manager/email/deadline_digest.txt", context
+        ),
+        to=[employee.employee__email],
+    )
+
+
+def send_deadline_digests(
+    due_within: timedelta = DUE_WITHIN,
+    batch_size: int = BATCH_SIZE,
+    today: date = None,
+    connection=None,
+) -> int:
+    """Send the digests and return how many were sent."""
+    today = today or date.today()
+    connection = connection or mail.get_connection()
+    sent = 0
+    batch = []
+
+    # Opens the connection once, for all the batches.
+    with connection:
+        for _, rows in groupby(
+            due_assignments(due_within, today),
+            key=lambda row: row.employee_id,
+        ):
+            batch.append(build_digest(list(rows), today))
+
+            if len(batch) >= batch_size:
+                sent += connection.send_messages(batch) or 0
+                batch = []
+
+        if batch:
+            sent += connection.send_messages(batch) or 0
+
+    return sent
@@ -0,0 +1,175 @@
+"""
+Live task events, pushed to the task boards over Server-Sent Events.
+
+Signal receivers publish `TaskEvent` rows in the transaction of the change
+they describe. The event views read the table for rows past the client's
+last event ID, so every worker process sees every event, and clients that
+reconnect with `Last-Event-ID` catch up on what they missed.
+
+No response is held open: under WSGI the view answers at once with the
+events published so far and the client polls again after `RETRY`, so
+the boards never tie up the sync workers. Under ASGI the async view waits
+up to `LONG_POLL_DURATION` for events, on the event loop.
+
+Events older than `RETENTION` are pruned every `PRUNE_EVERY` events
+published.
+"""
+
+import json
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import timedelta
+
+from django.db.models import BigIntegerField
+from django.utils import timezone
+
+from .models import Task, TaskEvent
+
+# How long the clients wait before polling again, in milliseconds.
+RETRY = 3000
+
+# How long an async long poll waits for events, below the read timeout of
+# the usual reverse proxies, and how often it checks for them.
+LONG_POLL_DURATION = 25.0
+
+POLL_INTERVAL = 1.0
+
+BATCH_SIZE = 100
+
+RETENTION = timedelta(hours=1)
+
+PRUNE_EVERY = 1_000
+
+
+_pending = ContextVar("task_events_pending", default=None)
+
+
+def task_data(task: Task) -> dict:
+    return {
+        "id": task.id,
+        "name": task.name,
+        # Only when already loaded: an event is not worth a query.
+        "task_type": (
+            str(task.task_type) if Task.task_type.is_cached(task) else None
+        ),
+        "priority": task.get_priority_display(),
+        "deadline": str(task.deadline),
+        "is_completed": task.is_completed,
+    }
+
+
+def publish_many(kind: str, tasks, **extra) -> None:
+    new_events = [
+        TaskEvent(
+            task_id=task.id, kind=kind, data={**task_data(task), **extra}
+        )
+        for task in tasks
+    ]
+
+    if (pending := _pending.get()) is not None:
+        pending.extend(new_events)
+    elif new_events:
+        insert(new_events)
+
+
+def insert(new_events: list) -> None:
+    TaskEvent.objects.bulk_create(new_events)
+    first, last = new_events[0].id, new_events[-1].id
+
+    # Prune whenever the IDs cross a multiple of `PRUNE_EVERY`. Backends
+    # that do not return the IDs of `bulk_create()` rely on the
+    # `prune_task_events` command instead.
+    if last is not None and (first - 1) // PRUNE_EVERY < last // PRUNE_EVERY:
+        prune()
+
+
+def publish(kind: str, task: Task, **extra) -> None:
+    publish_many(kind, [task], **extra)
+
+
+@contextmanager
+def batched():
+    """
+    Publish the events of the block, e.g. one per deleted task, with a
+    single `INSERT` at its end.
+    """
+    pending = []
+    token = _pending.set(pending)
+
+    try:
+        yield
+    finally:
+        _pending.reset(token)
+
+    if pending:
+        insert(pending)
+
+
+def latest_event_id() -> int:
+    return (
+        TaskEvent.objects.order_by("-id").values_list("id", flat=True).first()
+        or 0
+    )
+
+
+def format_event(event: TaskEvent) -> str:
+    return (
+        f"id: {event.id}\n"
+        f"event: {event.kind}\n"
+        f"data: {json.dumps(event.data, separators=(',', ':'))}\n\n"
+    )
+
+
+def parse_last_event_id(request) -> int:
+    """
+    Resume after the `Last-Event-ID` sent by reconnecting clients, or
+    start from now.
+    """
+    value = request.headers.get("Last-Event-ID") or request.GET.get(
+        "last_event_id"
+    )
+
+    try:
+        last_event_id = max(int(value), 0)
+    except (TypeError, ValueError):
+        return latest_event_id()
+
+    # Past the range of the event IDs, and of the database integers.
+    if last_event_id > BigIntegerField.MAX_BIGINT:
+        return latest_event_id()
+
+    return last_event_id
+
+
+def events_after(last_event_id: int):
+    return (
+        TaskEvent.objects.filter(id__gt=last_event_id)
+        .only("id", "kind", "data")
+        .order_by("id")[:BATCH_SIZE]
+    )
+
+
+def preamble(last_event_id: int, retry: int = RETRY) -> str:
+    # An `id` field without data still sets the ID sent back on reconnect,
+    # so clients resume from here even if no event came through.
+    return f"retry: {retry}\nid: {last_event_id}\n\n"
+
+
+def render(last_event_id: int, batch: list, retry: int = RETRY) -> str:
+    """
+    The SSE body of the events of `batch`, published after
+    `last_event_id`. A full batch asks the client to come back at once for
+    the rest.
+    """
+    if len(batch) >= BATCH_SIZE:
+        retry = 0
+
+    return "".join([preamble(last_event_id, retry), *map(format_event, batch)])
+
+
+def prune(older_than: timedelta = RETENTION) -> int:
+    deleted, _ = TaskEvent.objects.filter(
+        created_at__lt=timezone.now() - older_than
+    ).delete()
+
+    return deleted
@@ -0,0 +1,119 @@
+"""
+Constant-memory CSV and NDJSON exports.
+
+Rows are read with `QuerySet.iterator(chunk_size=...)`, which prefetches
+related objects one chunk at a time, and encoded lazily, so that they can
+be fed to a `StreamingHttpResponse` or written to a file.
+"""
+
+import csv
+import json
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Prefetch
+
+CHUNK_SIZE = 2000
+
+TASK_FIELDS = [
+    "id",
+    "name",
+    "description",
+    "deadline",
+    "is_completed",
+    "priority",
+    "task_type",
+    "assignees",
+]
+
+EMPLOYEE_FIELDS = [
+    "id",
+    "username",
+    "first_name",
+    "last_name",
+    "email",
+    "position",
+]
+
+
+def task_rows(queryset, chunk_size: int = CHUNK_SIZE):
+    queryset = queryset.select_related("task_type").prefetch_related(
+        Prefetch(
+            "assignees",
+            queryset=get_user_model().objects.only("id", "username"),
+        )
+    )
+
+    for task in queryset.iterator(chunk_size=chunk_size):
+        yield {
+            "id": task.id,
+            "name": task.name,
+            "description": task.description,
+            "deadline": task.deadline,
+            "is_completed": task.is_completed,
+            "priority": task.priority,
+            "task_type": task.task_type.name,
+            "assignees": [
+                employee.username for employee in task.assignees.all()
+            ],
+        }
+
+
+def employee_rows(queryset, chunk_size: int = CHUNK_SIZE):
+    queryset = queryset.select_related("position").order_by("id")
+
+    for employee in queryset.iterator(chunk_size=chunk_size):
+        yield {
+            "id": employee.id,
+            "username": employee.username,
+            "first_name": employee.first_name,
+            "last_name": employee.last_name,
+            "email": employee.email,
+            "position": employee.position.name,
+        }
+
+
+class _Echo:
+    """A file-like object that returns what is written to it."""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(rows, fields):
+    writer = csv.writer(_Echo())
+
+    yield writer.writerow(fields)
+
+    for row in rows:
+        # Lists use the separator `import_tasks` understands.
+        yield writer.writerow(
+            ";".join(value) if isinstance(value, list) else value
+            for value in (row[field] for field in fields)
+        )
+
+
+def ndjson_lines(rows, fields):
+    for row in rows:
+        yield json.dumps(
+            {field: row[field] for field in fields}, cls=DjangoJSONEncoder
+        ) + "\n"
+
+
+FORMATS = {
+    "csv": ("text/csv", csv_lines),
+    "ndjson": ("application/x-ndjson", ndjson_lines),
+}
+
+
+def encode(rows, fields, export_format: str, lines_per_chunk: int = 500):
+    """
+    Encode `rows` in `export_format`, joining lines into larger chunks to
+    save on write calls.
+    """
+    _, encoder = FORMATS[export_format]
+    lines = encoder(rows, fields)
+
+    while chunk := "".join(islice(lines, lines_per_chunk)):
+        yield chunk
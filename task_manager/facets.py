@@ -0,0 +1,268 @@
+"""
+Facet counts of the task list sidebar.
+
+Each facet counts the tasks matching every current filter but its own,
+so its other values show how many tasks selecting them would give. The
+counts of all the facets are grouped aggregates combined with `UNION
+ALL`, a single round-trip whatever the number of facets and values, and
+are cached briefly, keyed on the filters and the change markers of the
+tables they read. With the archive included, its counts come with those
+of the tasks, in the same query.
+"""
+
+import hashlib
+from datetime import date, timedelta
+
+from django.core.cache import cache
+from django.db.models import (
+    Case,
+    CharField,
+    Count,
+    F,
+    Q,
+    Value,
+    When,
+)
+from django.db.models.functions import Cast
+
+from . import conditional, db_router
+from .models import ArchivedTask, Employee, Task, TaskType
+
+CACHE_KEY_PREFIX = "task_manager:task-facets"
+
+# Markers invalidate the counts, the timeout only bounds their memory.
+CACHE_TIMEOUT = 30
+
+# Most frequent values shown per facet, selected ones aside.
+MAX_VALUES = 10
+
+# Deadline ranges: value, label, and bounds in days from today,
+# including the start and excluding the end.
+DEADLINE_RANGES = [
+    ("overdue", "Overdue", None, 0),
+    ("week", "Within a week", 0, 7),
+    ("month", "Within a month", 7, 30),
+    ("later", "Later", 30, None),
+]
+
+
+def deadline_range(value: str, today: date = None) -> Q:
+    """The condition of the tasks in a deadline range."""
+    today = today or date.today()
+    condition = Q()
+
+    for range_value, _, start, end in DEADLINE_RANGES:
+        if range_value == value:
+            if start is not None:
+                condition &= Q(deadline__gte=today + timedelta(days=start))
+
+            if end is not None:
+                condition &= Q(deadline__lt=today + timedelta(days=end))
+
+    return condition
+
+
+class Facet:
+    """
+    Tasks grouped on `value`, a text expression whose values are those
+    of the `param` query parameter. `label` is an expression of their
+    labels, or None to use `labels`.
+    """
+
+    def __init__(self, param, title, value, label=None, labels=None):
+        self.param = param
+        self.title = title
+        self.value = value
+        self.label = label
+        self.labels = labels or {}
+
+    def counts(self, queryset):
+        return (
+            queryset.order_by()
+            .annotate(
+                facet=Value(self.param),
+                facet_value=self.value,
+                facet_label=self.label or Value(""),
+            )
+            .values("facet", "facet_value", "facet_label")
+            .annotate(count=Count("id"))
+        )
+
+    def choices(self, rows, selected) -> list:
+        choices = [
+            {
+                "value": row["facet_value"],
+                "label": self.labels.get(
+                    row["facet_value"], row["facet_label"]
+                ),
+                "count": row["count"],
+                "selected": row["facet_value"] in selected,
+            }
+            for row in rows
+            if row["facet_value"] is not None
+        ]
+
+        if self.labels:
+            # Values known in advance keep their order.
+            order = list(self.labels)
+            choices.sort(key=lambda choice: order.index(choice["value"]))
+        else:
+            choices.sort(
+                key=lambda choice: (-choice["count"], choice["label"])
+            )
+
+        return [
+            choice
+            for index, choice in enumerate(choices)
+            if index < MAX_VALUES or choice["selected"]
+        ]
+
+
+def _deadline_value(today: date):
+    return Case(
+        *(
+            When(deadline_range(value, today), then=Value(value))
+            for value, _, _, _ in DEADLINE_RANGES
+        ),
+        output_field=CharField(),
+    )
+
+
+def get_facets(today: date = None) -> list:
+    today = today or date.today()
+
+    return [
+        Facet(
+            "type",
+            "Type",
+            Cast("task_type_id", CharField()),
+            label=F("task_type__name"),
+        ),
+        Facet(
+            "priority",
+            "Priority",
+            Case(
+                *(
+                    When(priority_rank=rank, then=Value(code))
+                    for rank, (code, _) in enumerate(Task.PRIORITY_CHOICES)
+                ),
+                output_field=CharField(),
+            ),
+            labels=dict(Task.PRIORITY_CHOICES),
+        ),
+        Facet(
+            "completed",
+            "Status",
+            Case(
+                When(is_completed=True, then=Value("true")),
+                default=Value("false"),
+                output_field=CharField(),
+            ),
+            labels={"false": "Open", "true": "Done"},
+        ),
+        Facet(
+            "assignee",
+            "Assignee",
+            Cast("assignees__id", CharField()),
+            label=F("assignees__username"),
+        ),
+        Facet(
+            "deadline",
+            "Deadline",
+            _deadline_value(today),
+            labels={value: label for value, label, _, _ in DEADLINE_RANGES},
+        ),
+    ]
+
+
+def _changed_at() -> float:
+    return conditional.last_changed(
+        [
+            Task,
+            TaskType,
+            Task.assignees.through,
+            Employee,
+            ArchivedTask,
+            ArchivedTask.assignees.through,
+        ]
+    )
+
+
+def _cache_key(form, today: date, changed_at: float) -> str:
+    filters = sorted(
+        (name, str(value))
+        for name, value in form.cleaned_data.items()
+        if name != "sort"
+    )
+
+    return "{}:{}".format(
+        CACHE_KEY_PREFIX,
+        hashlib.md5(repr((filters, today, changed_at)).encode()).hexdigest(),
+    )
+
+
+def _sum_counts(rows) -> list:
+    totals = {}
+
+    for row in rows:
+        key = (row["facet"], row["facet_value"], row["facet_label"])
+        totals[key] = totals.get(key, 0) + row["count"]
+
+    return [
+        {
+            "facet": facet,
+            "facet_value": value,
+            "facet_label": label,
+            "count": count,
+        }
+        for (facet, value, label), count in totals.items()
+    ]
+
+
+def compute_facets(queryset, form, today: date = None, archive=None) -> list:
+    """
+    Count the tasks of `queryset`, and of the `archive` queryset of
+    archived tasks if given, per value of every facet, filtered by the
+    valid filters of the `TaskFilterForm` bound to the request.
+    """
+    facets = get_facets(today)
+    parts = [
+        facet.counts(form.filter(tasks, exclude=facet.param))
+        for tasks in (queryset, archive)
+        if tasks is not None
+        for facet in facets
+    ]
+    rows = _sum_counts(parts[0].union(*parts[1:], all=True))
+
+    return [
+        {
+            "param": facet.param,
+            "title": facet.title,
+            "multiple": facet.param in form.MULTIPLE_VALUES,
+            "choices": facet.choices(
+                [row for row in rows if row["facet"] == facet.param],
+                (
+                    set(form.data.getlist(facet.param))
+                    if facet.param in form.cleaned_data
+                    else set()
+                ),
+            ),
+        }
+        for facet in facets
+    ]
+
+
+def get_task_facets(queryset, form, archive=None) -> list:
+    today = date.today()
+    changed_at = _changed_at()
+    key = _cache_key(form, today, changed_at)
+    facets = cache.get(key)
+
+    if facets is None:
+        if db_router.replicas_may_lag(changed_at):
+            db_router.pin_to_primary()
+
+        facets = compute_facets(queryset, form, today, archive)
+        cache.set(key, facets, CACHE_TIMEOUT)
+
+    return facets
@@ -0,0 +1,30 @@
+"""
+Filters of the task and employee query strings, shared by the list
+views and the exports.
+"""
+
+from .forms import TaskFilterForm
+from .search import search_tasks
+
+
+def search_by_name(queryset, params):
+    if name := params.get("name"):
+        return search_tasks(queryset, name)
+
+    return queryset
+
+
+def filter_tasks(queryset, params):
+    """Filter tasks by the `TaskFilterForm` and name search of `params`."""
+    form = TaskFilterForm(params)
+    # Invalid filters are left out of `cleaned_data`, hence ignored.
+    form.is_valid()
+
+    return search_by_name(form.filter(queryset), params)
+
+
+def filter_employees(queryset, params):
+    if username := params.get("username"):
+        return queryset.filter(username__icontains=username)
+
+    return queryset
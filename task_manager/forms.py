@@ -1,14 +1,23 @@
 from django import forms
 from django.contrib.auth import get_user_model
 from django.contrib.auth.forms import UserCreationForm
+from django.db import transaction
+from django.db.models import BigIntegerField, Exists, OuterRef
+from django.urls import reverse_lazy
+from django.utils import timezone
 
-from .models import Employee, Task
+from . import activity, events, facets
+from .models import ActivityLog, Employee, Task, TaskEvent
+from .signals import tasks_bulk_changed
+from .widgets import AutocompleteSelect, AutocompleteSelectMultiple
 
 
 class TaskForm(forms.ModelForm):
     assignees = forms.ModelMultipleChoiceField(
         queryset=get_user_model().objects.all(),
-        widget=forms.CheckboxSelectMultiple,
+        widget=AutocompleteSelectMultiple(
+            url=reverse_lazy("task_manager:employee-autocomplete")
+        ),
     )
     deadline = forms.DateField(widget=forms.DateInput(attrs={"type": "date"}))
 
@@ -16,6 +25,67 @@ class TaskForm(forms.ModelForm):
         model = Task
         fields = "__all__"
 
+    def save(self, commit=True):
+        # Publish the events of the task and of its assignees together.
+        with events.batched():
+            return super().save(commit)
+
+    def log_activity(self, actor) -> None:
+        """Log the changes made by the saved form on behalf of `actor`."""
+        task = self.instance
+        changed = set(self.changed_data)
+
+        if "is_completed" in changed:
+            activity.record(
+                (
+                    ActivityLog.COMPLETED
+                    if task.is_completed
+                    else ActivityLog.REOPENED
+                ),
+                [task],
+                actor,
+            )
+
+        if "priority" in changed:
+            priorities = dict(Task.PRIORITY_CHOICES)
+            previous = self.initial.get("priority")
+            activity.record(
+                ActivityLog.PRIORITY_CHANGED,
+                [task],
+                actor,
+                previous=priorities.get(previous, previous),
+                priority=task.get_priority_display(),
+            )
+
+        if "assignees" in changed:
+            before = {
+                employee.pk: employee
+                for employee in self.initial.get("assignees", [])
+            }
+            after = {
+                employee.pk: employee
+                for employee in self.cleaned_data["assignees"]
+            }
+
+            employees = before | after
+
+            for action, employee_ids in [
+                (ActivityLog.ASSIGNED, after.keys() - before.keys()),
+                (ActivityLog.UNASSIGNED, before.keys() - after.keys()),
+            ]:
+                for pk in sorted(employee_ids):
+                    activity.record(
+                        action,
+                        [task],
+                        actor,
+                        employee=employees[pk].username,
+                    )
+
+        if fields := sorted(
+            changed - {"is_completed", "priority", "assignees"}
+        ):
+            activity.record(ActivityLog.UPDATED, [task], actor, fields=fields)
+
 
 class EmployeeCreationForm(UserCreationForm):
     first_name = forms.CharField(required=True)
@@ -45,6 +115,50 @@ class EmployeeSearchForm(forms.Form):
     )
 
 
+class EmployeeWorkloadForm(forms.Form):
+    """
+    Filters and sort order of the workload columns of the employee list.
+    Keeps the username searched by `EmployeeSearchForm`.
+    """
+
+    WORKLOAD_FIELDS = [
+        ("open_tasks", "open"),
+        ("urgent_tasks", "urgent"),
+        ("overdue_tasks", "overdue"),
+        ("completed_tasks", "completed"),
+    ]
+
+    username = forms.CharField(required=False, widget=forms.HiddenInput)
+    sort = forms.ChoiceField(
+        choices=[("", "")]
+        + [
+            (f"{direction}{field}", f"{label} {order}")
+            for field, label in WORKLOAD_FIELDS
+            for direction, order in (("", "ascending"), ("-", "descending"))
+        ],
+        required=False,
+        widget=forms.HiddenInput,
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        for field, label in self.WORKLOAD_FIELDS:
+            self.fields[f"min_{field}"] = forms.IntegerField(
+                min_value=0,
+                required=False,
+                label=f"Min. {label}",
+            )
+
+    def filter(self, queryset):
+        """Keep the employees with at least the minimum workloads."""
+        for field, _ in self.WORKLOAD_FIELDS:
+            if (minimum := self.cleaned_data.get(f"min_{field}")) is not None:
+                queryset = queryset.filter(**{f"{field}__gte": minimum})
+
+        return queryset
+
+
 class ByNameSearchForm(forms.Form):
     name = forms.CharField(
         max_length=255,
@@ -52,3 +166,326 @@ class ByNameSearchForm(forms.Form):
         label="",
         widget=forms.TextInput(attrs={"placeholder": "Search by name..."}),
     )
+
+
+class TaskFilterForm(forms.Form):
+    """
+    Sort order and filters of the task list and its exports. Every
+    combination of an ordering with a priority, type or status filter is
+    served by one of the `Task` indexes: the equality filters come first
+    in them, then the columns of the ordering.
+    """
+
+    ORDERINGS = {
+        "deadline": ("is_completed", "deadline", "id"),
+        # Urgent first, then by deadline.
+        "priority": ("is_completed", "priority_rank", "deadline", "id"),
+    }
+
+    # Filters accepting several values, see `facets.py`.
+    MULTIPLE_VALUES = {"priority"}
+
+    name = forms.CharField(required=False, widget=forms.HiddenInput)
+    sort = forms.ChoiceField(
+        choices=[("deadline", "By deadline"), ("priority", "By priority")],
+        required=False,
+    )
+    priority = forms.MultipleChoiceField(
+        choices=Task.PRIORITY_CHOICES, required=False
+    )
+    # IDs are validated without a query, like the cursors, but within the
+    # range of the database integers.
+    type = forms.IntegerField(  # noqa: VNE003
+        required=False, min_value=1, max_value=BigIntegerField.MAX_BIGINT
+    )
+    assignee = forms.IntegerField(
+        required=False, min_value=1, max_value=BigIntegerField.MAX_BIGINT
+    )
+    completed = forms.NullBooleanField(required=False)
+    deadline = forms.ChoiceField(
+        choices=[
+            ("", ""),
+            *((value, label) for value, label, _, _ in facets.DEADLINE_RANGES),
+        ],
+        required=False,
+    )
+    # Not a filter: includes the archive, see `views.include_archived()`.
+    archived = forms.BooleanField(required=False, label="Include archived")
+
+    def get_ordering(self) -> tuple:
+        return self.ORDERINGS[self.cleaned_data.get("sort") or "deadline"]
+
+    def filter(self, queryset, exclude=None):
+        """Apply the valid filters, but the `exclude` one."""
+        data = {
+            name: value
+            for name, value in self.cleaned_data.items()
+            if name != exclude
+        }
+
+        if priorities := data.get("priority"):
+            queryset = queryset.filter(
+                priority_rank__in=[
+                    Task.rank_priority(priority) for priority in priorities
+                ]
+            )
+
+        if (task_type := data.get("type")) is not None:
+            queryset = queryset.filter(task_type_id=task_type)
+
+        if (assignee := data.get("assignee")) is not None:
+            queryset = queryset.filter(assignees=assignee)
+
+        if (completed := data.get("completed")) is not None:
+            queryset = queryset.filter(is_completed=completed)
+
+        if deadline := data.get("deadline"):
+            queryset = queryset.filter(facets.deadline_range(deadline))
+
+        return queryset
+
+
+class IdListField(forms.Field):
+    """A list of integer IDs, as submitted by a group of checkboxes."""
+
+    widget = forms.MultipleHiddenInput
+    default_error_messages = {"invalid": "Enter a list of IDs."}
+
+    def to_python(self, value):
+        if not value:
+            return []
+
+        try:
+            ids = sorted({int(pk) for pk in value})
+        except (TypeError, ValueError):
+            ids = []
+
+        # Past the range of the database integers, the query would fail.
+        if not ids or ids[0] < 1 or ids[-1] > BigIntegerField.MAX_BIGINT:
+            raise forms.ValidationError(
+                self.error_messages["invalid"], code="invalid"
+            )
+
+        return ids
+
+
+class TaskBulkActionForm(forms.Form):
+    """
+    Apply one action to many tasks with set-based queries: one `UPDATE`,
+    `DELETE` or through table `bulk_create()` per action, whatever the
+    number of tasks.
+    """
+
+    COMPLETE = "complete"
+    INCOMPLETE = "incomplete"
+    DELETE = "delete"
+    ASSIGN = "assign"
+    UNASSIGN = "unassign"
+    SET_PRIORITY = "set_priority"
+
+    ACTION_CHOICES = [
+        (COMPLETE, "Mark as completed"),
+        (INCOMPLETE, "Mark as not completed"),
+        (ASSIGN, "Assign to"),
+        (UNASSIGN, "Unassign"),
+        (SET_PRIORITY, "Set priority to"),
+        (DELETE, "Delete"),
+    ]
+
+    tasks = IdListField()
+    action = forms.ChoiceField(choices=ACTION_CHOICES)
+    employee = forms.ModelChoiceField(
+        queryset=get_user_model().objects.only(
+            "id", "username", "first_name", "last_name"
+        ),
+        required=False,
+        widget=AutocompleteSelect(
+            url=reverse_lazy("task_manager:employee-autocomplete")
+        ),
+    )
+    priority = forms.ChoiceField(
+        choices=[("", "---------"), *Task.PRIORITY_CHOICES], required=False
+    )
+
+    def clean(self):
+        cleaned_data = super().clean()
+        action = cleaned_data.get("action")
+
+        if action in (self.ASSIGN, self.UNASSIGN) and not cleaned_data.get(
+            "employee"
+        ):
+            self.add_error("employee", "Choose an employee.")
+
+        if action == self.SET_PRIORITY and not cleaned_data.get("priority"):
+            self.add_error("priority", "Choose a priority.")
+
+        return cleaned_data
+
+    def save(self, actor=None) -> int:
+        """
+        Apply the action on behalf of `actor`, the user of the request,
+        and return the number of tasks it affected.
+        """
+        action = self.cleaned_data["action"]
+        through = Task.assignees.through
+
+        with transaction.atomic(), events.batched():
+            # Drop IDs of tasks deleted in the meantime. The previous
+            # states are for the activity log and the deletion events.
+            previous = (
+                Task.objects.filter(id__in=self.cleaned_data["tasks"])
+                .order_by()
+                .only("id", "name", "priority", "deadline", "is_completed")
+            )
+
+            if action in (self.ASSIGN, self.UNASSIGN):
+                previous = previous.annotate(
+                    is_assigned=Exists(
+                        through.objects.filter(
+                            task_id=OuterRef("id"),
+                            employee_id=self.cleaned_data["employee"].id,
+                        )
+                    )
+                )
+
+            previous = list(previous)
+            task_ids = [task.id for task in previous]
+            tasks = Task.objects.filter(id__in=task_ids)
+
+            if action in (self.COMPLETE, self.INCOMPLETE):
+                tasks.update(
+                    is_completed=action == self.COMPLETE,
+                    updated_at=timezone.now(),
+                )
+            elif action == self.SET_PRIORITY:
+                tasks.update(
+                    priority=self.cleaned_data["priority"],
+                    priority_rank=Task.rank_priority(
+                        self.cleaned_data["priority"]
+                    ),
+                    updated_at=timezone.now(),
+                )
+            elif action == self.ASSIGN:
+                through.objects.bulk_create(
+                    (
+                        through(
+                            task_id=task_id,
+                            employee_id=self.cleaned_data["employee"].id,
+                        )
+                        for task_id in task_ids
+                    ),
+                    ignore_conflicts=True,
+                )
+            elif action == self.UNASSIGN:
+                through.objects.filter(
+                    task_id__in=task_ids,
+                    employee_id=self.cleaned_data["employee"].id,
+                ).delete()
+            elif action == self.DELETE:
+                # No `pre_delete` and `post_delete` per task: the signal
+                # below covers them all.
+                Task.delete_many(task_ids)
+
+            tasks_bulk_changed.send(
+                sender=Task, task_ids=task_ids, **self.event(action, previous)
+            )
+            self.log_activity(
+                action, self.changed_tasks(action, previous), actor
+            )
+
+        return len(task_ids)
+
+    def changed_tasks(self, action, tasks) -> list:
+        """
+        The tasks of `tasks`, as they were before `action`, that it
+        changed.
+        """
+        if action == self.COMPLETE:
+            return [task for task in tasks if not task.is_completed]
+
+        if action == self.INCOMPLETE:
+            return [task for task in tasks if task.is_completed]
+
+        if action == self.SET_PRIORITY:
+            return [
+                task
+                for task in tasks
+                if task.priority != self.cleaned_data["priority"]
+            ]
+
+        if action == self.ASSIGN:
+            return [task for task in tasks if not task.is_assigned]
+
+        if action == self.UNASSIGN:
+            return [task for task in tasks if task.is_assigned]
+
+        return tasks
+
+    def log_activity(self, action, tasks, actor) -> None:
+        if not tasks:
+            return
+
+        if action == self.SET_PRIORITY:
+            priority = self.cleaned_data["priority"]
+            priorities = dict(Task.PRIORITY_CHOICES)
+            # One record per previous priority.
+            changed = {}
+
+            for task in tasks:
+                changed.setdefault(task.priority, []).append(task)
+
+            for previous, changed_tasks in changed.items():
+                activity.record(
+                    ActivityLog.PRIORITY_CHANGED,
+                    changed_tasks,
+                    actor,
+                    previous=priorities.get(previous, previous),
+                    priority=priorities[priority],
+                )
+        elif action in (self.ASSIGN, self.UNASSIGN):
+            activity.record(
+                (
+                    ActivityLog.ASSIGNED
+                    if action == self.ASSIGN
+                    else ActivityLog.UNASSIGNED
+                ),
+                tasks,
+                actor,
+                employee=self.cleaned_data["employee"].username,
+            )
+        else:
+            activity.record(
+                {
+                    self.COMPLETE: ActivityLog.COMPLETED,
+                    self.INCOMPLETE: ActivityLog.REOPENED,
+                    self.DELETE: ActivityLog.DELETED,
+                }[action],
+                tasks,
+                actor,
+            )
+
+    def event(self, action, tasks) -> dict:
+        """
+        The `tasks_bulk_changed` arguments describing `action` on `tasks`,
+        as they were before it.
+        """
+        if action == self.DELETE:
+            return {"event": TaskEvent.DELETED, "tasks": tasks}
+
+        if action == self.COMPLETE:
+            return {"event": TaskEvent.COMPLETED}
+
+        if action == self.INCOMPLETE:
+            return {"event": TaskEvent.REOPENED}
+
+        if action in (self.ASSIGN, self.UNASSIGN):
+            return {
+                "event": (
+                    TaskEvent.ASSIGNED
+                    if action == self.ASSIGN
+                    else TaskEvent.UNASSIGNED
+                ),
+                "employees": [self.cleaned_data["employee"].id],
+            }
+
+        return {}
@@ -0,0 +1,73 @@
+"""
+Version stamps for the cached task table fragments.
+
+Every task has a version stamp in the cache, replaced whenever the task
+or its type change. `includes/task-table.html` keys each
+row on its task's stamp, and the whole table on the stamps of all the
+rows it shows, so a change to one task re-renders that row and the
+tables containing it, and nothing else. Rows do not show assignees, and
+assigning a task changes the set of rows of the employee's table, hence
+its key, so assignments need no stamp of their own.
+"""
+
+import hashlib
+import uuid
+
+from django.core.cache import cache
+
+VERSION_KEY_PREFIX = "task_manager:task-version"
+TASK_TYPES_VERSION_KEY = "task_manager:task-types-version"
+
+# Stamps outlive the fragments that use them.
+VERSION_TIMEOUT = 7 * 24 * 60 * 60
+
+
+def _new_version() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+def _version_key(task_id) -> str:
+    return f"{VERSION_KEY_PREFIX}:{task_id}"
+
+
+def bump_tasks(task_ids) -> None:
+    cache.set_many(
+        {_version_key(task_id): _new_version() for task_id in task_ids},
+        VERSION_TIMEOUT,
+    )
+
+
+def bump_task_types() -> None:
+    # Rows show the name of their type.
+    cache.set(TASK_TYPES_VERSION_KEY, _new_version(), VERSION_TIMEOUT)
+
+
+def _task_types_version() -> str:
+    return cache.get_or_set(
+        TASK_TYPES_VERSION_KEY, _new_version, VERSION_TIMEOUT
+    )
+
+
+def attach_versions(tasks) -> str:
+    """
+    Set `row_version` on every task and return the cache key of a table
+    made of these rows. Missing stamps are created on the fly.
+    """
+    keys = {task.id: _version_key(task.id) for task in tasks}
+    versions = cache.get_many(keys.values())
+    missing = {
+        key: _new_version() for key in keys.values() if key not in versions
+    }
+
+    if missing:
+        cache.set_many(missing, VERSION_TIMEOUT)
+        versions.update(missing)
+
+    task_types_version = _task_types_version()
+
+    for task in tasks:
+        task.row_version = f"{versions[keys[task.id]]}.{task_types_version}"
+
+    return hashlib.md5(
+        repr([(task.id, task.row_version) for task in tasks]).encode()
+    ).hexdigest()
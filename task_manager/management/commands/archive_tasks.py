@@ -0,0 +1,36 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from task_manager import archive
+
+
+class Command(BaseCommand):
+    help = "Move the tasks completed long ago to the archive."  # noqa
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=archive.ARCHIVE_AFTER.days,
+            help="Archive the tasks completed more than this many days ago.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=archive.BATCH_SIZE,
+            help="Tasks moved per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        archived = 0
+
+        for count in archive.archive_tasks(
+            timedelta(days=options["days"]), options["batch_size"]
+        ):
+            archived += count
+
+            if options["verbosity"] > 1:
+                self.stdout.write(f"Archived {archived} tasks...")
+
+        self.stdout.write(self.style.SUCCESS(f"Archived {archived} tasks."))
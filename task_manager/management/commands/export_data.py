@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand
+
+from task_manager import exports, filters
+from task_manager.models import Employee, Task
+
+
+class Command(BaseCommand):
+    help = "Stream tasks or employees as CSV or NDJSON."  # noqa: VNE003
+
+    def add_arguments(self, parser):
+        parser.add_argument("model", choices=["tasks", "employees"])
+        parser.add_argument(
+            "--format", choices=sorted(exports.FORMATS), default="csv"
+        )
+        parser.add_argument(
+            "--output", help="File to write to instead of standard output."
+        )
+        parser.add_argument("--chunk-size", type=int, default=2000)
+        parser.add_argument(
+            "--name", help="Only export tasks matching this search."
+        )
+        parser.add_argument(
+            "--username",
+            help="Only export employees whose username contains this.",
+        )
+
+    def handle(self, *args, **options):
+        params = {
+            "name": options["name"],
+            "username": options["username"],
+        }
+
+        if options["model"] == "tasks":
+            rows = exports.task_rows(
+                filters.filter_tasks(Task.objects.all(), params),
+                chunk_size=options["chunk_size"],
+            )
+            fields = exports.TASK_FIELDS
+        else:
+            rows = exports.employee_rows(
+                filters.filter_employees(Employee.objects.all(), params),
+                chunk_size=options["chunk_size"],
+            )
+            fields = exports.EMPLOYEE_FIELDS
+
+        chunks = exports.encode(rows, fields, options["format"])
+
+        if options["output"]:
+            with open(
+                options["output"], "w", newline="", encoding="utf-8"
+            ) as output:
+                output.writelines(chunks)
+        else:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
+
+            self.stdout.flush()
@@ -0,0 +1,251 @@
+import csv
+import json
+import re
+import sys
+import time
+from datetime import date
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from task_manager import conditional
+from task_manager.models import Task, TaskEvent, TaskType
+from task_manager.signals import tasks_bulk_changed
+
+FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+TRUE_VALUES = {"1", "true", "yes", "y", "t"}
+
+PRIORITIES = {
+    **{code.lower(): code for code, _ in Task.PRIORITY_CHOICES},
+    **{label.lower(): code for code, label in Task.PRIORITY_CHOICES},
+}
+
+
+class RowError(Exception):
+    pass
+
+
+class InvalidRow:
+    """An input row that could not be parsed, reported with its batch."""
+
+    def __init__(self, reason):
+        self.reason = reason
+
+
+def read_csv(stream):
+    for row in csv.DictReader(stream):
+        row["assignees"] = [
+            username
+            for username in re.split(r"[;,\s]+", row.get("assignees") or "")
+            if username
+        ]
+        yield row
+
+
+def read_jsonl(stream):
+    for line in stream:
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except ValueError as error:
+                yield InvalidRow(f"invalid JSON ({error.msg})")
+
+
+class LookupCache:
+    """
+    Map natural keys to primary keys, querying only the keys a batch
+    needs that have not been seen before.
+    """
+
+    def __init__(self, queryset, field):
+        self.queryset = queryset
+        self.field = field
+        self.ids = {}
+
+    def load(self, keys) -> None:
+        missing = set(keys) - self.ids.keys()
+
+        if missing:
+            self.ids.update(
+                self.queryset.filter(
+                    **{f"{self.field}__in": missing}
+                ).values_list(self.field, "id")
+            )
+
+    def get(self, key):
+        return self.ids.get(key)
+
+
+class Command(BaseCommand):
+    help = "Import tasks from a CSV or JSON Lines file."  # noqa: VNE003
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "path", help="File to import from, or `-` for standard input."
+        )
+        parser.add_argument(
+            "--format",
+            choices=sorted(set(FORMATS.values())),
+            help="Input format; guessed from the file extension if omitted.",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--start-at",
+            type=int,
+            default=0,
+            help="Number of input rows to skip, to resume an import.",
+        )
+
+    def handle(self, *args, **options):
+        input_format = options["format"] or FORMATS.get(
+            "." + options["path"].rsplit(".", 1)[-1].lower()
+        )
+
+        if input_format is None:
+            raise CommandError("Cannot guess the format, pass --format.")
+
+        self.task_types = LookupCache(TaskType.objects, "name")
+        self.employees = LookupCache(get_user_model().objects, "username")
+        self.unknown_assignees = set()
+
+        if options["path"] == "-":
+            self.import_stream(sys.stdin, input_format, options)
+        else:
+            with open(options["path"], newline="", encoding="utf-8") as stream:
+                self.import_stream(stream, input_format, options)
+
+    def import_stream(self, stream, input_format, options):
+        reader = read_csv if input_format == "csv" else read_jsonl
+        rows = islice(reader(stream), options["start_at"], None)
+        position = options["start_at"]
+        imported = 0
+        started = time.perf_counter()
+
+        while batch := list(islice(rows, options["batch_size"])):
+            try:
+                self.import_batch(batch)
+            except RowError as error:
+                raise CommandError(
+                    f"Row {position + error.args[0] + 1}: {error.args[1]}. "
+                    f"Resume with --start-at {position}."
+                )
+
+            position += len(batch)
+            imported += len(batch)
+            rate = imported / (time.perf_counter() - started)
+            self.stdout.write(
+                f"Imported {imported} rows, up to row {position} "
+                f"({rate:.0f} rows/s)"
+            )
+
+        if self.unknown_assignees:
+            self.stderr.write(
+                "Skipped unknown assignees: "
+                + ", ".join(sorted(self.unknown_assignees))
+            )
+
+        self.stdout.write(self.style.SUCCESS(f"Imported {imported} tasks."))
+
+    def import_batch(self, batch):
+        for index, row in enumerate(batch):
+            self.check_row(index, row)
+
+        self.task_types.load(row.get("task_type") for row in batch)
+        self.employees.load(
+            username for row in batch for username in row["assignees"]
+        )
+
+        with transaction.atomic():
+            self.create_missing_task_types(batch)
+
+            tasks = Task.objects.bulk_create(
+                self.build_task(index, row) for index, row in enumerate(batch)
+            )
+
+            through = Task.assignees.through
+            through.objects.bulk_create(
+                through(task_id=task.id, employee_id=employee_id)
+                for task, row in zip(tasks, batch)
+                for employee_id in self.resolve_assignees(row)
+            )
+
+        tasks_bulk_changed.send(
+            sender=Task,
+            task_ids=[task.id for task in tasks],
+            event=TaskEvent.CREATED,
+        )
+
+    def create_missing_task_types(self, batch):
+        missing = {
+            row["task_type"]
+            for row in batch
+            if row.get("task_type")
+            and self.task_types.get(row["task_type"]) is None
+        }
+
+        if missing:
+            TaskType.objects.bulk_create(
+                TaskType(name=name) for name in sorted(missing)
+            )
+            # `bulk_create()` sends no signals.
+            conditional.touch(TaskType)
+            self.task_types.load(missing)
+
+    def check_row(self, index, row):
+        if isinstance(row, InvalidRow):
+            raise RowError(index, row.reason)
+
+        if not isinstance(row, dict):
+            raise RowError(index, "expected an object")
+
+        assignees = row.setdefault("assignees", [])
+
+        if not isinstance(assignees, list) or not all(
+            isinstance(username, str) for username in assignees
+        ):
+            raise RowError(index, "assignees must be a list of usernames")
+
+    def resolve_assignees(self, row):
+        employee_ids = set()
+
+        for username in row["assignees"]:
+            if (employee_id := self.employees.get(username)) is None:
+                self.unknown_assignees.add(username)
+            else:
+                employee_ids.add(employee_id)
+
+        return employee_ids
+
+    def build_task(self, index, row):
+        if not row.get("name"):
+            raise RowError(index, "name is required")
+
+        if not row.get("task_type"):
+            raise RowError(index, "task_type is required")
+
+        try:
+            deadline = date.fromisoformat(str(row.get("deadline")))
+        except ValueError:
+            raise RowError(index, f"invalid deadline {row.get('deadline')!r}")
+
+        priority = PRIORITIES.get(str(row.get("priority", "")).lower())
+
+        if priority is None:
+            raise RowError(index, f"invalid priority {row.get('priority')!r}")
+
+        is_completed = row.get("is_completed", False)
+
+        if isinstance(is_completed, str):
+            is_completed = is_completed.strip().lower() in TRUE_VALUES
+
+        return Task(
+            name=row["name"],
+            description=row.get("description") or "",
+            deadline=deadline,
+            is_completed=bool(is_completed),
+            priority=priority,
+            task_type_id=self.task_types.get(row["task_type"]),
+        )
@@ -0,0 +1,22 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from task_manager import events
+
+
+class Command(BaseCommand):
+    help = "Delete the live task events older than the retention."  # noqa
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than",
+            type=int,
+            default=int(events.RETENTION.total_seconds()),
+            help="Age in seconds of the oldest events to keep.",
+        )
+
+    def handle(self, *args, **options):
+        deleted = events.prune(timedelta(seconds=options["older_than"]))
+
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} events."))
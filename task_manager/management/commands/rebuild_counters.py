@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from task_manager.counters import rebuild_counters
+
+
+class Command(BaseCommand):
+    help = "Recompute the dashboard counters and refresh the cache."  # noqa
+
+    def handle(self, *args, **options):
+        counters = rebuild_counters()
+
+        for name, value in sorted(counters.items()):
+            self.stdout.write(f"{name}: {value}")
+
+        self.stdout.write(self.style.SUCCESS("Dashboard counters rebuilt."))
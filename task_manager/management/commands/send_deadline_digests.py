@@ -0,0 +1,30 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from task_manager import digests
+
+
+class Command(BaseCommand):
+    help = "Email every employee their open tasks due soon or overdue."  # noqa
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=digests.DUE_WITHIN.days,
+            help="Include the tasks due within this many days.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=digests.BATCH_SIZE,
+            help="Messages sent per call to the email backend.",
+        )
+
+    def handle(self, *args, **options):
+        sent = digests.send_deadline_digests(
+            timedelta(days=options["days"]), options["batch_size"]
+        )
+
+        self.stdout.write(self.style.SUCCESS(f"Sent {sent} digests."))
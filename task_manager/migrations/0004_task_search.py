@@ -0,0 +1,104 @@
+from django.db import migrations
+
+# The search structures as of this migration, copied from
+# `task_manager/search.py` so later changes there do not alter it.
+TASK_TABLE = "task_manager_task"
+FTS_TABLE = "task_manager_task_fts"
+
+SQLITE_INSTALL_SQL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        name,
+        description,
+        content='{TASK_TABLE}',
+        content_rowid='id',
+        tokenize='porter unicode61'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert
+    AFTER INSERT ON {TASK_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE} (rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete
+    AFTER DELETE ON {TASK_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update
+    AFTER UPDATE OF name, description ON {TASK_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO {FTS_TABLE} (rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rank) "
+    f"VALUES ('rank', 'bm25(10.0, 1.0)')",
+    f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+SQLITE_UNINSTALL_SQL = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_insert",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_delete",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_update",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+POSTGRESQL_INSTALL_SQL = [
+    f"""
+    ALTER TABLE {TASK_TABLE} ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    f"""
+    CREATE INDEX IF NOT EXISTS {TASK_TABLE}_search_idx
+    ON {TASK_TABLE} USING GIN (search_vector)
+    """,
+]
+
+POSTGRESQL_UNINSTALL_SQL = [
+    f"DROP INDEX IF EXISTS {TASK_TABLE}_search_idx",
+    f"ALTER TABLE {TASK_TABLE} DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def _execute(schema_editor, statements):
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def install_search(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+
+    if vendor == "sqlite":
+        _execute(schema_editor, SQLITE_INSTALL_SQL)
+    elif vendor == "postgresql":
+        _execute(schema_editor, POSTGRESQL_INSTALL_SQL)
+
+
+def uninstall_search(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+
+    if vendor == "sqlite":
+        _execute(schema_editor, SQLITE_UNINSTALL_SQL)
+    elif vendor == "postgresql":
+        _execute(schema_editor, POSTGRESQL_UNINSTALL_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("task_manager", "0003_task_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search, uninstall_search),
+    ]
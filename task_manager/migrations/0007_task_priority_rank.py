@@ -0,0 +1,63 @@
+# Generated by Django 4.1.3 on 2026-10-18 19:44
+
+from django.db import migrations, models
+import task_manager.models
+
+
+def rank_priorities(apps, schema_editor):
+    Task = apps.get_model("task_manager", "Task")
+
+    for rank, code in enumerate(["UR", "HI", "ME", "LO", "TR"]):
+        Task.objects.filter(priority=code).update(priority_rank=rank)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("task_manager", "0006_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="priority_rank",
+            field=task_manager.models.PriorityRankField(
+                default=5, editable=False
+            ),
+        ),
+        migrations.RunPython(rank_priorities, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["is_completed", "priority_rank", "deadline", "id"],
+                name="task_priority_ordering_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["priority_rank", "is_completed", "deadline", "id"],
+                name="task_priority_filter_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["task_type", "is_completed", "deadline", "id"],
+                name="task_type_ordering_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=[
+                    "task_type",
+                    "is_completed",
+                    "priority_rank",
+                    "deadline",
+                    "id",
+                ],
+                name="task_type_priority_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,81 @@
+# Generated by Django 4.1.3 on 2026-10-18 20:03
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("task_manager", "0007_task_priority_rank"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedTask",
+            fields=[
+                (
+                    "id",
+                    models.BigIntegerField(primary_key=True, serialize=False),
+                ),
+                ("name", models.CharField(max_length=255)),
+                ("description", models.TextField(blank=True)),
+                ("deadline", models.DateField()),
+                (
+                    "priority",
+                    models.CharField(
+                        choices=[
+                            ("UR", "Urgent"),
+                            ("HI", "High"),
+                            ("ME", "Medium"),
+                            ("LO", "Low"),
+                            ("TR", "Trivial"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                ("priority_rank", models.PositiveSmallIntegerField()),
+                ("updated_at", models.DateTimeField()),
+                ("archived_at", models.DateTimeField()),
+                (
+                    "assignees",
+                    models.ManyToManyField(
+                        related_name="archived_tasks",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "task_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_tasks",
+                        to="task_manager.tasktype",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["deadline"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="archivedtask",
+            index=models.Index(
+                fields=["deadline", "id"], name="archived_ordering_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="archivedtask",
+            index=models.Index(
+                fields=["priority_rank", "deadline", "id"],
+                name="archived_priority_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="archivedtask",
+            index=models.Index(
+                fields=["task_type", "deadline", "id"],
+                name="archived_type_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 4.1.3 on 2026-10-18 20:17
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("task_manager", "0008_archived_task"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ActivityLog",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("ts", models.DateTimeField()),
+                ("task_id", models.BigIntegerField()),
+                ("task_name", models.CharField(max_length=255)),
+                (
+                    "action",
+                    models.CharField(
+                        choices=[
+                            ("created", "Created"),
+                            ("updated", "Updated"),
+                            ("completed", "Completed"),
+                            ("reopened", "Reopened"),
+                            ("deleted", "Deleted"),
+                            ("assigned", "Assigned"),
+                            ("unassigned", "Unassigned"),
+                            ("priority_changed", "Changed the priority"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("data", models.JSONField(default=dict)),
+                (
+                    "actor",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="activity",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-ts", "-id"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="activitylog",
+            index=models.Index(
+                fields=["task_id", "ts", "id"], name="activity_task_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="activitylog",
+            index=models.Index(
+                fields=["actor", "ts", "id"], name="activity_actor_idx"
+            ),
+        ),
+    ]
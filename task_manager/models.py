@@ -1,12 +1,14 @@
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
-from django.db import models
-from django.db.models import F
+from django.db import models, router, transaction
+from django.db.models import F, Q, Value
+from django.db.models.signals import m2m_changed
 from django.urls import reverse
 
 
 class Position(models.Model):
     name = models.CharField(max_length=255)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self) -> str:
         return self.name
@@ -16,6 +18,7 @@ class Employee(AbstractUser):
     position = models.ForeignKey(
         Position, on_delete=models.PROTECT, related_name="employees"
     )
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self) -> str:
         return f"{self.username} ({self.first_name} {self.last_name})"
@@ -26,11 +29,32 @@ class Employee(AbstractUser):
 
 class TaskType(models.Model):
     name = models.CharField(max_length=255)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self) -> str:
         return self.name
 
 
+class PriorityRankField(models.PositiveSmallIntegerField):
+    """
+    The rank of the task's priority, 0 being the most urgent. Set on
+    every save, `bulk_create()` included, so that orderings by urgency
+    can use an index instead of a `CASE` expression over the codes.
+    """
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("editable", False)
+        super().__init__(*args, **kwargs)
+
+    def pre_save(self, model_instance, add):
+        # Not `model_instance.rank_priority()`: historical models of
+        # migrations have no methods.
+        value = Task.rank_priority(model_instance.priority)
+        setattr(model_instance, self.attname, value)
+
+        return value
+
+
 class Task(models.Model):
     URGENT = "UR"
     HIGH = "HI"
@@ -51,19 +75,291 @@ class Task(models.Model):
     deadline = models.DateField()
     is_completed = models.BooleanField(default=False)
     priority = models.CharField(max_length=10, choices=PRIORITY_CHOICES)
+    priority_rank = PriorityRankField(default=len(PRIORITY_CHOICES))
     task_type = models.ForeignKey(
         TaskType, on_delete=models.CASCADE, related_name="tasks"
     )
     assignees = models.ManyToManyField(
         settings.AUTH_USER_MODEL, related_name="tasks"
     )
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["is_completed", "deadline"]
+        indexes = [
+            # Serve the orderings of the list and their keyset pagination,
+            # after an optional equality filter on the priority or type.
+            # See `TaskFilterForm`.
+            models.Index(
+                fields=["is_completed", "deadline", "id"],
+                name="task_ordering_idx",
+            ),
+            models.Index(
+                fields=["is_completed", "priority_rank", "deadline", "id"],
+                name="task_priority_ordering_idx",
+            ),
+            models.Index(
+                fields=["priority_rank", "is_completed", "deadline", "id"],
+                name="task_priority_filter_idx",
+            ),
+            models.Index(
+                fields=["task_type", "is_completed", "deadline", "id"],
+                name="task_type_ordering_idx",
+            ),
+            models.Index(
+                fields=[
+                    "task_type",
+                    "is_completed",
+                    "priority_rank",
+                    "deadline",
+                    "id",
+                ],
+                name="task_type_priority_idx",
+            ),
+            # Partial indexes only cover open tasks, which is what the
+            # dashboard counts. Backends without partial index support
+            # skip them.
+            models.Index(
+                fields=["priority"],
+                condition=Q(is_completed=False),
+                name="task_open_priority_idx",
+            ),
+            models.Index(
+                fields=["deadline"],
+                condition=Q(is_completed=False),
+                name="task_open_deadline_idx",
+            ),
+        ]
+
+    @classmethod
+    def rank_priority(cls, priority) -> int:
+        """The `priority_rank` of a priority code, unknown ones last."""
+        for rank, (code, _) in enumerate(cls.PRIORITY_CHOICES):
+            if code == priority:
+                return rank
+
+        return len(cls.PRIORITY_CHOICES)
+
+    @classmethod
+    def delete_many(cls, task_ids) -> int:
+        """
+        Delete the tasks of `task_ids` and their assignments, with one
+        `DELETE` each, and return how many tasks were deleted.
+
+        Unlike `QuerySet.delete()`, sends no signal per task: callers send
+        `tasks_bulk_changed` once for all of them.
+        """
+        through = cls.assignees.through
+        # Not `QuerySet.db`, which routes reads.
+        using = router.db_for_write(cls)
+
+        with transaction.atomic(using=using):
+            # No signal receivers nor relations on the through table, so
+            # `delete()` takes its fast path: a single `DELETE`.
+            through.objects.using(using).filter(task_id__in=task_ids).delete()
+
+            # `delete()` would send `pre_delete` and `post_delete` per task.
+            # `_raw_delete()` is the `DELETE` it runs on fast paths; it is
+            # private, but its behaviour is unchanged up to Django 4.1,
+            # which `requirements.txt` pins.
+            return cls.objects.filter(id__in=task_ids)._raw_delete(using)
 
     def toggle_completed(self):
         self.is_completed = not self.is_completed
-        self.save()
+        self.save(update_fields=["is_completed", "updated_at"])
+
+    def toggle_assignee(self, employee_id: int) -> bool:
+        """
+        Assign or unassign the employee and return whether they are
+        assigned afterwards.
+
+        Works on the through table directly, so the cost does not depend
+        on how many tasks the employee has. Concurrent toggles serialize
+        on the deleted row, and duplicate inserts are ignored.
+        """
+        through = Task.assignees.through
+        row = {"task_id": self.id, "employee_id": employee_id}
+
+        with transaction.atomic():
+            removed, _ = through.objects.filter(**row).delete()
+
+            if not removed:
+                through.objects.bulk_create(
+                    [through(**row)], ignore_conflicts=True
+                )
+
+        # Raw through table writes skip the related manager, so tell the
+        # `m2m_changed` receivers ourselves.
+        m2m_changed.send(
+            sender=through,
+            instance=self,
+            action="post_remove" if removed else "post_add",
+            reverse=False,
+            model=through._meta.get_field("employee").related_model,
+            pk_set={employee_id},
+            using=self._state.db,
+        )
+
+        return not removed
 
     def __str__(self) -> str:
         return f"{self.name}"
+
+
+class ArchivedTaskManager(models.Manager):
+    def get_queryset(self):
+        # Archived tasks are all completed. The annotation lets them share
+        # the orderings, filters and cursors of `Task`.
+        return (
+            super()
+            .get_queryset()
+            .annotate(
+                is_completed=Value(True, output_field=models.BooleanField())
+            )
+        )
+
+
+class ArchivedTask(models.Model):
+    """
+    A completed task moved out of `Task` by the `archive_tasks` command,
+    with its assignees. Keeps the task's id, which `Task` never reuses.
+    """
+
+    id = models.BigIntegerField(primary_key=True)  # noqa: VNE003
+    name = models.CharField(max_length=255)
+    description = models.TextField(blank=True)
+    deadline = models.DateField()
+    priority = models.CharField(max_length=10, choices=Task.PRIORITY_CHOICES)
+    priority_rank = models.PositiveSmallIntegerField()
+    task_type = models.ForeignKey(
+        TaskType, on_delete=models.CASCADE, related_name="archived_tasks"
+    )
+    assignees = models.ManyToManyField(
+        settings.AUTH_USER_MODEL, related_name="archived_tasks"
+    )
+    # Last change of the task, its completion included.
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField()
+
+    is_archived = True
+
+    objects = ArchivedTaskManager()
+
+    class Meta:
+        ordering = ["deadline"]
+        # The orderings of `TaskFilterForm`, without the constant
+        # `is_completed`, after the same optional equality filters.
+        indexes = [
+            models.Index(
+                fields=["deadline", "id"], name="archived_ordering_idx"
+            ),
+            models.Index(
+                fields=["priority_rank", "deadline", "id"],
+                name="archived_priority_idx",
+            ),
+            models.Index(
+                fields=["task_type", "deadline", "id"],
+                name="archived_type_idx",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.name}"
+
+
+class TaskEvent(models.Model):
+    """
+    A change to a task, published to the live task boards. The SSE stream
+    polls this table, so events reach the clients of every worker process.
+    """
+
+    CREATED = "created"
+    UPDATED = "updated"
+    COMPLETED = "completed"
+    REOPENED = "reopened"
+    DELETED = "deleted"
+    ASSIGNED = "assigned"
+    UNASSIGNED = "unassigned"
+
+    KIND_CHOICES = [
+        (CREATED, "Created"),
+        (UPDATED, "Updated"),
+        (COMPLETED, "Completed"),
+        (REOPENED, "Reopened"),
+        (DELETED, "Deleted"),
+        (ASSIGNED, "Assigned"),
+        (UNASSIGNED, "Unassigned"),
+    ]
+
+    # Not a foreign key: events of deleted tasks are still published.
+    task_id = models.BigIntegerField()
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    data = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ["id"]
+
+    def __str__(self) -> str:
+        return f"{self.kind} task {self.task_id}"
+
+
+class ActivityLog(models.Model):
+    """
+    Who changed which task, and when. Append-only, and written in batches
+    by `activity.py`.
+    """
+
+    CREATED = "created"
+    UPDATED = "updated"
+    COMPLETED = "completed"
+    REOPENED = "reopened"
+    DELETED = "deleted"
+    ASSIGNED = "assigned"
+    UNASSIGNED = "unassigned"
+    PRIORITY_CHANGED = "priority_changed"
+
+    ACTION_CHOICES = [
+        (CREATED, "Created"),
+        (UPDATED, "Updated"),
+        (COMPLETED, "Completed"),
+        (REOPENED, "Reopened"),
+        (DELETED, "Deleted"),
+        (ASSIGNED, "Assigned"),
+        (UNASSIGNED, "Unassigned"),
+        (PRIORITY_CHANGED, "Changed the priority"),
+    ]
+
+    # When the change was made, not when the entry was written.
+    ts = models.DateTimeField()
+    # Without a constraint, deleting an employee leaves their history
+    # alone instead of loading it to update it. Null for anonymous users.
+    actor = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="activity",
+    )
+    # Not a foreign key: the history outlives the task, archived or
+    # deleted, so it keeps the task's name too.
+    task_id = models.BigIntegerField()
+    task_name = models.CharField(max_length=255)
+    action = models.CharField(max_length=20, choices=ACTION_CHOICES)
+    data = models.JSONField(default=dict)
+
+    class Meta:
+        ordering = ["-ts", "-id"]
+        # The per-task and per-employee histories, and their keyset
+        # pagination.
+        indexes = [
+            models.Index(
+                fields=["task_id", "ts", "id"], name="activity_task_idx"
+            ),
+            models.Index(
+                fields=["actor", "ts", "id"], name="activity_actor_idx"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.action} task {self.task_id}"
@@ -0,0 +1,406 @@
+import base64
+import binascii
+import datetime
+import json
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import (
+    BooleanField,
+    Expression,
+    F,
+    Q,
+    QuerySet,
+    Value,
+)
+from django.http import Http404
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    def default(self, value):
+        # `DjangoJSONEncoder` drops the microseconds past the millisecond,
+        # so a cursor would skip the rows between the two.
+        if isinstance(value, (datetime.datetime, datetime.time)):
+            return value.isoformat()
+
+        return super().default(value)
+
+
+def encode_cursor(values: list, reverse: bool = False) -> str:
+    payload = json.dumps(
+        {"v": values, "r": reverse},
+        cls=CursorEncoder,
+        separators=(",", ":"),
+    )
+
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[list, bool]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return list(payload["v"]), bool(payload["r"])
+    except (binascii.Error, ValueError, KeyError, TypeError) as error:
+        raise InvalidCursor(cursor) from error
+
+
+def _field_name(field: str) -> str:
+    return field.lstrip("-")
+
+
+def _reverse_ordering(ordering: tuple) -> tuple:
+    return tuple(
+        _field_name(field) if field.startswith("-") else f"-{field}"
+        for field in ordering
+    )
+
+
+def _output_field(queryset: QuerySet, name: str):
+    if name in queryset.query.annotations:
+        return queryset.query.annotations[name].output_field
+
+    try:
+        return queryset.model._meta.get_field(name)
+    except FieldDoesNotExist:
+        raise InvalidCursor(name)
+
+
+class RowValueComparison(Expression):
+    """
+    `(a, b, c) > (x, y, z)`. Unlike the equivalent chain of `OR`s, row
+    values let SQLite, PostgreSQL and MySQL seek straight to the cursor
+    position in a matching composite index.
+    """
+
+    output_field = BooleanField()
+
+    def __init__(self, fields, values, operator):
+        super().__init__()
+        self.lhs = [F(field) for field in fields]
+        self.rhs = [Value(value) for value in values]
+        self.operator = operator
+
+    def get_source_expressions(self):
+        return [*self.lhs, *self.rhs]
+
+    def set_source_expressions(self, exprs):
+        self.lhs, self.rhs = exprs[: len(self.lhs)], exprs[len(self.lhs) :]
+
+    def resolve_expression(self, *args, **kwargs):
+        resolved = super().resolve_expression(*args, **kwargs)
+        # Let the column types adapt the cursor values (dates, booleans...).
+        resolved.rhs = [
+            Value(value.value, output_field=column.output_field)
+            for column, value in zip(resolved.lhs, resolved.rhs)
+        ]
+
+        return resolved
+
+    def _compile(self, compiler, expressions):
+        compiled = [compiler.compile(expression) for expression in expressions]
+
+        return [sql for sql, _ in compiled], [list(p) for _, p in compiled]
+
+    def as_sql(self, compiler, connection):
+        if connection.vendor == "sqlite" and (
+            connection.Database.sqlite_version_info < (3, 15)
+        ):
+            return self.as_oracle(compiler, connection)
+
+        lhs_sql, lhs_params = self._compile(compiler, self.lhs)
+        rhs_sql, rhs_params = self._compile(compiler, self.rhs)
+        sql = "(%s) %s (%s)" % (
+            ", ".join(lhs_sql),
+            self.operator,
+            ", ".join(rhs_sql),
+        )
+
+        return sql, sum(lhs_params + rhs_params, [])
+
+    def as_oracle(self, compiler, connection):
+        # No row value comparisons here, so expand them into `OR`s.
+        lhs_sql, lhs_params = self._compile(compiler, self.lhs)
+        rhs_sql, rhs_params = self._compile(compiler, self.rhs)
+        terms, params = [], []
+
+        for index in range(len(lhs_sql)):
+            parts = []
+
+            for previous in range(index):
+                parts.append(f"{lhs_sql[previous]} = {rhs_sql[previous]}")
+                params += lhs_params[previous] + rhs_params[previous]
+
+            parts.append(f"{lhs_sql[index]} {self.operator} {rhs_sql[index]}")
+            params += lhs_params[index] + rhs_params[index]
+            terms.append("(%s)" % " AND ".join(parts))
+
+        return "(%s)" % " OR ".join(terms), params
+
+
+def keyset_filter(ordering: tuple, values: list):
+    """
+    Build the filter selecting the rows after `values` in `ordering`.
+
+    Orderings in one direction become a single row value comparison;
+    mixed directions are expanded into plain lookups.
+    """
+    directions = {field.startswith("-") for field in ordering}
+
+    if len(directions) == 1:
+        return RowValueComparison(
+            [_field_name(field) for field in ordering],
+            values,
+            "<" if directions.pop() else ">",
+        )
+
+    condition = Q()
+
+    for index, field in enumerate(ordering):
+        lookup = "lt" if field.startswith("-") else "gt"
+        term = Q(**{f"{_field_name(field)}__{lookup}": values[index]})
+
+        for previous, value in zip(ordering[:index], values):
+            term &= Q(**{_field_name(previous): value})
+
+        condition |= term
+
+    return condition
+
+
+class CursorPage:
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+    def has_other_pages(self) -> bool:
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """
+    Keyset paginator: every page is a `WHERE (ordering) > (cursor)` range
+    scan with a `LIMIT`, so neither `OFFSET` nor `COUNT(*)` is ever run.
+
+    `ordering` must end with a unique, non-null field (normally `id`).
+    """
+
+    is_cursor_based = True
+
+    def __init__(self, queryset: QuerySet, per_page: int, ordering: tuple):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.ordering = tuple(ordering)
+
+    @staticmethod
+    def _value(obj, name: str):
+        if isinstance(obj, dict):
+            return obj[name]
+
+        return getattr(obj, name)
+
+    def _position(self, obj) -> list:
+        return [
+            self._value(obj, _field_name(field)) for field in self.ordering
+        ]
+
+    def _parse_values(self, values: list) -> list:
+        if len(values) != len(self.ordering):
+            raise InvalidCursor(values)
+
+        try:
+            return [
+                _output_field(self.queryset, _field_name(field)).to_python(
+                    value
+                )
+                for field, value in zip(self.ordering, values)
+            ]
+        # Tampered cursors may hold lists or objects, which `to_python()`
+        # rejects with `TypeError` rather than `ValidationError`.
+        except (TypeError, ValueError, ValidationError) as error:
+            raise InvalidCursor(values) from error
+
+    def _parse_cursor(self, cursor: str = None) -> tuple[tuple, list, bool]:
+        values, reverse = None, False
+
+        if cursor:
+            values, reverse = decode_cursor(cursor)
+            values = self._parse_values(values)
+
+        ordering = (
+            _reverse_ordering(self.ordering) if reverse else self.ordering
+        )
+
+        return ordering, values, reverse
+
+    def _slice(self, queryset: QuerySet, ordering: tuple, values: list):
+        queryset = queryset.order_by(*ordering)
+
+        if values is not None:
+            queryset = queryset.filter(keyset_filter(ordering, values))
+
+        return queryset[: self.per_page + 1]
+
+    def _queryset(self, cursor: str = None) -> tuple[QuerySet, list, bool]:
+        ordering, values, reverse = self._parse_cursor(cursor)
+
+        return self._slice(self.queryset, ordering, values), values, reverse
+
+    def _page(self, rows: list, values: list, reverse: bool) -> CursorPage:
+        has_more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+
+        if reverse:
+            rows.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, values is not None
+
+        if not rows:
+            return CursorPage(rows)
+
+        return CursorPage(
+            rows,
+            next_cursor=(
+                encode_cursor(self._position(rows[-1])) if has_next else None
+            ),
+            previous_cursor=(
+                encode_cursor(self._position(rows[0]), reverse=True)
+                if has_previous
+                else None
+            ),
+        )
+
+    def page(self, cursor: str = None) -> CursorPage:
+        queryset, values, reverse = self._queryset(cursor)
+
+        return self._page(list(queryset), values, reverse)
+
+    async def apage(self, cursor: str = None) -> CursorPage:
+        queryset, values, reverse = self._queryset(cursor)
+
+        return self._page([row async for row in queryset], values, reverse)
+
+
+class MergedCursorPaginator(CursorPaginator):
+    """
+    Keyset paginator over several querysets of disjoint rows sharing the
+    fields of `ordering`, e.g. a table and its archive. Every page reads
+    a page of rows from each of them, and keeps the first ones.
+    """
+
+    def __init__(self, querysets, per_page: int, ordering: tuple):
+        super().__init__(querysets[0], per_page, ordering)
+        self.querysets = list(querysets)
+
+    def _merge(self, rows: list, ordering: tuple) -> list:
+        # Stable sorts, from the last field of the ordering to the first.
+        for field in reversed(ordering):
+            rows.sort(
+                key=lambda row, name=_field_name(field): self._value(
+                    row, name
+                ),
+                reverse=field.startswith("-"),
+            )
+
+        return rows[: self.per_page + 1]
+
+    def page(self, cursor: str = None) -> CursorPage:
+        ordering, values, reverse = self._parse_cursor(cursor)
+        rows = []
+
+        for queryset in self.querysets:
+            rows += self._slice(queryset, ordering, values)
+
+        return self._page(self._merge(rows, ordering), values, reverse)
+
+    async def apage(self, cursor: str = None) -> CursorPage:
+        ordering, values, reverse = self._parse_cursor(cursor)
+        rows = []
+
+        for queryset in self.querysets:
+            rows += [
+                row async for row in self._slice(queryset, ordering, values)
+            ]
+
+        return self._page(self._merge(rows, ordering), values, reverse)
+
+
+class CursorPaginationMixin:
+    """
+    Replace `MultipleObjectMixin`'s page-number pagination with keyset
+    pagination over `cursor_ordering`. Returning `None` from
+    `get_cursor_ordering()` falls back to page numbers.
+    """
+
+    cursor_ordering = ("id",)
+    cursor_query_param = "cursor"
+
+    def get_cursor_ordering(self):
+        return self.cursor_ordering
+
+    def get_cursor_paginator(self, queryset, page_size, ordering):
+        return CursorPaginator(queryset, page_size, ordering)
+
+    def paginate_queryset(self, queryset, page_size):
+        ordering = self.get_cursor_ordering()
+
+        if ordering is None:
+            return super().paginate_queryset(queryset, page_size)
+
+        paginator = self.get_cursor_paginator(queryset, page_size, ordering)
+
+        try:
+            page = paginator.page(
+                self.request.GET.get(self.cursor_query_param)
+            )
+        except InvalidCursor:
+            raise Http404("Invalid cursor")
+
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    def _paginate_by_number(self, queryset, page_size):
+        paginator, page, object_list, is_paginated = super().paginate_queryset(
+            queryset, page_size
+        )
+        # Fetch the rows here, rather than from the caller's event loop.
+        page.object_list = list(object_list)
+
+        return paginator, page, page.object_list, is_paginated
+
+    async def apaginate_queryset(self, queryset, page_size):
+        ordering = self.get_cursor_ordering()
+
+        if ordering is None:
+            return await sync_to_async(self._paginate_by_number)(
+                queryset, page_size
+            )
+
+        paginator = self.get_cursor_paginator(queryset, page_size, ordering)
+
+        try:
+            page = await paginator.apage(
+                self.request.GET.get(self.cursor_query_param)
+            )
+        except InvalidCursor:
+            raise Http404("Invalid cursor")
+
+        return paginator, page, page.object_list, page.has_other_pages()
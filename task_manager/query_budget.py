@@ -0,0 +1,178 @@
+"""
+Per-view SQL query budgets.
+
+Views declare how many queries and how much SQL time they may use with
+the `query_budget` decorator, and `QUERY_BUDGETS` can override them by
+URL name. `QueryBudgetMiddleware` measures every request and logs the
+offending query fingerprints when a view goes over its budget, or raises
+`QueryBudgetExceeded` when `QUERY_BUDGET_RAISE` is set, as in the tests.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.utils.deprecation import MiddlewareMixin
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_TIME = 1.0
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class QueryBudget:
+    def __init__(self, max_queries=None, max_time=DEFAULT_MAX_TIME):
+        self.max_queries = max_queries
+        self.max_time = max_time
+
+    def __repr__(self):
+        return (
+            f"QueryBudget(max_queries={self.max_queries}, "
+            f"max_time={self.max_time})"
+        )
+
+
+def query_budget(max_queries=None, max_time=DEFAULT_MAX_TIME):
+    """Declare the budget of a function view or a view class."""
+
+    def decorator(view):
+        view.query_budget = QueryBudget(max_queries, max_time)
+        return view
+
+    return decorator
+
+
+def get_budget(view_func, view_name):
+    if overrides := getattr(settings, "QUERY_BUDGETS", {}).get(view_name):
+        return QueryBudget(**overrides)
+
+    if budget := getattr(view_func, "query_budget", None):
+        return budget
+
+    return getattr(
+        getattr(view_func, "view_class", None), "query_budget", None
+    )
+
+
+def fingerprint(sql: str) -> str:
+    """Reduce a query to its shape, so that repeated queries group up."""
+    sql = re.sub(r"'(?:[^']|'')*'", "?", sql)
+    sql = re.sub(r"\b\d+(\.\d+)?\b", "?", sql)
+    sql = re.sub(r"%s", "?", sql)
+    sql = re.sub(r"\(\s*\?(\s*,\s*\?)*\s*\)", "(...)", sql)
+
+    return re.sub(r"\s+", " ", sql).strip()
+
+
+class QueryRecorder:
+    def __init__(self):
+        self.count = 0
+        self.time = 0.0
+        self.fingerprints = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.time += time.perf_counter() - start
+            self.count += 1
+            self.fingerprints[fingerprint(sql)] += 1
+
+
+# The recorder of the current request. Async views run their queries in
+# worker threads, on connections of their own; a context variable follows
+# the request there, where a connection's execute wrappers would not.
+current_recorder = ContextVar("query_budget_recorder", default=None)
+
+
+def record_query(execute, sql, params, many, context):
+    if (recorder := current_recorder.get()) is None:
+        return execute(sql, params, many, context)
+
+    return recorder(execute, sql, params, many, context)
+
+
+def install(connection) -> None:
+    """Let `QueryBudgetMiddleware` record the queries of `connection`."""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, record_query)
+
+
+class QueryBudgetMiddleware(MiddlewareMixin):
+    # Async capable, so that async views are not run in a thread just for
+    # the sake of this middleware.
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        with self.recording() as recorder:
+            response = self.get_response(request)
+
+        self.finish(request, recorder)
+
+        return response
+
+    async def __acall__(self, request):
+        with self.recording() as recorder:
+            response = await self.get_response(request)
+
+        self.finish(request, recorder)
+
+        return response
+
+    @contextmanager
+    def recording(self):
+        recorder = QueryRecorder()
+        token = current_recorder.set(recorder)
+
+        try:
+            yield recorder
+        finally:
+            current_recorder.reset(token)
+
+    def finish(self, request, recorder):
+        if budget := getattr(request, "query_budget", None):
+            self.check(request, budget, recorder)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.query_budget = get_budget(
+            view_func, request.resolver_match.view_name
+        )
+
+    def check(self, request, budget, recorder):
+        over_count = (
+            budget.max_queries is not None
+            and recorder.count > budget.max_queries
+        )
+        over_time = (
+            budget.max_time is not None and recorder.time > budget.max_time
+        )
+
+        if not (over_count or over_time):
+            return
+
+        message = (
+            f"{request.resolver_match.view_name} ran {recorder.count} "
+            f"queries in {recorder.time * 1000:.1f} ms, over its {budget}. "
+            "Most frequent queries:\n"
+            + "\n".join(
+                f"{count:>5} x {sql}"
+                for sql, count in recorder.fingerprints.most_common(5)
+            )
+        )
+
+        if getattr(settings, "QUERY_BUDGET_RAISE", False):
+            raise QueryBudgetExceeded(message)
+
+        logger.warning(message)
@@ -0,0 +1,138 @@
+"""
+Full-text search over `Task.name` and `Task.description`.
+
+SQLite keeps an external-content FTS5 table in sync through triggers.
+PostgreSQL keeps a generated, weighted `tsvector` column with a GIN index.
+Other backends, and the task archive, fall back to `icontains` lookups.
+"""
+
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q, QuerySet
+from django.db.models.expressions import RawSQL
+
+TASK_TABLE = "task_manager_task"
+FTS_TABLE = "task_manager_task_fts"
+
+# The triggers of migration 0004, recreated by `ensure_triggers()`.
+SQLITE_TRIGGERS_SQL = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert
+    AFTER INSERT ON {TASK_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE} (rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete
+    AFTER DELETE ON {TASK_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update
+    AFTER UPDATE OF name, description ON {TASK_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO {FTS_TABLE} (rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+]
+
+
+def _execute(connection, statements) -> None:
+    with connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+
+
+def ensure_triggers(connection) -> None:
+    """
+    SQLite drops the triggers whenever a migration rebuilds the task
+    table, so they are recreated after every `migrate` run.
+    """
+    if connection.vendor != "sqlite":
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s",
+            [FTS_TABLE],
+        )
+        installed = cursor.fetchone() is not None
+
+    if installed:
+        _execute(connection, SQLITE_TRIGGERS_SQL)
+
+
+def search_tasks(queryset: QuerySet, query: str) -> QuerySet:
+    """
+    Filter `queryset` down to tasks matching every word of `query` as a
+    prefix, ordered by relevance.
+    """
+    terms = re.findall(r"\w+", query)
+
+    if not terms:
+        return queryset
+
+    vendor = connections[queryset.db].vendor
+
+    if queryset.model._meta.db_table != TASK_TABLE:
+        # No search structures for other tables, such as the archive.
+        vendor = None
+
+    if vendor == "sqlite":
+        match = " ".join(f'"{term}"*' for term in terms)
+
+        # SQLite runs the subquery on the FTS index, then looks the
+        # matching tasks up by primary key.
+        return (
+            queryset.filter(
+                id__in=RawSQL(
+                    f"SELECT rowid FROM {FTS_TABLE} "
+                    f"WHERE {FTS_TABLE} MATCH %s",
+                    [match],
+                )
+            )
+            .annotate(
+                search_rank=RawSQL(
+                    f"SELECT rank FROM {FTS_TABLE} "
+                    f"WHERE {FTS_TABLE} MATCH %s "
+                    f"AND rowid = {TASK_TABLE}.id",
+                    [match],
+                    output_field=FloatField(),
+                )
+            )
+            .order_by("search_rank", "id")
+        )
+
+    if vendor == "postgresql":
+        tsquery = " & ".join(f"{term}:*" for term in terms)
+
+        return (
+            queryset.filter(
+                RawSQL(
+                    "search_vector @@ to_tsquery('english', %s)",
+                    [tsquery],
+                    output_field=BooleanField(),
+                )
+            )
+            .annotate(
+                search_rank=RawSQL(
+                    "ts_rank(search_vector, to_tsquery('english', %s))",
+                    [tsquery],
+                    output_field=FloatField(),
+                )
+            )
+            .order_by("-search_rank", "id")
+        )
+
+    condition = Q()
+
+    for term in terms:
+        condition &= Q(name__icontains=term) | Q(description__icontains=term)
+
+    return queryset.filter(condition)
@@ -0,0 +1,172 @@
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_migrate,
+    post_save,
+)
+from django.dispatch import Signal, receiver
+
+from . import (
+    auth,
+    conditional,
+    counters,
+    events,
+    fragments,
+    query_budget,
+    search,
+)
+from .models import Employee, Position, Task, TaskEvent, TaskType
+
+# Sent with `task_ids` after writes that bypass the model signals, such as
+# `bulk_create()`, `QuerySet.update()` or `Task.delete_many()`. The
+# optional `event` (a `TaskEvent` kind, "updated" by default) and
+# `employees` describe the change to the live task boards. Deletions come
+# with the deleted `tasks`, which can no longer be loaded.
+tasks_bulk_changed = Signal()
+
+
+@receiver([post_save, post_delete], sender=Task)
+@receiver(tasks_bulk_changed, sender=Task)
+def invalidate_task_counters(sender, **kwargs):
+    counters.invalidate_counters()
+
+
+@receiver([post_save, post_delete], sender=Employee)
+def invalidate_employee_counters(sender, update_fields=None, **kwargs):
+    # Every login saves `last_login`, which doesn't affect any counter.
+    if update_fields and set(update_fields) == {"last_login"}:
+        return
+
+    counters.invalidate_counters()
+
+
+@receiver(post_migrate)
+def ensure_search_triggers(sender, using, **kwargs):
+    if sender.name == "task_manager":
+        search.ensure_triggers(connections[using])
+
+
+@receiver([post_save, post_delete], sender=Task)
+def bump_task_fragment(sender, instance, **kwargs):
+    fragments.bump_tasks([instance.id])
+
+
+@receiver(tasks_bulk_changed, sender=Task)
+def bump_bulk_task_fragments(sender, task_ids, **kwargs):
+    fragments.bump_tasks(task_ids)
+
+
+@receiver([post_save, post_delete], sender=TaskType)
+def bump_task_type_fragments(sender, **kwargs):
+    fragments.bump_task_types()
+
+
+@receiver([post_save, post_delete], sender=Task)
+@receiver([post_save, post_delete], sender=TaskType)
+@receiver([post_save, post_delete], sender=Position)
+@receiver([post_save, post_delete], sender=Employee)
+def touch_table(sender, using, update_fields=None, **kwargs):
+    # Logins only save `last_login`, which no page shows.
+    if update_fields and set(update_fields) == {"last_login"}:
+        return
+
+    conditional.touch(sender, using=using)
+
+
+@receiver([post_save, post_delete], sender=Employee)
+def invalidate_cached_user(sender, instance, using, **kwargs):
+    # Password changes included, they save the employee.
+    auth.invalidate_users([instance.pk], using=using)
+
+
+@receiver(post_save, sender=Position)
+def invalidate_position_users(sender, instance, using, created, **kwargs):
+    # Cached users come with their position.
+    if not created:
+        auth.invalidate_users(
+            instance.employees.values_list("pk", flat=True), using=using
+        )
+
+
+@receiver(m2m_changed, sender=Task.assignees.through)
+def touch_assignments(sender, action, using, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        conditional.touch(sender, using=using)
+
+
+@receiver(tasks_bulk_changed, sender=Task)
+def touch_bulk_tasks(sender, **kwargs):
+    # Bulk actions may change assignments too.
+    conditional.touch(Task, Task.assignees.through)
+
+
+@receiver(connection_created)
+def record_query_budgets(sender, connection, **kwargs):
+    query_budget.install(connection)
+
+
+@receiver(post_save, sender=Task)
+def publish_task_saved(
+    sender, instance, created, update_fields=None, **kwargs
+):
+    if created:
+        kind = TaskEvent.CREATED
+    elif update_fields is not None and set(update_fields) == {
+        "is_completed",
+        "updated_at",
+    }:
+        kind = (
+            TaskEvent.COMPLETED
+            if instance.is_completed
+            else TaskEvent.REOPENED
+        )
+    else:
+        kind = TaskEvent.UPDATED
+
+    events.publish(kind, instance)
+
+
+@receiver(post_delete, sender=Task)
+def publish_task_deleted(sender, instance, **kwargs):
+    events.publish(TaskEvent.DELETED, instance)
+
+
+@receiver(tasks_bulk_changed, sender=Task)
+def publish_bulk_task_events(
+    sender,
+    task_ids,
+    event=TaskEvent.UPDATED,
+    employees=None,
+    tasks=None,
+    **kwargs,
+):
+    if event == TaskEvent.DELETED:
+        events.publish_many(event, tasks)
+
+        return
+
+    tasks = Task.objects.filter(id__in=task_ids).select_related("task_type")
+
+    if employees is None:
+        events.publish_many(event, tasks)
+    else:
+        events.publish_many(event, tasks, employees=employees)
+
+
+@receiver(m2m_changed, sender=Task.assignees.through)
+def publish_assignments(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove") or not pk_set:
+        return
+
+    kind = TaskEvent.ASSIGNED if action == "post_add" else TaskEvent.UNASSIGNED
+
+    if reverse:
+        events.publish_many(
+            kind,
+            Task.objects.filter(id__in=pk_set).select_related("task_type"),
+            employees=[instance.pk],
+        )
+    else:
+        events.publish(kind, instance, employees=sorted(pk_set))
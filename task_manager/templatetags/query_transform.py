@@ -1,12 +1,14 @@
-from django import template
+from django import forms, template
 from django.http import HttpRequest
+from django.utils.html import format_html_join
 
 register = template.Library()
 
+# Parameters of the current page, dropped when the results change.
+PAGINATION_PARAMS = ("cursor", "page")
 
-@register.simple_tag
-def query_transform(request: HttpRequest, **kwargs):
-    updated = request.GET.copy()
+
+def _transform(updated, **kwargs):
     for key, value in kwargs.items():
         if value is not None:
             updated[key] = value
@@ -14,3 +16,58 @@ def query_transform(request: HttpRequest, **kwargs):
             updated.pop(key, 0)
 
     return updated.urlencode()
+
+
+@register.simple_tag
+def query_transform(request: HttpRequest, **kwargs):
+    return _transform(request.GET.copy(), **kwargs)
+
+
+@register.simple_tag
+def query_toggle(request: HttpRequest, key, value, multiple=False):
+    """
+    The query string with `value` of `key` selected if it was not, or
+    unselected if it was, back to the first page. A `multiple` key keeps
+    its other values.
+    """
+    value = str(value)
+    values = request.GET.getlist(key)
+
+    if value in values:
+        values.remove(value)
+    elif multiple:
+        values.append(value)
+    else:
+        values = [value]
+
+    updated = request.GET.copy()
+    updated.setlist(key, values)
+
+    return _transform(updated, **dict.fromkeys(PAGINATION_PARAMS))
+
+
+@register.simple_tag
+def hidden_query_inputs(request: HttpRequest, *exclude):
+    """
+    Hidden inputs keeping the current query parameters through a GET
+    form, but those in `exclude` (names, or forms for their fields) and
+    the pagination.
+    """
+    excluded = set(PAGINATION_PARAMS)
+
+    for item in exclude:
+        if isinstance(item, forms.BaseForm):
+            excluded.update(item.fields)
+        else:
+            excluded.add(item)
+
+    return format_html_join(
+        "",
+        '<input type="hidden" name="{}" value="{}">',
+        (
+            (key, value)
+            for key, values in request.GET.lists()
+            if key not in excluded
+            for value in values
+        ),
+    )
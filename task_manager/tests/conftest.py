@@ -1,8 +1,33 @@
 import pytest
+from django.core.cache import cache
 
+from .. import activity
 from ..models import Employee, Position, Task, TaskType
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """
+    Cached values outlive the per-test database rollback, so every test
+    has to start with an empty cache.
+    """
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def discard_activity():
+    """Unflushed activity entries would outlive the test database too."""
+    yield
+    activity.buffer.take()
+
+
+@pytest.fixture(autouse=True)
+def enforce_query_budgets(settings):
+    settings.QUERY_BUDGET_RAISE = True
+
+
 @pytest.fixture
 def task_type_data():
     data = [
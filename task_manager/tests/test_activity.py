@@ -0,0 +1,304 @@
+import threading
+
+import pytest
+from django.db import DatabaseError, transaction
+from django.urls import reverse
+
+from .. import activity
+from ..activity import ActivityBuffer
+from ..models import ActivityLog, Employee, Task
+
+
+@pytest.fixture
+def on_commit(django_capture_on_commit_callbacks):
+    """Run the `on_commit()` callbacks that buffer the entries."""
+
+    def capture():
+        return django_capture_on_commit_callbacks(execute=True)
+
+    return capture
+
+
+def history(task_id):
+    activity.flush()
+
+    return [
+        (entry.action, entry.data)
+        for entry in ActivityLog.objects.filter(task_id=task_id).order_by("id")
+    ]
+
+
+class TestActivityBuffer:
+    @pytest.mark.django_db
+    def test_records_without_insert(
+        self, task_data, on_commit, django_assert_num_queries
+    ):
+        tasks = list(Task.objects.all())
+
+        with django_assert_num_queries(0), on_commit():
+            activity.record(ActivityLog.COMPLETED, tasks)
+            activity.record(ActivityLog.REOPENED, tasks)
+
+        assert len(activity.buffer) == 6
+
+        with django_assert_num_queries(1):
+            assert activity.flush() == 6
+
+        assert ActivityLog.objects.count() == 6
+
+    @pytest.mark.django_db
+    def test_waits_for_commit(self, task_data, on_commit):
+        with on_commit() as callbacks:
+            activity.record(ActivityLog.COMPLETED, Task.objects.all())
+
+            assert len(activity.buffer) == 0
+
+        assert len(callbacks) == 1
+        assert len(activity.buffer) == 3
+
+    @pytest.mark.django_db
+    def test_flushes_when_full(self, task_data, django_assert_num_queries):
+        buffer = ActivityBuffer(size=4)
+        task = Task.objects.get(pk=1)
+
+        with django_assert_num_queries(0):
+            buffer.add([ActivityLog(ts=task.updated_at, task_id=1)] * 3)
+
+        with django_assert_num_queries(1):
+            buffer.add([ActivityLog(ts=task.updated_at, task_id=1)])
+
+        assert len(buffer) == 0
+        assert ActivityLog.objects.count() == 4
+
+    @pytest.mark.django_db
+    def test_flushes_old_entries(self, task_data):
+        buffer = ActivityBuffer(interval=0)
+        task = Task.objects.get(pk=1)
+
+        buffer.add([ActivityLog(ts=task.updated_at, task_id=1)])
+
+        assert len(buffer) == 0
+        assert ActivityLog.objects.count() == 1
+
+    def test_timer_flushes_idle_buffer(self):
+        flushed = threading.Event()
+        buffer = ActivityBuffer(interval=0.01)
+        buffer.flush = flushed.set
+
+        buffer.add([ActivityLog(task_id=1)])
+
+        assert flushed.wait(timeout=5)
+
+
+class TestActivityViews:
+    @pytest.mark.django_db
+    def test_toggle_completed(self, task_data, employee_client, on_commit):
+        with on_commit():
+            employee_client.get(
+                reverse("task_manager:toggle-task-completed", args=[1])
+            )
+
+        assert history(1) == [(ActivityLog.COMPLETED, {})]
+
+        entry = ActivityLog.objects.get()
+        assert entry.actor.username == "test.client"
+        assert entry.task_name == "Test bug 1"
+
+    @pytest.mark.django_db
+    def test_toggle_assign(self, task_data, employee_client, on_commit):
+        with on_commit():
+            employee_client.get(
+                reverse("task_manager:toggle-task-assign", args=[1])
+            )
+
+        assert history(1) == [
+            (ActivityLog.ASSIGNED, {"employee": "test.client"})
+        ]
+
+    @pytest.mark.django_db
+    def test_update(self, task_data, employee_client, on_commit):
+        with on_commit():
+            employee_client.post(
+                reverse("task_manager:task-update", args=[3]),
+                data={
+                    "name": "Renamed",
+                    "description": "Test bug 2",
+                    "deadline": "2022-12-01",
+                    "is_completed": True,
+                    "priority": Task.LOW,
+                    "task_type": 1,
+                    "assignees": [1, 4],
+                },
+            )
+
+        assert history(3) == [
+            (ActivityLog.COMPLETED, {}),
+            (
+                ActivityLog.PRIORITY_CHANGED,
+                {"previous": "Urgent", "priority": "Low"},
+            ),
+            (ActivityLog.ASSIGNED, {"employee": "test.client"}),
+            (ActivityLog.UNASSIGNED, {"employee": "user_2"}),
+            (ActivityLog.UNASSIGNED, {"employee": "user_3"}),
+            (ActivityLog.UPDATED, {"fields": ["name"]}),
+        ]
+
+    @pytest.mark.django_db
+    def test_delete(self, task_data, employee_client, on_commit):
+        with on_commit():
+            employee_client.post(reverse("task_manager:task-delete", args=[1]))
+
+        assert history(1) == [(ActivityLog.DELETED, {})]
+        assert ActivityLog.objects.get().task_name == "Test bug 1"
+
+    @pytest.mark.django_db
+    def test_failed_delete_not_logged(
+        self, task_data, employee_client, on_commit, monkeypatch
+    ):
+        def delete(self, *args, **kwargs):
+            raise DatabaseError("Deadlock")
+
+        monkeypatch.setattr(Task, "delete", delete)
+
+        with on_commit() as callbacks:
+            with pytest.raises(DatabaseError):
+                employee_client.post(
+                    reverse("task_manager:task-delete", args=[1])
+                )
+
+        assert callbacks == []
+
+    @pytest.mark.django_db
+    def test_bulk_set_priority(self, task_data, employee_client, on_commit):
+        Task.objects.filter(pk=3).update(priority=Task.URGENT)
+
+        with on_commit():
+            employee_client.post(
+                reverse("task_manager:task-bulk"),
+                {
+                    "tasks": [1, 2, 3],
+                    "action": "set_priority",
+                    "priority": Task.URGENT,
+                },
+            )
+
+        assert history(3) == []
+        assert history(2) == [
+            (
+                ActivityLog.PRIORITY_CHANGED,
+                {"previous": "High", "priority": "Urgent"},
+            )
+        ]
+        assert history(1) == [
+            (
+                ActivityLog.PRIORITY_CHANGED,
+                {"previous": "Trivial", "priority": "Urgent"},
+            )
+        ]
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize(
+        "action, logged",
+        [
+            (
+                "complete",
+                {(1, ActivityLog.COMPLETED), (3, ActivityLog.COMPLETED)},
+            ),
+            ("incomplete", {(2, ActivityLog.REOPENED)}),
+            ("assign", {(2, ActivityLog.ASSIGNED)}),
+            (
+                "unassign",
+                {(1, ActivityLog.UNASSIGNED), (3, ActivityLog.UNASSIGNED)},
+            ),
+        ],
+    )
+    def test_bulk_action_logs_changed_tasks_only(
+        self, task_data, employee_client, on_commit, action, logged
+    ):
+        with on_commit():
+            employee_client.post(
+                reverse("task_manager:task-bulk"),
+                {"tasks": [1, 2, 3], "action": action, "employee": 1},
+            )
+
+        activity.flush()
+
+        assert (
+            set(ActivityLog.objects.values_list("task_id", "action")) == logged
+        )
+
+    @pytest.mark.django_db
+    def test_rolled_back_changes_not_logged(self, task_data, on_commit):
+        with on_commit():
+            with pytest.raises(ZeroDivisionError), transaction.atomic():
+                activity.record(ActivityLog.COMPLETED, Task.objects.all())
+                1 / 0
+
+        assert len(activity.buffer) == 0
+
+
+class TestHistoryViews:
+    @pytest.fixture
+    def activity_data(self, task_data, employee_client):
+        actor = Employee.objects.get(username="test.client")
+        task = Task.objects.get(pk=1)
+
+        activity.buffer.add(
+            ActivityLog(
+                ts=task.updated_at,
+                actor=actor,
+                task_id=task.id,
+                task_name=task.name,
+                action=ActivityLog.UPDATED,
+                data={"fields": [f"field{number}"]},
+            )
+            for number in range(25)
+        )
+
+    @pytest.mark.django_db
+    def test_task_history_pages(
+        self, activity_data, employee_client, django_assert_max_num_queries
+    ):
+        url = reverse("task_manager:task-history", args=[1])
+
+        # User, buffered entries, page.
+        with django_assert_max_num_queries(3):
+            response = employee_client.get(url)
+
+        page = response.context["page_obj"]
+        assert len(page) == 20
+        assert page.object_list[0].data["fields"] == ["field24"]
+
+        response = employee_client.get(url, {"cursor": page.next_cursor})
+        page = response.context["page_obj"]
+
+        assert [entry.data["fields"][0] for entry in page] == [
+            f"field{number}" for number in range(4, -1, -1)
+        ]
+
+    @pytest.mark.django_db
+    def test_employee_history(self, activity_data, employee_client):
+        actor = Employee.objects.get(username="test.client")
+
+        response = employee_client.get(
+            reverse("task_manager:employee-history", args=[actor.pk])
+        )
+
+        assert response.context["employee"] == actor
+        assert len(response.context["activity_list"]) == 20
+        assert "Test bug 1" in response.content.decode()
+
+        response = employee_client.get(
+            reverse("task_manager:employee-history", args=[1])
+        )
+
+        assert not response.context["activity_list"]
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize("lookup", ["task_id", "actor_id"])
+    def test_history_uses_indexes(self, activity_data, lookup):
+        entries = ActivityLog.objects.filter(**{lookup: 1}).order_by(
+            "-ts", "-id"
+        )[:21]
+
+        assert "TEMP B-TREE" not in entries.explain()
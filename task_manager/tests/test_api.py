@@ -0,0 +1,99 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..models import Task
+
+
+class TestTaskApi:
+    @pytest.mark.django_db
+    def test_login_required(self, client):
+        response = client.get(reverse("task_manager:api-task-list"))
+
+        assert response.status_code == 401
+
+    @pytest.mark.django_db
+    def test_task_list(self, task_data, employee_client):
+        response = employee_client.get(reverse("task_manager:api-task-list"))
+        results = response.json()["results"]
+
+        assert [task["id"] for task in results] == [1, 2, 3]
+        assert results[2]["assignees"] == [1, 2, 3]
+        assert results[0]["task_type_name"] == "Bug"
+        assert results[0]["deadline"] == "2023-05-05"
+
+    @pytest.mark.django_db
+    def test_sparse_fieldsets(self, task_data, employee_client):
+        with CaptureQueriesContext(connection) as queries:
+            response = employee_client.get(
+                reverse("task_manager:api-task-list"), {"fields": "id,name"}
+            )
+
+        assert response.json()["results"][0] == {"id": 1, "name": "Test bug 1"}
+        assert "description" not in queries[-1]["sql"]
+        assert "task_manager_tasktype" not in queries[-1]["sql"]
+
+    @pytest.mark.django_db
+    def test_unknown_field(self, employee_client):
+        response = employee_client.get(
+            reverse("task_manager:api-task-list"), {"fields": "id,secret"}
+        )
+
+        assert response.status_code == 400
+
+    @pytest.mark.django_db
+    def test_cursor_pagination(self, task_data, employee_client):
+        url = reverse("task_manager:api-task-list")
+
+        first = employee_client.get(url, {"limit": 2, "fields": "id"}).json()
+        second = employee_client.get(
+            url, {"limit": 2, "fields": "id", "cursor": first["next"]}
+        ).json()
+
+        assert first["results"] == [{"id": 1}, {"id": 2}]
+        assert second["results"] == [{"id": 3}]
+        assert second["next"] is None
+
+    @pytest.mark.django_db
+    def test_etag(self, task_data, employee_client):
+        url = reverse("task_manager:api-task-detail", args=[1])
+
+        etag = employee_client.get(url)["ETag"]
+        response = employee_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
+
+        Task.objects.get(pk=1).assignees.add(2)
+        response = employee_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 200
+        assert response.json()["assignees"] == [1, 2]
+
+    @pytest.mark.django_db
+    def test_missing_object(self, employee_client):
+        response = employee_client.get(
+            reverse("task_manager:api-task-detail", args=[42])
+        )
+
+        assert response.status_code == 404
+
+
+class TestOtherResources:
+    @pytest.mark.django_db
+    @pytest.mark.parametrize(
+        "url_name", ["api-employee-list", "api-position-list"]
+    )
+    def test_list(self, employee_data, employee_client, url_name):
+        response = employee_client.get(reverse(f"task_manager:{url_name}"))
+
+        assert response.status_code == 200
+        assert len(response.json()["results"]) >= 3
+
+    @pytest.mark.django_db
+    def test_task_type_detail(self, task_type_data, employee_client):
+        response = employee_client.get(
+            reverse("task_manager:api-task-type-detail", args=[2])
+        )
+
+        assert response.json() == {"id": 2, "name": "Feature request"}
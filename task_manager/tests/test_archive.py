@@ -0,0 +1,173 @@
+from datetime import date, timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from ..archive import archive_tasks
+from ..models import ArchivedTask, Task, TaskEvent
+
+
+def age(task_ids, days=100):
+    Task.objects.filter(id__in=task_ids).update(
+        updated_at=timezone.now() - timedelta(days=days)
+    )
+
+
+@pytest.fixture
+def archived_data(task_data):
+    """Archive "Test feature 1", the completed task."""
+    age([2])
+    list(archive_tasks())
+
+
+class TestArchiveTasks:
+    @pytest.mark.django_db
+    def test_moves_old_completed_tasks(self, task_data):
+        age([1, 2, 3])
+
+        out = StringIO()
+        call_command("archive_tasks", "--days", "90", stdout=out)
+
+        assert "Archived 1 tasks." in out.getvalue()
+        assert list(Task.objects.values_list("id", flat=True)) == [3, 1]
+
+        archived = ArchivedTask.objects.get()
+        assert archived.id == 2
+        assert archived.name == "Test feature 1"
+        assert archived.priority == "High"
+        assert archived.is_completed is True
+        assert sorted(archived.assignees.values_list("id", flat=True)) == [
+            2,
+            3,
+        ]
+
+    @pytest.mark.django_db
+    def test_keeps_recent_tasks(self, task_data):
+        age([2], days=10)
+
+        call_command("archive_tasks", "--days", "90", stdout=StringIO())
+
+        assert not ArchivedTask.objects.exists()
+        assert Task.objects.count() == 3
+
+    @pytest.mark.django_db
+    def test_batches(self, task_data):
+        Task.objects.update(is_completed=True)
+        age([1, 2, 3])
+
+        assert list(archive_tasks(batch_size=2)) == [2, 1]
+        assert not Task.objects.exists()
+        assert ArchivedTask.objects.count() == 3
+
+    @pytest.mark.django_db
+    def test_publishes_deletions(self, task_data):
+        age([2])
+        list(archive_tasks())
+
+        assert TaskEvent.objects.latest("id").kind == TaskEvent.DELETED
+        assert TaskEvent.objects.latest("id").task_id == 2
+
+
+class TestArchivedTaskPages:
+    @pytest.mark.django_db
+    def test_list_excludes_archive(self, archived_data, employee_client):
+        response = employee_client.get(reverse("task_manager:task-list"))
+
+        assert [task.id for task in response.context["task_list"]] == [3, 1]
+
+    @pytest.mark.django_db
+    def test_list_includes_archive(self, archived_data, employee_client):
+        response = employee_client.get(
+            reverse("task_manager:task-list"), {"archived": "on"}
+        )
+
+        assert [task.id for task in response.context["task_list"]] == [
+            3,
+            1,
+            2,
+        ]
+        assert "?archived=on" in response.content.decode()
+
+    @pytest.mark.django_db
+    def test_list_pages_across_tables(self, task_data, employee_client):
+        today = date.today()
+
+        for number in range(12):
+            task = Task.objects.create(
+                name=f"Done {number}",
+                deadline=today + timedelta(days=number),
+                is_completed=True,
+                priority="LO",
+                task_type_id=1,
+            )
+            # Every other completed task is archived.
+            if number % 2:
+                age([task.id])
+
+        list(archive_tasks())
+        url = reverse("task_manager:task-list")
+        names, params = [], {"archived": "on", "completed": "true"}
+
+        while True:
+            response = employee_client.get(url, params)
+            page = response.context["page_obj"]
+            names += [task.name for task in page]
+
+            if not page.has_next():
+                break
+
+            params["cursor"] = page.next_cursor
+
+        assert names == [
+            "Test feature 1",
+            *(f"Done {number}" for number in range(12)),
+        ]
+
+    @pytest.mark.django_db
+    def test_search_includes_archive(self, archived_data, employee_client):
+        response = employee_client.get(
+            reverse("task_manager:task-list"),
+            {"name": "feature", "archived": "on"},
+        )
+
+        assert [task.id for task in response.context["task_list"]] == [2]
+
+    @pytest.mark.django_db
+    def test_facets_count_archive(self, archived_data, employee_client):
+        response = employee_client.get(
+            reverse("task_manager:task-list"), {"archived": "on"}
+        )
+        status = next(
+            facet
+            for facet in response.context["facets"]
+            if facet["param"] == "completed"
+        )
+
+        assert [
+            (choice["value"], choice["count"]) for choice in status["choices"]
+        ] == [("false", 2), ("true", 1)]
+
+    @pytest.mark.django_db
+    def test_detail(self, archived_data, employee_client):
+        url = reverse("task_manager:task-detail", args=[2])
+
+        assert employee_client.get(url).status_code == 404
+
+        response = employee_client.get(url, {"archived": "on"})
+
+        assert response.context["task"].name == "Test feature 1"
+        assert len(response.context["assignees"]) == 2
+        assert "Archived on" in response.content.decode()
+
+    @pytest.mark.django_db
+    def test_employee_detail(self, archived_data, employee_client):
+        url = reverse("task_manager:employee-detail", args=[2])
+
+        response = employee_client.get(url)
+        assert [task.id for task in response.context["task_list"]] == [3]
+
+        response = employee_client.get(url, {"archived": "on"})
+        assert [task.id for task in response.context["task_list"]] == [3, 2]
@@ -0,0 +1,165 @@
+from datetime import timedelta
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from coordinate import settings_asgi
+
+from ..archive import archive_tasks
+from ..models import Employee, Position, Task
+from ..query_budget import QueryBudgetExceeded
+
+
+@pytest.fixture
+def asgi_profile(settings):
+    settings.ROOT_URLCONF = settings_asgi.ROOT_URLCONF
+    settings.MIDDLEWARE = settings_asgi.MIDDLEWARE
+
+
+@pytest.fixture
+def async_employee_client(async_client, asgi_profile):
+    employee = Employee.objects.create_user(
+        username="test.client",
+        password="zLjyFH7qd1icr33e",
+        position=Position.objects.create(name="Test subject"),
+    )
+    async_client.force_login(employee)
+
+    return async_client
+
+
+def get(client, url, **params):
+    async def request():
+        return await client.get(url, params)
+
+    return async_to_sync(request)()
+
+
+def test_asgi_profile_middleware_is_async_capable():
+    for path in settings_asgi.MIDDLEWARE:
+        assert import_string(path).async_capable, path
+
+
+class TestAsyncViews:
+    @pytest.mark.django_db
+    def test_index(self, task_data, async_employee_client):
+        response = get(async_employee_client, reverse("task_manager:index"))
+
+        assert response.status_code == 200
+        assert response.context["number_of_tasks"] == 2
+        assert response.context["urgent_tasks"] == 0
+        assert response.context["number_of_employees"] == 4
+
+    @pytest.mark.django_db
+    def test_index_requires_login(self, async_client, asgi_profile):
+        response = get(async_client, reverse("task_manager:index"))
+
+        assert response.status_code == 302
+        assert response.url.startswith(reverse("login"))
+
+    @pytest.mark.django_db
+    def test_list_views(self, task_data, async_employee_client):
+        for name in (
+            "task-type-list",
+            "position-list",
+            "task-list",
+            "employee-list",
+        ):
+            response = get(
+                async_employee_client, reverse(f"task_manager:{name}")
+            )
+
+            assert response.status_code == 200, name
+            assert response["ETag"], name
+
+    @pytest.mark.django_db
+    def test_task_list_cursor_pages(self, task_data, async_employee_client):
+        url = reverse("task_manager:task-list")
+        Task.objects.bulk_create(
+            Task(
+                name=f"Task {index}",
+                deadline="2030-01-01",
+                priority=Task.LOW,
+                task_type_id=1,
+            )
+            for index in range(15)
+        )
+
+        first = get(async_employee_client, url)
+        second = get(
+            async_employee_client,
+            url,
+            cursor=first.context["page_obj"].next_cursor,
+        )
+
+        assert len(first.context["task_list"]) == 10
+        assert len(second.context["task_list"]) == 8
+        assert not {task.id for task in first.context["task_list"]} & {
+            task.id for task in second.context["task_list"]
+        }
+
+    @pytest.mark.django_db
+    def test_task_list_search(self, task_data, async_employee_client):
+        response = get(
+            async_employee_client,
+            reverse("task_manager:task-list"),
+            name="feature",
+        )
+
+        assert [task.name for task in response.context["task_list"]] == [
+            "Test feature 1"
+        ]
+
+    @pytest.mark.django_db
+    def test_detail_views(self, task_data, async_employee_client):
+        response = get(
+            async_employee_client,
+            reverse("task_manager:task-detail", args=[3]),
+        )
+
+        assert response.context["task"].name == "Test bug 2"
+        assert len(response.context["assignees"]) == 3
+
+        response = get(
+            async_employee_client,
+            reverse("task_manager:employee-detail", args=[1]),
+        )
+
+        assert response.context["employee"].username == "user_one"
+        assert len(response.context["task_list"]) == 2
+
+    @pytest.mark.django_db
+    def test_archived_task_detail(self, task_data, async_employee_client):
+        Task.objects.filter(pk=2).update(
+            updated_at=timezone.now() - timedelta(days=100)
+        )
+        list(archive_tasks())
+        url = reverse("task_manager:task-detail", args=[2])
+
+        assert get(async_employee_client, url).status_code == 404
+
+        response = get(async_employee_client, url, archived="on")
+
+        assert response.context["task"].name == "Test feature 1"
+        assert len(response.context["assignees"]) == 2
+
+    @pytest.mark.django_db
+    def test_query_budget_is_enforced(
+        self, task_data, async_employee_client, settings
+    ):
+        settings.QUERY_BUDGETS = {"task_manager:index": {"max_queries": 1}}
+
+        with pytest.raises(QueryBudgetExceeded):
+            get(async_employee_client, reverse("task_manager:index"))
+
+    @pytest.mark.django_db
+    def test_missing_object(self, async_employee_client):
+        response = get(
+            async_employee_client,
+            reverse("task_manager:task-detail", args=[42]),
+        )
+
+        assert response.status_code == 404
@@ -0,0 +1,126 @@
+import pytest
+from django.contrib.auth import authenticate
+from django.core.cache import cache
+from django.urls import reverse
+
+from ..auth import CachedModelBackend, _user_key
+from ..models import Employee, Position
+
+
+@pytest.fixture
+def employee(position_data):
+    return Employee.objects.create_user(
+        username="cached",
+        password="zLjyFH7qd1icr33e",
+        position_id=1,
+    )
+
+
+class TestCachedModelBackend:
+    @pytest.mark.django_db
+    def test_user_with_position_cached(
+        self, employee, django_assert_num_queries
+    ):
+        backend = CachedModelBackend()
+
+        with django_assert_num_queries(1):
+            assert backend.get_user(employee.pk).position.name == "Intern"
+
+        with django_assert_num_queries(0):
+            assert backend.get_user(employee.pk).position.name == "Intern"
+
+    @pytest.mark.django_db
+    def test_invalidated_on_save(self, employee):
+        backend = CachedModelBackend()
+        backend.get_user(employee.pk)
+
+        employee.first_name = "Renamed"
+        employee.save()
+
+        assert cache.get(_user_key(employee.pk)) is None
+        assert backend.get_user(employee.pk).first_name == "Renamed"
+
+    @pytest.mark.django_db
+    def test_invalidated_on_delete(self, employee):
+        backend = CachedModelBackend()
+        backend.get_user(employee.pk)
+
+        employee.delete()
+
+        assert backend.get_user(employee.pk) is None
+
+    @pytest.mark.django_db
+    def test_invalidated_on_position_save(self, employee):
+        backend = CachedModelBackend()
+        backend.get_user(employee.pk)
+
+        Position.objects.filter(pk=1).get().save()
+
+        assert cache.get(_user_key(employee.pk)) is None
+
+    @pytest.mark.django_db
+    def test_inactive_user(self, employee):
+        backend = CachedModelBackend()
+        backend.get_user(employee.pk)
+
+        employee.is_active = False
+        employee.save()
+
+        assert backend.get_user(employee.pk) is None
+
+
+class TestCachedAuthentication:
+    @pytest.mark.django_db
+    def test_warm_requests_run_no_auth_query(
+        self, employee_client, django_assert_num_queries
+    ):
+        url = reverse("task_manager:index")
+        employee_client.get(url)
+
+        with django_assert_num_queries(0):
+            response = employee_client.get(url)
+
+        assert response.context["user"].username == "test.client"
+
+    @pytest.mark.django_db
+    def test_password_change_ends_other_sessions(self, employee_client):
+        url = reverse("task_manager:index")
+        employee_client.get(url)
+
+        employee = Employee.objects.get(username="test.client")
+        employee.set_password("hLc8cbRBeRhmVSy3")
+        employee.save()
+
+        response = employee_client.get(url)
+
+        assert response.status_code == 302
+        assert response.url.startswith(reverse("login"))
+
+    @pytest.mark.django_db
+    def test_sessions_of_model_backend_stay_logged_in(self, employee, client):
+        client.force_login(
+            employee, backend="django.contrib.auth.backends.ModelBackend"
+        )
+
+        response = client.get(reverse("task_manager:index"))
+
+        assert response.status_code == 200
+        assert response.context["user"] == employee
+
+    @pytest.mark.django_db
+    def test_wrong_password_checked_once(self, employee, monkeypatch):
+        checks = []
+        check_password = Employee.check_password
+
+        def counting_check_password(self, raw_password):
+            checks.append(raw_password)
+
+            return check_password(self, raw_password)
+
+        monkeypatch.setattr(
+            Employee, "check_password", counting_check_password
+        )
+
+        assert authenticate(username="cached", password="wrong") is None
+        assert checks == ["wrong"]
+        assert authenticate(username="cached", password="zLjyFH7qd1icr33e")
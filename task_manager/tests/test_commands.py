@@ -0,0 +1,252 @@
+import json
+from datetime import date, timedelta
+from io import StringIO
+
+import pytest
+from django.core import mail
+from django.core.mail.backends import locmem
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from ..counters import get_counters
+from ..digests import send_deadline_digests
+from ..models import Employee, Task, TaskType
+
+
+class TestRebuildCounters:
+    @pytest.mark.django_db
+    def test_rebuild_fixes_drift(self, task_data):
+        assert get_counters()["number_of_tasks"] == 2
+
+        # `update()` doesn't send signals, so the cached value drifts.
+        Task.objects.update(is_completed=False)
+        assert get_counters()["number_of_tasks"] == 2
+
+        out = StringIO()
+        call_command("rebuild_counters", stdout=out)
+
+        assert "number_of_tasks: 3" in out.getvalue()
+        assert get_counters()["number_of_tasks"] == 3
+
+
+class TestImportTasks:
+    CSV = (
+        "name,description,deadline,is_completed,priority,task_type,assignees\n"
+        "Import 1,First,2024-01-01,false,Urgent,Bug,user_one;user_2\n"
+        "Import 2,,2024-01-02,true,LO,Chore,\n"
+        "Import 3,Third,2024-01-03,0,me,Bug,nobody\n"
+    )
+
+    @pytest.mark.django_db
+    def test_import_csv(self, tmp_path, task_type_data, employee_data):
+        path = tmp_path / "tasks.csv"
+        path.write_text(self.CSV)
+        err = StringIO()
+
+        call_command(
+            "import_tasks",
+            str(path),
+            batch_size=2,
+            stdout=StringIO(),
+            stderr=err,
+        )
+
+        first = Task.objects.get(name="Import 1")
+        assert first.priority == Task.URGENT
+        assert first.task_type.name == "Bug"
+        assert sorted(first.assignees.values_list("username", flat=True)) == [
+            "user_2",
+            "user_one",
+        ]
+        assert Task.objects.get(name="Import 2").is_completed
+        assert TaskType.objects.filter(name="Chore").exists()
+        assert "nobody" in err.getvalue()
+
+    @pytest.mark.django_db
+    def test_import_jsonl_start_at(self, tmp_path, task_type_data):
+        path = tmp_path / "tasks.jsonl"
+        path.write_text(
+            "\n".join(
+                json.dumps(
+                    {
+                        "name": f"Import {number}",
+                        "deadline": "2024-01-01",
+                        "priority": "HI",
+                        "task_type": "Bug",
+                    }
+                )
+                for number in range(5)
+            )
+        )
+
+        call_command("import_tasks", str(path), start_at=3, stdout=StringIO())
+
+        assert sorted(Task.objects.values_list("name", flat=True)) == [
+            "Import 3",
+            "Import 4",
+        ]
+
+    @pytest.mark.django_db
+    def test_import_invalid_row(self, tmp_path, task_type_data):
+        path = tmp_path / "tasks.csv"
+        path.write_text(self.CSV.replace("2024-01-03", "tomorrow"))
+
+        with pytest.raises(CommandError, match="Row 3.*--start-at 2"):
+            call_command(
+                "import_tasks",
+                str(path),
+                batch_size=2,
+                stdout=StringIO(),
+                stderr=StringIO(),
+            )
+
+        assert Task.objects.count() == 2
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize(
+        "line, error",
+        [
+            ("{not json", "invalid JSON"),
+            ('["Import 2"]', "expected an object"),
+            ('{"name": "Import 2", "assignees": "user_2"}', "assignees"),
+        ],
+    )
+    def test_import_malformed_jsonl(
+        self, tmp_path, task_type_data, line, error
+    ):
+        valid = json.dumps(
+            {
+                "name": "Import 1",
+                "deadline": "2024-01-01",
+                "priority": "HI",
+                "task_type": "Bug",
+            }
+        )
+        path = tmp_path / "tasks.jsonl"
+        path.write_text(f"{valid}\n{valid}\n{line}\n")
+
+        with pytest.raises(
+            CommandError, match=f"Row 3: {error}.*--start-at 2"
+        ):
+            call_command(
+                "import_tasks", str(path), batch_size=2, stdout=StringIO()
+            )
+
+        assert Task.objects.count() == 2
+
+    @pytest.mark.django_db
+    def test_import_invalidates_counters(self, tmp_path, task_type_data):
+        assert get_counters()["number_of_tasks"] == 0
+
+        path = tmp_path / "tasks.csv"
+        path.write_text(self.CSV)
+        call_command(
+            "import_tasks", str(path), stdout=StringIO(), stderr=StringIO()
+        )
+
+        assert get_counters()["number_of_tasks"] == 2
+
+
+class TestExportData:
+    @pytest.mark.django_db
+    def test_export_round_trips_through_import(self, tmp_path, task_data):
+        path = tmp_path / "tasks.csv"
+        call_command("export_data", "tasks", output=str(path))
+        Task.objects.all().delete()
+
+        call_command("import_tasks", str(path), stdout=StringIO())
+
+        task = Task.objects.get(name="Test bug 2")
+        assert task.assignees.count() == 3
+        assert Task.objects.count() == 3
+
+    @pytest.mark.django_db
+    def test_export_employees_to_stdout(self, employee_data):
+        out = StringIO()
+
+        call_command("export_data", "employees", format="ndjson", stdout=out)
+
+        assert len(out.getvalue().splitlines()) == 3
+
+
+class RecordingBackend(locmem.EmailBackend):
+    """Counts the connections opened and the messages sent per call."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.opened = 0
+        self.batches = []
+
+    def open(self):
+        self.opened += 1
+
+        return super().open()
+
+    def send_messages(self, messages):
+        self.batches.append(len(messages))
+
+        return super().send_messages(messages)
+
+
+class TestSendDeadlineDigests:
+    @pytest.fixture
+    def digest_data(self, task_data):
+        today = date.today()
+
+        for pk, deadline in [
+            (1, today - timedelta(days=1)),
+            (2, today + timedelta(days=1)),
+            (3, today + timedelta(days=2)),
+        ]:
+            Task.objects.filter(pk=pk).update(deadline=deadline)
+
+        # Far ahead.
+        Task.objects.create(
+            name="Later",
+            deadline=today + timedelta(days=30),
+            priority=Task.LOW,
+            task_type_id=1,
+        ).assignees.set([1])
+
+        for employee in Employee.objects.filter(pk__in=[1, 2]):
+            employee.email = f"{employee.username}@example.com"
+            employee.save()
+
+    @pytest.mark.django_db
+    def test_one_digest_per_employee(self, digest_data):
+        out = StringIO()
+        call_command("send_deadline_digests", "--days", "3", stdout=out)
+
+        # "user_3" has no email, "Test feature 1" is completed.
+        assert "Sent 2 digests." in out.getvalue()
+        assert [message.to for message in mail.outbox] == [
+            ["user_one@example.com"],
+            ["user_2@example.com"],
+        ]
+
+        message = mail.outbox[0]
+        assert message.subject == "1 overdue task, 1 task due soon"
+        assert message.body.index("Overdue:") < message.body.index(
+            "Test bug 1"
+        )
+        assert message.body.index("Due soon:") < message.body.index(
+            "Test bug 2"
+        )
+        assert "Later" not in message.body
+        assert "http://127.0.0.1:8000/tasks/3/" in message.body
+
+        assert mail.outbox[1].subject == "1 task due soon"
+
+    @pytest.mark.django_db
+    def test_one_query_and_connection(
+        self, digest_data, django_assert_num_queries
+    ):
+        Employee.objects.filter(pk=3).update(email="user_3@example.com")
+        connection = RecordingBackend()
+
+        with django_assert_num_queries(1):
+            sent = send_deadline_digests(batch_size=2, connection=connection)
+
+        assert sent == 3
+        assert connection.opened == 1
+        assert connection.batches == [2, 1]
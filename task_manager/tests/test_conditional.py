@@ -0,0 +1,255 @@
+from datetime import date, timedelta
+
+import pytest
+from django.contrib.messages import constants, get_messages
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.urls import reverse
+
+from .. import views
+from ..conditional import check_shared_cache, last_changed, touch
+from ..models import Employee, Task, TaskType
+
+
+@pytest.fixture
+def on_commit(django_capture_on_commit_callbacks):
+    """Run the `on_commit()` callbacks that touch the markers."""
+
+    def capture():
+        return django_capture_on_commit_callbacks(execute=True)
+
+    return capture
+
+
+class TestMarkers:
+    def test_check_shared_cache(self, settings):
+        settings.DEBUG = False
+
+        assert [message.id for message in check_shared_cache()] == [
+            "task_manager.W001"
+        ]
+
+        settings.DEBUG = True
+
+        assert check_shared_cache() == []
+
+    @pytest.mark.django_db
+    def test_touch(self, on_commit):
+        before = last_changed([Task, TaskType])
+
+        with on_commit():
+            touch(Task)
+
+        assert last_changed([Task]) > before
+        assert last_changed([TaskType]) == before
+        assert last_changed([Task, TaskType]) > before
+
+    @pytest.mark.django_db
+    def test_waits_for_commit(self, on_commit):
+        before = last_changed([Task])
+
+        with on_commit() as callbacks:
+            touch(Task)
+
+            assert last_changed([Task]) == before
+
+        assert len(callbacks) == 1
+        assert last_changed([Task]) > before
+
+    @pytest.mark.django_db
+    def test_model_writes(self, task_data, on_commit):
+        task = Task.objects.get(pk=1)
+        before = last_changed([Task, Task.assignees.through])
+
+        with on_commit():
+            task.toggle_completed()
+
+        assert last_changed([Task]) > before
+
+        before = last_changed([Task.assignees.through])
+
+        with on_commit():
+            task.toggle_assignee(2)
+
+        assert last_changed([Task.assignees.through]) > before
+
+    @pytest.mark.django_db
+    def test_logins_do_not_touch(self, employee_data, client, on_commit):
+        before = last_changed([Employee])
+
+        with on_commit():
+            client.login(username="user_one", password="zLjyFH7qd1icr33e")
+
+        assert last_changed([Employee]) == before
+
+
+class TestConditionalResponses:
+    def revalidate(self, client, url, response):
+        return client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+
+    @pytest.mark.django_db
+    def test_validators(self, task_data, employee_client):
+        response = employee_client.get(reverse("task_manager:task-list"))
+
+        assert response.status_code == 200
+        assert response["ETag"]
+        assert response["Last-Modified"]
+        assert "no-cache" in response["Cache-Control"]
+        assert "private" in response["Cache-Control"]
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize(
+        "url",
+        [
+            reverse("task_manager:task-type-list"),
+            reverse("task_manager:position-list"),
+            reverse("task_manager:task-list"),
+            reverse("task_manager:employee-list"),
+            reverse("task_manager:task-detail", args=[1]),
+            reverse("task_manager:employee-detail", args=[1]),
+        ],
+    )
+    def test_not_modified_before_main_queries(
+        self, url, task_data, employee_client, django_assert_num_queries
+    ):
+        response = employee_client.get(url)
+
+        # The session and the user are cached too.
+        with django_assert_num_queries(0):
+            not_modified = self.revalidate(employee_client, url, response)
+
+        assert not_modified.status_code == 304
+        assert not_modified["ETag"] == response["ETag"]
+        assert not not_modified.content
+
+    @pytest.mark.django_db
+    def test_if_modified_since(self, task_data, employee_client):
+        url = reverse("task_manager:task-type-list")
+        response = employee_client.get(url)
+
+        not_modified = employee_client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+        )
+
+        assert not_modified.status_code == 304
+
+    @pytest.mark.django_db
+    def test_modified(self, task_data, employee_client, on_commit):
+        url = reverse("task_manager:task-list")
+        response = employee_client.get(url)
+
+        with on_commit():
+            TaskType.objects.filter(pk=1).get().save()
+
+        modified = self.revalidate(employee_client, url, response)
+
+        assert modified.status_code == 200
+        assert modified["ETag"] != response["ETag"]
+
+    @pytest.mark.django_db
+    def test_assignments(self, task_data, employee_client, on_commit):
+        url = reverse("task_manager:employee-detail", args=[1])
+        response = employee_client.get(url)
+
+        with on_commit():
+            Task.objects.get(pk=2).assignees.add(1)
+
+        assert self.revalidate(employee_client, url, response).status_code == (
+            200
+        )
+
+    @pytest.mark.django_db
+    def test_assignee_filter(self, task_data, employee_client, on_commit):
+        url = reverse("task_manager:task-list")
+        response = employee_client.get(url, {"assignee": 1})
+
+        with on_commit():
+            Task.objects.get(pk=2).toggle_assignee(1)
+
+        revalidated = employee_client.get(
+            url, {"assignee": 1}, HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+
+        assert revalidated.status_code == 200
+        assert 2 in [task.id for task in revalidated.context["task_list"]]
+
+    @pytest.mark.django_db
+    def test_unrelated_change(self, task_data, employee_client, on_commit):
+        url = reverse("task_manager:task-type-list")
+        response = employee_client.get(url)
+
+        with on_commit():
+            Task.objects.get(pk=1).toggle_completed()
+
+        assert self.revalidate(employee_client, url, response).status_code == (
+            304
+        )
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize("url_name", ["task-list", "employee-list"])
+    def test_modified_at_midnight(
+        self, url_name, task_data, employee_client, monkeypatch
+    ):
+        url = reverse(f"task_manager:{url_name}")
+        response = employee_client.get(url)
+
+        class Tomorrow(date):
+            @classmethod
+            def today(cls):
+                return date.today() + timedelta(days=1)
+
+        monkeypatch.setattr(views, "date", Tomorrow)
+
+        assert (
+            self.revalidate(employee_client, url, response).status_code == 200
+        )
+
+    @pytest.mark.django_db
+    def test_per_user(self, task_data, employee_client):
+        url = reverse("task_manager:task-detail", args=[1])
+        response = employee_client.get(url)
+
+        employee_client.force_login(Employee.objects.get(pk=1))
+
+        assert (
+            self.revalidate(employee_client, url, response).status_code == 200
+        )
+
+    @pytest.mark.django_db
+    def test_login_rotates_csrf_token(self, task_data, employee_client):
+        url = reverse("task_manager:task-list")
+        response = employee_client.get(url)
+        employee = response.wsgi_request.user
+
+        employee_client.logout()
+        employee_client.force_login(employee)
+        revalidated = self.revalidate(employee_client, url, response)
+
+        assert revalidated.status_code == 200
+        assert (
+            revalidated.context["csrf_token"] != response.context["csrf_token"]
+        )
+
+    @pytest.mark.django_db
+    def test_pending_messages(self, task_data, employee_client):
+        url = reverse("task_manager:task-list")
+        response = employee_client.get(url)
+
+        storage = CookieStorage(response.wsgi_request)
+        storage.add(constants.SUCCESS, "Done")
+        storage.update(response)
+        employee_client.cookies.update(response.cookies)
+
+        rendered = self.revalidate(employee_client, url, response)
+
+        assert rendered.status_code == 200
+        assert [
+            message.message for message in get_messages(rendered.wsgi_request)
+        ] == ["Done"]
+
+    @pytest.mark.django_db
+    def test_requires_login(self, task_data, client):
+        response = client.get(
+            reverse("task_manager:task-list"), HTTP_IF_NONE_MATCH="*"
+        )
+
+        assert response.status_code == 302
@@ -0,0 +1,242 @@
+import time
+
+import pytest
+from django.core.management import call_command
+from django.db import connections, router, transaction
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.urls import reverse
+
+from ..db_router import (
+    STICKY_COOKIE_NAME,
+    PrimaryReplicaRouter,
+    ReplicaPool,
+    ReplicaRoutingMiddleware,
+    pin_to_primary,
+    replica_reads,
+)
+from ..auth import CachedModelBackend
+from ..counters import get_counters
+from ..models import Employee, Task, TaskType
+
+
+class HealthyPool(ReplicaPool):
+    def __init__(self, aliases, unhealthy=()):
+        super().__init__(aliases, check_interval=30)
+        self.unhealthy = set(unhealthy)
+        self.checked = []
+
+    def check(self, alias):
+        self.checked.append(alias)
+
+        return alias not in self.unhealthy
+
+
+@pytest.fixture
+def replica_router(settings):
+    settings.DATABASE_REPLICAS = ["replica1", "replica2"]
+    replica_router = PrimaryReplicaRouter()
+    replica_router.pool = HealthyPool(settings.DATABASE_REPLICAS)
+
+    return replica_router
+
+
+@pytest.fixture
+def replica(db, tmp_path, settings, monkeypatch):
+    """A second SQLite file, routed to as the only replica."""
+    alias = "replica_test"
+    connections.settings[alias] = connections.configure_settings(
+        {
+            "default": connections.settings["default"],
+            alias: {
+                "ENGINE": "django.db.backends.sqlite3",
+                "NAME": tmp_path / "replica.sqlite3",
+            },
+        }
+    )[alias]
+    call_command("migrate", database=alias, verbosity=0)
+
+    settings.DATABASE_REPLICAS = [alias]
+    monkeypatch.setattr(router, "routers", [PrimaryReplicaRouter()])
+
+    yield alias
+
+    connections[alias].close()
+    del connections[alias]
+    del connections.settings[alias]
+
+
+class TestPrimaryReplicaRouter:
+    def test_reads_from_primary_outside_of_requests(self, replica_router):
+        assert replica_router.db_for_read(Task) is None
+
+    def test_round_robin(self, replica_router):
+        with replica_reads():
+            assert [replica_router.db_for_read(Task) for _ in range(4)] == [
+                "replica1",
+                "replica2",
+                "replica1",
+                "replica2",
+            ]
+
+    def test_skips_unhealthy_replicas(self, replica_router):
+        replica_router.pool.unhealthy = {"replica1"}
+
+        with replica_reads():
+            assert [replica_router.db_for_read(Task) for _ in range(3)] == [
+                "replica2",
+                "replica2",
+                "replica2",
+            ]
+
+        replica_router.pool.unhealthy = {"replica1", "replica2"}
+        replica_router.pool.checks.clear()
+
+        with replica_reads():
+            assert replica_router.db_for_read(Task) is None
+
+    def test_caches_health_checks(self, replica_router):
+        with replica_reads():
+            for _ in range(6):
+                replica_router.db_for_read(Task)
+
+        assert replica_router.pool.checked == ["replica1", "replica2"]
+
+    def test_sticks_to_primary_after_write(self, replica_router):
+        with replica_reads() as state:
+            assert replica_router.db_for_read(Task) == "replica1"
+            assert replica_router.db_for_write(Task) is None
+            assert replica_router.db_for_read(Task) is None
+
+        assert state.wrote
+
+    def test_session_writes_do_not_stick(self, replica_router):
+        from django.contrib.sessions.models import Session
+
+        with replica_reads() as state:
+            replica_router.db_for_write(Session)
+
+            assert replica_router.db_for_read(Session) is None
+            assert replica_router.db_for_read(Task) == "replica1"
+
+        assert not state.wrote
+
+    @pytest.mark.django_db(transaction=True)
+    def test_reads_from_primary_in_transactions(self, replica_router):
+        with replica_reads(), transaction.atomic():
+            assert replica_router.db_for_read(Task) is None
+
+
+@pytest.mark.django_db(transaction=True)
+class TestReplicaRouting:
+    # Outside of `TestCase` transactions, which pin reads to the primary.
+
+    def test_reads_own_writes(self, replica):
+        TaskType.objects.using(replica).create(name="Replicated")
+
+        with replica_reads() as state:
+            assert list(TaskType.objects.values_list("name", flat=True)) == [
+                "Replicated"
+            ]
+
+            TaskType.objects.create(name="Written")
+
+            assert list(TaskType.objects.values_list("name", flat=True)) == [
+                "Written"
+            ]
+
+        assert state.wrote
+        assert list(TaskType.objects.values_list("name", flat=True)) == [
+            "Written"
+        ]
+
+    def test_pin_to_primary(self, replica):
+        TaskType.objects.create(name="Primary")
+
+        with replica_reads() as state:
+            assert TaskType.objects.count() == 0
+
+            pin_to_primary()
+
+            assert TaskType.objects.count() == 1
+
+        assert not state.wrote
+
+    def test_counters_refill_from_primary(self, replica):
+        Task.objects.create(
+            name="Primary",
+            deadline="2030-01-01",
+            priority=Task.LOW,
+            task_type=TaskType.objects.create(name="Primary"),
+        )
+
+        with replica_reads():
+            assert get_counters()["number_of_tasks"] == 1
+
+    @pytest.mark.parametrize("lag, expected", [(10, ["Written"]), (0, [])])
+    def test_recently_changed_pages_read_from_primary(
+        self, replica, employee_client, settings, lag, expected
+    ):
+        # Cache the user, who is not on the replica.
+        CachedModelBackend().get_user(
+            Employee.objects.get(username="test.client").pk
+        )
+        TaskType.objects.create(name="Written")
+        settings.DATABASE_REPLICA_STICKY_SECONDS = lag
+
+        response = employee_client.get(reverse("task_manager:task-type-list"))
+
+        assert [
+            task_type.name for task_type in response.context["task_type_list"]
+        ] == expected
+
+    def test_unreachable_replica(self, replica, tmp_path):
+        connections[replica].close()
+        connections.settings[replica]["NAME"] = tmp_path / "missing/db"
+        TaskType.objects.create(name="Primary")
+
+        with replica_reads():
+            assert TaskType.objects.count() == 1
+
+
+class TestReplicaRoutingMiddleware:
+    def middleware(self, view):
+        return ReplicaRoutingMiddleware(view)
+
+    def test_sets_sticky_cookie_after_write(self, replica_router, settings):
+        settings.DATABASE_REPLICA_STICKY_SECONDS = 5
+
+        def view(request):
+            replica_router.db_for_write(Task)
+
+            return HttpResponse()
+
+        response = self.middleware(view)(RequestFactory().post("/"))
+        cookie = response.cookies[STICKY_COOKIE_NAME]
+
+        assert cookie["max-age"] == 5
+        assert float(cookie.value) == pytest.approx(time.time() + 5, abs=1)
+
+    def test_no_cookie_without_write(self, replica_router):
+        def view(request):
+            assert replica_router.db_for_read(Task) == "replica1"
+
+            return HttpResponse()
+
+        response = self.middleware(view)(RequestFactory().get("/"))
+
+        assert STICKY_COOKIE_NAME not in response.cookies
+
+    @pytest.mark.parametrize(
+        "offset, expected", [(10, None), (-1, "replica1")]
+    )
+    def test_sticky_cookie(self, replica_router, offset, expected):
+        request = RequestFactory().get("/")
+        request.COOKIES[STICKY_COOKIE_NAME] = str(time.time() + offset)
+
+        def view(request):
+            assert replica_router.db_for_read(Task) == expected
+
+            return HttpResponse()
+
+        self.middleware(view)(request)
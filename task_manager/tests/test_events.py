@@ -0,0 +1,204 @@
+import json
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from coordinate import settings_asgi
+
+from .. import events
+from ..models import Task, TaskEvent
+
+
+def parse(body: str) -> list[dict]:
+    """The events of an SSE body, as dicts of their fields."""
+    return [
+        dict(line.split(": ", 1) for line in block.splitlines())
+        for block in body.split("\n\n")
+        if block and not block.startswith(":")
+    ]
+
+
+def kinds(since: int = 0) -> list[tuple]:
+    return list(
+        TaskEvent.objects.filter(id__gt=since).values_list("kind", "task_id")
+    )
+
+
+class TestPublishing:
+    @pytest.mark.django_db
+    def test_task_changes(self, task_type_data):
+        task = Task.objects.create(
+            name="Live", deadline="2030-01-01", priority="LO", task_type_id=1
+        )
+        task.name = "Live task"
+        task.save()
+        task.toggle_completed()
+        task.toggle_completed()
+        task_id = task.id
+        task.delete()
+
+        assert kinds() == [
+            ("created", task_id),
+            ("updated", task_id),
+            ("completed", task_id),
+            ("reopened", task_id),
+            ("deleted", task_id),
+        ]
+        assert TaskEvent.objects.get(kind="updated").data["name"] == (
+            "Live task"
+        )
+
+    @pytest.mark.django_db
+    def test_assignments(self, task_data):
+        since = events.latest_event_id()
+        task = Task.objects.get(pk=2)
+
+        task.toggle_assignee(1)
+        task.assignees.remove(2)
+        get_user_model().objects.get(pk=3).tasks.remove(task)
+
+        assert [
+            (event.kind, event.data["employees"])
+            for event in TaskEvent.objects.filter(id__gt=since)
+        ] == [("assigned", [1]), ("unassigned", [2]), ("unassigned", [3])]
+
+    @pytest.mark.django_db
+    def test_batched(self, task_data, django_assert_num_queries):
+        since = events.latest_event_id()
+        tasks = list(Task.objects.all())
+
+        # Two DELETEs per task, then a single INSERT of the three events.
+        with django_assert_num_queries(7), events.batched():
+            for task in tasks:
+                task.delete()
+
+        assert len(kinds(since)) == 3
+
+
+class TestTaskEventsView:
+    @pytest.mark.django_db
+    def test_poll(self, task_data, employee_client):
+        url = reverse("task_manager:task-events")
+
+        response = employee_client.get(url, HTTP_LAST_EVENT_ID="0")
+
+        assert response["Content-Type"] == "text/event-stream"
+
+        body = parse(response.content.decode())
+
+        assert body[0] == {"retry": str(events.RETRY), "id": "0"}
+        assert [event["event"] for event in body[1:]] == [
+            "created",
+            "assigned",
+        ] * 3
+        assert json.loads(body[1]["data"])["name"] == "Test bug 1"
+
+    @pytest.mark.django_db
+    def test_poll_starts_from_now(self, task_data, employee_client):
+        response = employee_client.get(reverse("task_manager:task-events"))
+
+        assert parse(response.content.decode()) == [
+            {"retry": str(events.RETRY), "id": str(events.latest_event_id())}
+        ]
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize("header", [True, False])
+    def test_poll_out_of_range_id_starts_from_now(
+        self, task_data, employee_client, header
+    ):
+        value = str(2**64)
+        response = employee_client.get(
+            reverse("task_manager:task-events"),
+            {} if header else {"last_event_id": value},
+            **({"HTTP_LAST_EVENT_ID": value} if header else {}),
+        )
+
+        assert parse(response.content.decode()) == [
+            {"retry": str(events.RETRY), "id": str(events.latest_event_id())}
+        ]
+
+    @pytest.mark.django_db
+    def test_poll_does_not_wait(self, task_data, employee_client, monkeypatch):
+        def sleep(seconds):
+            raise AssertionError("A sync worker waited for events.")
+
+        monkeypatch.setattr("time.sleep", sleep)
+
+        response = employee_client.get(reverse("task_manager:task-events"))
+
+        assert response.status_code == 200
+
+    @pytest.mark.django_db
+    def test_full_batch_polls_again_at_once(
+        self, task_data, employee_client, monkeypatch
+    ):
+        monkeypatch.setattr(events, "BATCH_SIZE", 2)
+
+        response = employee_client.get(
+            reverse("task_manager:task-events"), HTTP_LAST_EVENT_ID="0"
+        )
+        body = parse(response.content.decode())
+
+        assert body[0]["retry"] == "0"
+        assert len(body[1:]) == 2
+
+    @pytest.mark.django_db
+    def test_long_poll_under_asgi(
+        self, task_data, async_client, employee_client, settings, monkeypatch
+    ):
+        monkeypatch.setattr(events, "LONG_POLL_DURATION", 0)
+        settings.ROOT_URLCONF = settings_asgi.ROOT_URLCONF
+        settings.MIDDLEWARE = settings_asgi.MIDDLEWARE
+        async_client.cookies = employee_client.cookies
+        last_event_id = events.latest_event_id()
+        Task.objects.filter(pk=1).first().toggle_completed()
+
+        async def request():
+            return await async_client.get(
+                reverse("task_manager:task-events"),
+                {"last_event_id": last_event_id},
+            )
+
+        body = parse(async_to_sync(request)().content.decode())
+
+        assert body[0]["retry"] == "0"
+        assert [event["event"] for event in body[1:]] == ["completed"]
+
+    @pytest.mark.django_db
+    def test_requires_login(self, client):
+        response = client.get(reverse("task_manager:task-events"))
+
+        assert response.status_code == 302
+
+
+class TestPruneTaskEvents:
+    @pytest.mark.django_db
+    def test_prune(self, task_data):
+        TaskEvent.objects.filter(task_id=1).update(
+            created_at=timezone.now() - timedelta(hours=2)
+        )
+        out = StringIO()
+
+        call_command("prune_task_events", stdout=out)
+
+        assert "Deleted 2 events." in out.getvalue()
+        assert not TaskEvent.objects.filter(task_id=1).exists()
+        assert TaskEvent.objects.exists()
+
+    @pytest.mark.django_db
+    def test_prune_on_publish(self, task_data, monkeypatch):
+        TaskEvent.objects.filter(task_id=1).update(
+            created_at=timezone.now() - timedelta(hours=2)
+        )
+        monkeypatch.setattr(events, "PRUNE_EVERY", 1)
+
+        Task.objects.get(pk=2).toggle_completed()
+
+        assert not TaskEvent.objects.filter(task_id=1).exists()
+        assert TaskEvent.objects.filter(task_id=2).count() == 3
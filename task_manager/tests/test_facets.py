@@ -0,0 +1,158 @@
+from datetime import date, timedelta
+
+import pytest
+from django.http import QueryDict
+from django.template import Context, Template
+from django.test import RequestFactory
+from django.urls import reverse
+
+from ..facets import compute_facets, get_task_facets
+from ..forms import TaskFilterForm
+from ..models import Task
+
+
+@pytest.fixture
+def facet_data(task_type_data, employee_data):
+    today = date.today()
+    tasks = [
+        ("Urgent bug", Task.URGENT, -1, False, 1, [1, 2]),
+        ("Low bug", Task.LOW, 3, False, 1, [1]),
+        ("Done bug", Task.URGENT, -10, True, 1, []),
+        ("High feature", Task.HIGH, 60, False, 2, [2]),
+    ]
+
+    for name, priority, days, is_completed, task_type, assignees in tasks:
+        Task.objects.create(
+            name=name,
+            priority=priority,
+            deadline=today + timedelta(days=days),
+            is_completed=is_completed,
+            task_type_id=task_type,
+        ).assignees.set(assignees)
+
+
+def bound_form(query=""):
+    form = TaskFilterForm(QueryDict(query))
+    form.is_valid()
+
+    return form
+
+
+def counts(facets):
+    return {
+        facet["param"]: {
+            choice["label"]: choice["count"] for choice in facet["choices"]
+        }
+        for facet in facets
+    }
+
+
+class TestFacets:
+    @pytest.mark.django_db
+    def test_counts_in_one_query(self, facet_data, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            facets = compute_facets(Task.objects.all(), bound_form())
+
+        assert counts(facets) == {
+            "type": {"Bug": 3, "Feature request": 1},
+            "priority": {"Urgent": 2, "High": 1, "Low": 1},
+            "completed": {"Open": 3, "Done": 1},
+            "assignee": {"user_one": 2, "user_2": 2},
+            "deadline": {
+                "Overdue": 2,
+                "Within a week": 1,
+                "Later": 1,
+            },
+        }
+
+    @pytest.mark.django_db
+    def test_facets_ignore_their_own_filter(self, facet_data):
+        facets = compute_facets(
+            Task.objects.all(),
+            bound_form("type=1&priority=UR&priority=LO&completed=false"),
+        )
+
+        assert counts(facets) == {
+            "type": {"Bug": 2},
+            "priority": {"Urgent": 1, "Low": 1},
+            "completed": {"Open": 2, "Done": 1},
+            "assignee": {"user_one": 2, "user_2": 1},
+            "deadline": {"Overdue": 1, "Within a week": 1},
+        }
+        assert [
+            (choice["value"], choice["selected"])
+            for choice in facets[1]["choices"]
+        ] == [("UR", True), ("LO", True)]
+
+    @pytest.mark.django_db
+    def test_assignee_and_deadline_filters(self, facet_data):
+        facets = compute_facets(
+            Task.objects.all(), bound_form("assignee=2&deadline=overdue")
+        )
+
+        assert counts(facets)["type"] == {"Bug": 1}
+        assert counts(facets)["assignee"] == {"user_one": 1, "user_2": 1}
+        assert counts(facets)["deadline"] == {"Overdue": 1, "Later": 1}
+
+    @pytest.mark.django_db
+    def test_cached_until_a_change(
+        self,
+        facet_data,
+        django_assert_num_queries,
+        django_capture_on_commit_callbacks,
+    ):
+        form = bound_form()
+        get_task_facets(Task.objects.all(), form)
+
+        with django_assert_num_queries(0):
+            get_task_facets(Task.objects.all(), form)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Task.objects.get(name="Low bug").toggle_completed()
+
+        facets = get_task_facets(Task.objects.all(), form)
+
+        assert counts(facets)["completed"] == {"Open": 2, "Done": 2}
+
+    @pytest.mark.django_db
+    def test_task_list_sidebar(self, facet_data, employee_client):
+        response = employee_client.get(
+            reverse("task_manager:task-list"), {"name": "bug", "type": "1"}
+        )
+        content = response.content.decode()
+
+        assert "Bug (3)" in content
+        assert "Feature request" not in content
+        assert "?name=bug&amp;type=1&amp;priority=UR" in content
+        # Selecting the type again unselects it.
+        assert 'href="?name=bug"' in content
+
+
+class TestQueryTags:
+    def render(self, template, query):
+        return Template("{% load query_transform %}" + template).render(
+            Context({"request": RequestFactory().get("/?" + query)})
+        )
+
+    def test_query_toggle(self):
+        template = '{% query_toggle request "priority" "HI" multiple=True %}'
+
+        assert (
+            self.render(template, "priority=UR&cursor=x")
+            == "priority=UR&amp;priority=HI"
+        )
+        assert self.render(template, "priority=UR&priority=HI") == (
+            "priority=UR"
+        )
+        assert self.render(
+            '{% query_toggle request "type" 2 %}', "type=1"
+        ) == ("type=2")
+
+    def test_hidden_query_inputs(self):
+        assert self.render(
+            '{% hidden_query_inputs request "sort" %}',
+            "sort=priority&priority=UR&priority=HI&page=2",
+        ) == (
+            '<input type="hidden" name="priority" value="UR">'
+            '<input type="hidden" name="priority" value="HI">'
+        )
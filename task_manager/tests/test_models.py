@@ -65,3 +65,32 @@ def test_employee_get_absolute_url(employee_id):
     assert employee.get_absolute_url() == reverse(
         "task_manager:employee-detail", kwargs={"pk": employee_id}
     )
+
+
+@pytest.mark.django_db
+def test_task_priority_rank(task_type_data):
+    task = Task.objects.create(
+        name="Task",
+        deadline="2030-01-01",
+        priority=Task.HIGH,
+        task_type_id=1,
+    )
+
+    assert task.priority_rank == 1
+
+    task.priority = Task.TRIVIAL
+    task.save()
+    (bulk_task,) = Task.objects.bulk_create(
+        [
+            Task(
+                name="Bulk",
+                deadline="2030-01-01",
+                priority=Task.URGENT,
+                task_type_id=1,
+            )
+        ]
+    )
+
+    assert Task.objects.get(pk=task.pk).priority_rank == 4
+    assert Task.objects.get(pk=bulk_task.pk).priority_rank == 0
+    assert Task.rank_priority("unknown") == len(Task.PRIORITY_CHOICES)
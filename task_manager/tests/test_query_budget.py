@@ -0,0 +1,53 @@
+import logging
+
+import pytest
+from django.urls import reverse
+
+from ..query_budget import QueryBudgetExceeded, fingerprint
+
+
+def test_fingerprint():
+    assert (
+        fingerprint(
+            "SELECT * FROM t WHERE a = 'x' AND b IN (%s, %s, %s) LIMIT 21"
+        )
+        == "SELECT * FROM t WHERE a = ? AND b IN (...) LIMIT ?"
+    )
+
+
+class TestQueryBudgetMiddleware:
+    @pytest.mark.django_db
+    def test_raises_over_budget(self, task_data, employee_client, settings):
+        settings.QUERY_BUDGETS = {
+            "task_manager:task-detail": {"max_queries": 2}
+        }
+
+        with pytest.raises(QueryBudgetExceeded, match="ran 4 queries"):
+            employee_client.get(reverse("task_manager:task-detail", args=[1]))
+
+    @pytest.mark.django_db
+    def test_logs_over_budget(
+        self, task_data, employee_client, settings, caplog
+    ):
+        settings.QUERY_BUDGET_RAISE = False
+        settings.QUERY_BUDGETS = {
+            "task_manager:task-detail": {"max_queries": 2}
+        }
+
+        with caplog.at_level(logging.WARNING):
+            response = employee_client.get(
+                reverse("task_manager:task-detail", args=[1])
+            )
+
+        assert response.status_code == 200
+        assert "task_manager:task-detail ran 4 queries" in caplog.text
+        assert "task_manager_employee" in caplog.text
+
+    @pytest.mark.django_db
+    def test_time_budget(self, task_data, employee_client, settings):
+        settings.QUERY_BUDGETS = {
+            "task_manager:task-list": {"max_queries": 10, "max_time": 0}
+        }
+
+        with pytest.raises(QueryBudgetExceeded):
+            employee_client.get(reverse("task_manager:task-list"))
@@ -1,10 +1,21 @@
+import json
+
 import pytest
 from django.contrib.auth import get_user_model
+from django.contrib.messages import get_messages
+from django.db import connection
+from django.db.models.signals import post_delete
+from django.http import QueryDict
 from django.urls import reverse
 from django.utils.http import urlencode
 from pytest_django.asserts import assertRedirects, assertTemplateUsed
 
-from ..models import TaskType, Position, Task
+from .. import activity, views
+from ..counters import compute_counters
+from ..forms import TaskFilterForm
+from ..models import ActivityLog, TaskType, Position, Task, TaskEvent
+from ..pagination import encode_cursor, keyset_filter
+from ..signals import tasks_bulk_changed
 
 
 @pytest.mark.parametrize(
@@ -125,6 +136,65 @@ def test_login_required(url, client):
     )
 
 
+def _squash(response):
+    return "".join(
+        line.strip() for line in response.content.decode().splitlines()
+    )
+
+
+class TestIndexView:
+    @pytest.mark.django_db
+    def test_index_counters(self, task_data, employee_client):
+        response = employee_client.get(reverse("task_manager:index"))
+
+        assert response.status_code == 200
+        assert response.context["number_of_employees"] == 4
+        assert response.context["number_of_tasks"] == 2
+        assert response.context["outdated_tasks"] == 2
+
+    @pytest.mark.django_db
+    def test_index_counters_are_cached(
+        self, task_data, employee_client, django_assert_num_queries
+    ):
+        employee_client.get(reverse("task_manager:index"))
+
+        # Nothing is loaded on a warm cache, sessions and users included.
+        with django_assert_num_queries(0):
+            employee_client.get(reverse("task_manager:index"))
+
+    @pytest.mark.django_db
+    def test_index_counters_one_query(
+        self, task_data, django_assert_num_queries
+    ):
+        with django_assert_num_queries(1):
+            counters = compute_counters()
+
+        assert counters == {
+            "number_of_tasks": 2,
+            "urgent_tasks": 0,
+            "outdated_tasks": 2,
+            "number_of_employees": 3,
+        }
+
+        Task.objects.update(is_completed=True)
+
+        assert compute_counters()["number_of_employees"] == 3
+
+    @pytest.mark.django_db
+    def test_index_counters_invalidated_on_save(
+        self, task_data, employee_client
+    ):
+        employee_client.get(reverse("task_manager:index"))
+
+        task = Task.objects.get(pk=1)
+        task.priority = Task.URGENT
+        task.save()
+
+        response = employee_client.get(reverse("task_manager:index"))
+
+        assert response.context["urgent_tasks"] == 1
+
+
 class TestTaskTypeViews:
     @pytest.mark.django_db
     def test_task_type_list(self, task_type_data, employee_client):
@@ -335,6 +405,163 @@ class TestEmployeeViews:
 
         assert list(response.context["employee_list"]) == list(employees)
 
+    @pytest.mark.django_db
+    def test_employee_autocomplete(self, employee_data, employee_client):
+        url = reverse("task_manager:employee-autocomplete")
+
+        response = employee_client.get(url, {"q": "USER_O"})
+
+        assert response.json() == {
+            "results": [{"id": 1, "text": "user_one (User One)"}]
+        }
+        assert employee_client.get(url, {"q": "ser"}).json() == {"results": []}
+
+    @pytest.mark.django_db
+    def test_employee_autocomplete_matches_every_word(
+        self, employee_data, employee_client
+    ):
+        response = employee_client.get(
+            reverse("task_manager:employee-autocomplete"),
+            {"q": "us th", "limit": 1},
+        )
+
+        assert [row["text"] for row in response.json()["results"]] == [
+            "user_3 (User Three)"
+        ]
+
+    @pytest.mark.django_db
+    def test_employee_autocomplete_limit(self, employee_data, employee_client):
+        response = employee_client.get(
+            reverse("task_manager:employee-autocomplete"),
+            {"q": "u", "limit": 2},
+        )
+
+        assert len(response.json()["results"]) == 2
+
+    @pytest.mark.django_db
+    def test_employee_autocomplete_empty_query(self, employee_client):
+        response = employee_client.get(
+            reverse("task_manager:employee-autocomplete")
+        )
+
+        assert response.json() == {"results": []}
+
+
+class TestEmployeeWorkload:
+    @pytest.fixture
+    def workload_data(self, employee_data):
+        # user_one: 2 open (1 urgent, 1 overdue), user_2: 1 completed,
+        # user_3: nothing.
+        task_type = TaskType.objects.create(name="Chore")
+        tasks = [
+            ("Urgent", Task.URGENT, "2999-01-01", False, [1]),
+            ("Overdue", Task.LOW, "2000-01-01", False, [1]),
+            ("Done", Task.LOW, "2000-01-01", True, [2]),
+        ]
+
+        for name, priority, deadline, is_completed, assignees in tasks:
+            Task.objects.create(
+                name=name,
+                priority=priority,
+                deadline=deadline,
+                is_completed=is_completed,
+                task_type=task_type,
+            ).assignees.set(assignees)
+
+    def workloads(self, response):
+        return [
+            (
+                employee.username,
+                employee.open_tasks,
+                employee.urgent_tasks,
+                employee.overdue_tasks,
+                employee.completed_tasks,
+            )
+            for employee in response.context["employee_list"]
+        ]
+
+    @pytest.mark.django_db
+    def test_columns_in_one_query(
+        self, workload_data, employee_client, django_assert_num_queries
+    ):
+        # The user, on a cold cache, and the employees.
+        with django_assert_num_queries(2):
+            response = employee_client.get(
+                reverse("task_manager:employee-list")
+            )
+
+        assert self.workloads(response) == [
+            ("user_one", 2, 1, 1, 0),
+            ("user_2", 0, 0, 0, 1),
+            ("user_3", 0, 0, 0, 0),
+            ("test.client", 0, 0, 0, 0),
+        ]
+        assert b"Min. overdue" in response.content
+
+    @pytest.mark.django_db
+    def test_sort(self, workload_data, employee_client):
+        url = reverse("task_manager:employee-list")
+
+        response = employee_client.get(url, {"sort": "-completed_tasks"})
+
+        assert [row[0] for row in self.workloads(response)] == [
+            "user_2",
+            "test.client",
+            "user_3",
+            "user_one",
+        ]
+        assert response.context["workload_columns"][3] == {
+            "label": "completed",
+            "sort": "completed_tasks",
+            "sorted": True,
+            "descending": True,
+        }
+
+    @pytest.mark.django_db
+    def test_sort_cursor_pages(
+        self, workload_data, employee_client, monkeypatch
+    ):
+        monkeypatch.setattr(views.EmployeeListView, "paginate_by", 3)
+        url = reverse("task_manager:employee-list")
+
+        first = employee_client.get(url, {"sort": "open_tasks"})
+        second = employee_client.get(
+            url,
+            {
+                "sort": "open_tasks",
+                "cursor": first.context["page_obj"].next_cursor,
+            },
+        )
+
+        assert [row[0] for row in self.workloads(first)] == [
+            "user_2",
+            "user_3",
+            "test.client",
+        ]
+        assert [row[0] for row in self.workloads(second)] == ["user_one"]
+
+    @pytest.mark.django_db
+    def test_filter(self, workload_data, employee_client):
+        response = employee_client.get(
+            reverse("task_manager:employee-list"),
+            {"min_open_tasks": 1, "username": "user"},
+        )
+
+        assert self.workloads(response) == [("user_one", 2, 1, 1, 0)]
+
+    @pytest.mark.django_db
+    def test_invalid_filter(self, workload_data, employee_client):
+        response = employee_client.get(
+            reverse("task_manager:employee-list"),
+            {"min_open_tasks": -1, "min_completed_tasks": 1, "sort": "id"},
+        )
+
+        assert self.workloads(response) == [("user_2", 0, 0, 0, 1)]
+        assert response.context["workload_form"].errors.keys() == {
+            "min_open_tasks",
+            "sort",
+        }
+
 
 class TestTaskViews:
     @pytest.mark.django_db
@@ -358,6 +585,32 @@ class TestTaskViews:
 
         assert response.context_data["task"] == task
 
+    @pytest.mark.django_db
+    def test_task_detail_is_assigned(self, task_data, employee_client):
+        response = employee_client.get(
+            reverse("task_manager:task-detail", args=[1])
+        )
+
+        assert response.context["is_assigned"] is False
+
+        Task.objects.get(pk=1).assignees.add(response.wsgi_request.user)
+        response = employee_client.get(
+            reverse("task_manager:task-detail", args=[1])
+        )
+
+        assert response.context["is_assigned"] is True
+
+    @pytest.mark.django_db
+    def test_task_detail_query_count(
+        self, task_data, employee_client, django_assert_num_queries
+    ):
+        task = Task.objects.get(pk=1)
+        task.assignees.set(get_user_model().objects.all())
+
+        # User, task with its type, assignees, their positions.
+        with django_assert_num_queries(4):
+            employee_client.get(reverse("task_manager:task-detail", args=[1]))
+
     @pytest.mark.django_db
     def test_task_type_template(self, employee_client):
         response = employee_client.get(reverse("task_manager:task-list"))
@@ -415,6 +668,50 @@ class TestTaskViews:
         assert task.task_type.id == form_data["task_type"]
         assert task.assignees.get().id == form_data["assignees"]
 
+    @pytest.mark.django_db
+    def test_task_form_renders_only_selected_assignees(
+        self, task_data, employee_client
+    ):
+        response = employee_client.get(
+            reverse("task_manager:task-update", args=[1])
+        )
+        content = response.content.decode()
+
+        assert "data-autocomplete-url" in content
+        assert "user_one (User One)" in content
+        assert "user_2 (User Two)" not in content
+
+    @pytest.mark.django_db
+    def test_task_form_cost_does_not_depend_on_headcount(
+        self, task_type_data, employee_client, django_assert_num_queries
+    ):
+        get_user_model().objects.bulk_create(
+            get_user_model()(username=f"extra{index}", position_id=1)
+            for index in range(50)
+        )
+
+        # User, task types.
+        with django_assert_num_queries(2):
+            employee_client.get(reverse("task_manager:task-create"))
+
+    @pytest.mark.django_db
+    def test_task_form_rejects_unknown_assignee(
+        self, task_data, employee_client
+    ):
+        response = employee_client.post(
+            reverse("task_manager:task-update", args=[1]),
+            data={
+                "name": "TT51",
+                "deadline": "2322-01-04",
+                "priority": "LO",
+                "task_type": 1,
+                "assignees": 42,
+            },
+        )
+
+        assert response.status_code == 200
+        assert "assignees" in response.context["form"].errors
+
     @pytest.mark.django_db
     def test_delete_task(self, task_data, employee_client):
         task_id = 1
@@ -435,6 +732,98 @@ class TestTaskViews:
 
         assert list(response.context["task_list"]) == list(tasks)
 
+    @pytest.mark.django_db
+    def test_search_tasks_by_description(self, task_data, employee_client):
+        Task.objects.filter(pk=1).update(description="Crashes on login")
+
+        response = employee_client.get(
+            reverse("task_manager:task-list") + "?name=crash"
+        )
+
+        assert list(response.context["task_list"]) == [Task.objects.get(pk=1)]
+
+    @pytest.mark.django_db
+    def test_search_tasks_ranks_name_matches_first(
+        self, task_type_data, employee_client
+    ):
+        in_description = Task.objects.create(
+            name="Cleanup",
+            description="Remove the legacy exporter",
+            deadline="2022-01-01",
+            priority=Task.LOW,
+            task_type_id=1,
+        )
+        in_name = Task.objects.create(
+            name="Exporter rewrite",
+            deadline="2023-01-01",
+            priority=Task.LOW,
+            task_type_id=1,
+        )
+
+        response = employee_client.get(
+            reverse("task_manager:task-list") + "?name=export"
+        )
+
+        assert list(response.context["task_list"]) == [
+            in_name,
+            in_description,
+        ]
+
+    @pytest.mark.django_db
+    def test_task_list_cursor_pagination(
+        self, task_type_data, employee_client
+    ):
+        for day in range(1, 26):
+            Task.objects.create(
+                name=f"Task {day}",
+                deadline=f"2022-01-{day:02}",
+                priority=Task.LOW,
+                task_type_id=1,
+                is_completed=day % 2 == 0,
+            )
+        url = reverse("task_manager:task-list")
+
+        seen = []
+        response = employee_client.get(url)
+        seen += response.context["task_list"]
+
+        while response.context["page_obj"].has_next():
+            cursor = response.context["page_obj"].next_cursor
+            response = employee_client.get(url, {"cursor": cursor})
+            seen += response.context["task_list"]
+
+        assert seen == list(Task.objects.order_by("is_completed", "deadline"))
+
+        previous = response.context["page_obj"].previous_cursor
+        response = employee_client.get(url, {"cursor": previous})
+
+        assert list(response.context["task_list"]) == seen[10:20]
+
+    @pytest.mark.django_db
+    def test_task_list_invalid_cursor(self, employee_client):
+        response = employee_client.get(
+            reverse("task_manager:task-list"), {"cursor": "garbage"}
+        )
+
+        assert response.status_code == 404
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize(
+        "values",
+        [
+            [False, ["2022-01-01"], 1],
+            [False, {"year": 2022}, 1],
+            [False, "2022-01-01", [1]],
+        ],
+    )
+    def test_task_list_tampered_cursor(self, employee_client, values):
+        response = employee_client.get(
+            reverse("task_manager:task-list"),
+            {"cursor": encode_cursor(values)},
+        )
+
+        assert response.status_code == 404
+
     @pytest.mark.django_db
     def test_assign_to_task(self, task_data, employee_client):
         task_id = 1
@@ -458,3 +847,511 @@ class TestTaskViews:
 
         assert response_remove.status_code == 302
         assert user not in task.assignees.all()
+
+    @pytest.mark.django_db
+    def test_assign_to_task_json(self, task_data, employee_client):
+        url = reverse("task_manager:toggle-task-assign-json", args=[1])
+
+        response = employee_client.post(url)
+
+        assert response.json() == {"task": 1, "assigned": True}
+
+        response = employee_client.post(url)
+
+        assert response.json() == {"task": 1, "assigned": False}
+        assert (
+            response.wsgi_request.user
+            not in Task.objects.get(pk=1).assignees.all()
+        )
+
+    @pytest.mark.django_db
+    def test_assign_to_task_json_requires_post(
+        self, task_data, employee_client
+    ):
+        response = employee_client.get(
+            reverse("task_manager:toggle-task-assign-json", args=[1])
+        )
+
+        assert response.status_code == 405
+
+    @pytest.mark.django_db
+    def test_assign_to_missing_task(self, employee_client):
+        response = employee_client.get(
+            reverse("task_manager:toggle-task-assign", args=[42])
+        )
+
+        assert response.status_code == 404
+
+    @pytest.mark.django_db
+    def test_assign_cost_does_not_depend_on_history(
+        self, task_data, employee_client, django_assert_max_num_queries
+    ):
+        employee = get_user_model().objects.get(username="test.client")
+        for task in Task.objects.all():
+            task.assignees.add(employee)
+
+        # Session, user, task, savepoint, DELETE, INSERT, release, event.
+        with django_assert_max_num_queries(8):
+            employee_client.post(
+                reverse("task_manager:toggle-task-assign-json", args=[1])
+            )
+
+
+class TestTaskListFilters:
+    @pytest.fixture
+    def filter_data(self, task_type_data):
+        tasks = [
+            ("Low bug", Task.LOW, "2030-01-01", False, 1),
+            ("Urgent feature", Task.URGENT, "2030-03-01", False, 2),
+            ("Urgent bug", Task.URGENT, "2030-02-01", False, 1),
+            ("Done bug", Task.URGENT, "2020-01-01", True, 1),
+            ("High feature", Task.HIGH, "2029-01-01", False, 2),
+        ]
+
+        for name, priority, deadline, is_completed, task_type in tasks:
+            Task.objects.create(
+                name=name,
+                priority=priority,
+                deadline=deadline,
+                is_completed=is_completed,
+                task_type_id=task_type,
+            )
+
+    def names(self, client, **params):
+        response = client.get(reverse("task_manager:task-list"), params)
+
+        return [task.name for task in response.context["task_list"]]
+
+    @pytest.mark.django_db
+    def test_sort_by_priority(self, filter_data, employee_client):
+        assert self.names(employee_client, sort="priority") == [
+            "Urgent bug",
+            "Urgent feature",
+            "High feature",
+            "Low bug",
+            "Done bug",
+        ]
+
+    @pytest.mark.django_db
+    def test_sort_by_priority_cursor_pages(
+        self, filter_data, employee_client, monkeypatch
+    ):
+        monkeypatch.setattr(views.TaskListView, "paginate_by", 2)
+        url = reverse("task_manager:task-list")
+        names = []
+        cursor = None
+
+        while True:
+            params = {"sort": "priority"}
+
+            if cursor:
+                params["cursor"] = cursor
+
+            response = employee_client.get(url, params)
+            names += [task.name for task in response.context["task_list"]]
+
+            if not (cursor := response.context["page_obj"].next_cursor):
+                break
+
+        assert names == [
+            "Urgent bug",
+            "Urgent feature",
+            "High feature",
+            "Low bug",
+            "Done bug",
+        ]
+
+    @pytest.mark.django_db
+    def test_filters(self, filter_data, employee_client):
+        assert self.names(
+            employee_client, priority=[Task.URGENT, Task.HIGH], type=2
+        ) == ["High feature", "Urgent feature"]
+        assert self.names(employee_client, completed="true") == ["Done bug"]
+        assert self.names(
+            employee_client, completed="false", type=1, sort="priority"
+        ) == ["Urgent bug", "Low bug"]
+
+    @pytest.mark.django_db
+    def test_invalid_filters_are_ignored(self, filter_data, employee_client):
+        response = employee_client.get(
+            reverse("task_manager:task-list"),
+            {"priority": "XX", "type": "bug", "sort": "name"},
+        )
+
+        assert len(response.context["task_list"]) == 5
+        assert response.context["filter_form"].errors.keys() == {
+            "priority",
+            "type",
+            "sort",
+        }
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize("name", ["type", "assignee"])
+    @pytest.mark.parametrize("value", [str(2**64), "0"])
+    def test_out_of_range_ids_are_ignored(
+        self, filter_data, employee_client, name, value
+    ):
+        response = employee_client.get(
+            reverse("task_manager:task-list"), {name: value}
+        )
+
+        assert len(response.context["task_list"]) == 5
+        assert response.context["filter_form"].errors.keys() == {name}
+
+    @pytest.mark.django_db
+    def test_export_is_filtered(self, filter_data, employee_client):
+        response = employee_client.get(
+            reverse("task_manager:task-export", args=["ndjson"]),
+            {"priority": Task.HIGH},
+        )
+        rows = [
+            json.loads(line)
+            for line in b"".join(response.streaming_content).splitlines()
+        ]
+
+        assert [row["name"] for row in rows] == ["High feature"]
+
+    @pytest.mark.django_db
+    @pytest.mark.skipif(
+        connection.vendor != "sqlite", reason="SQLite query plans"
+    )
+    @pytest.mark.parametrize(
+        "params",
+        [
+            {},
+            {"sort": "priority"},
+            {"priority": Task.URGENT},
+            {"type": "1"},
+            {"type": "1", "sort": "priority"},
+            {"completed": "false", "sort": "priority"},
+        ],
+    )
+    def test_orderings_use_indexes(self, filter_data, params):
+        form = TaskFilterForm(QueryDict(urlencode(params)))
+        form.is_valid()
+        ordering = form.get_ordering()
+        task = Task.objects.get(name="High feature")
+        # A page after a cursor.
+        tasks = (
+            form.filter(Task.objects.select_related("task_type"))
+            .filter(
+                keyset_filter(
+                    ordering, [getattr(task, field) for field in ordering]
+                )
+            )
+            .order_by(*ordering)[:11]
+        )
+
+        assert "TEMP B-TREE" not in tasks.explain()
+
+
+class TestTaskTableFragments:
+    @pytest.mark.django_db
+    def test_rows_are_cached_until_their_task_changes(
+        self, task_data, employee_client
+    ):
+        url = reverse("task_manager:task-list")
+        employee_client.get(url)
+
+        Task.objects.filter(pk=1).update(name="Renamed bug")
+
+        assert "Renamed bug" not in employee_client.get(url).content.decode()
+
+        tasks_bulk_changed.send(sender=Task, task_ids=[1])
+
+        assert "Renamed bug" in employee_client.get(url).content.decode()
+
+    @pytest.mark.django_db
+    def test_toggle_completed_refreshes_row(self, task_data, employee_client):
+        url = reverse("task_manager:task-list")
+        row = (
+            'class="table-success"><td>'
+            '<input type="checkbox" name="tasks" value="1"'
+        )
+
+        assert row not in _squash(employee_client.get(url))
+
+        employee_client.get(
+            reverse("task_manager:toggle-task-completed", args=[1])
+        )
+
+        assert row in _squash(employee_client.get(url))
+
+    @pytest.mark.django_db
+    def test_task_type_rename_refreshes_rows(self, task_data, employee_client):
+        url = reverse("task_manager:task-list")
+        employee_client.get(url)
+
+        task_type = TaskType.objects.get(pk=1)
+        task_type.name = "Defect"
+        task_type.save()
+
+        assert "Defect" in employee_client.get(url).content.decode()
+
+    @pytest.mark.django_db
+    def test_employee_detail_shows_new_assignment(
+        self, task_data, employee_client
+    ):
+        employee = get_user_model().objects.get(pk=1)
+        url = reverse("task_manager:employee-detail", args=[employee.id])
+
+        assert (
+            "Test feature 1" not in employee_client.get(url).content.decode()
+        )
+
+        Task.objects.get(name="Test feature 1").assignees.add(employee)
+
+        assert "Test feature 1" in employee_client.get(url).content.decode()
+
+
+class TestTaskBulkActions:
+    def post(self, client, action, task_ids, **data):
+        return client.post(
+            reverse("task_manager:task-bulk"),
+            data={"action": action, "tasks": task_ids, **data},
+        )
+
+    @pytest.mark.django_db
+    def test_complete_and_incomplete(self, task_data, employee_client):
+        response = self.post(employee_client, "complete", [1, 3])
+
+        assertRedirects(response, reverse("task_manager:task-list"))
+        assert set(
+            Task.objects.filter(is_completed=True).values_list("id", flat=True)
+        ) == {1, 2, 3}
+
+        self.post(employee_client, "incomplete", [1, 2])
+
+        assert set(
+            Task.objects.filter(is_completed=True).values_list("id", flat=True)
+        ) == {3}
+
+    @pytest.mark.django_db
+    def test_set_priority(self, task_data, employee_client):
+        self.post(employee_client, "set_priority", [1, 2], priority="UR")
+
+        assert list(
+            Task.objects.order_by("id").values_list("priority", flat=True)
+        ) == ["UR", "UR", "Urgent"]
+        assert list(
+            Task.objects.order_by("id").values_list("priority_rank", flat=True)
+        ) == [0, 0, 5]
+
+    @pytest.mark.django_db
+    def test_assign_and_unassign(self, task_data, employee_client):
+        self.post(employee_client, "assign", [1, 2, 3], employee=1)
+
+        assert set(
+            Task.objects.filter(assignees=1).values_list("id", flat=True)
+        ) == {1, 2, 3}
+
+        self.post(employee_client, "unassign", [1, 2], employee=1)
+
+        assert set(
+            Task.objects.filter(assignees=1).values_list("id", flat=True)
+        ) == {3}
+        assert set(Task.objects.get(pk=2).assignees.all()) == set(
+            get_user_model().objects.filter(pk__in=[2, 3])
+        )
+
+    @pytest.mark.django_db
+    def test_delete(self, task_data, employee_client):
+        self.post(employee_client, "delete", [1, 2, 42])
+
+        assert list(Task.objects.values_list("id", flat=True)) == [3]
+        assert not Task.assignees.through.objects.filter(
+            task_id__in=[1, 2]
+        ).exists()
+
+    @pytest.mark.django_db
+    def test_query_count_does_not_depend_on_task_count(
+        self, task_data, employee_client, django_assert_max_num_queries
+    ):
+        Task.objects.bulk_create(
+            Task(
+                name=f"Bulk {index}",
+                deadline="2030-01-01",
+                priority="LO",
+                task_type_id=1,
+            )
+            for index in range(100)
+        )
+        task_ids = list(Task.objects.values_list("id", flat=True))
+
+        for action in ("complete", "set_priority", "assign", "unassign"):
+            # Session, user, employee, task IDs, the write, the tasks and
+            # the INSERT of their events, and the savepoint and release of
+            # the atomic block.
+            with django_assert_max_num_queries(9):
+                self.post(
+                    employee_client,
+                    action,
+                    task_ids,
+                    employee=1,
+                    priority="HI",
+                )
+
+    @pytest.mark.django_db
+    def test_delete_side_effects_do_not_depend_on_task_count(
+        self,
+        task_data,
+        employee_client,
+        django_assert_num_queries,
+        django_capture_on_commit_callbacks,
+    ):
+        Task.objects.bulk_create(
+            Task(
+                name=f"Bulk {index}",
+                deadline="2030-01-01",
+                priority="LO",
+                task_type_id=1,
+            )
+            for index in range(100)
+        )
+        task_ids = list(Task.objects.values_list("id", flat=True))
+        deletions = []
+        bulk_changes = []
+
+        def on_delete(sender, **kwargs):
+            deletions.append(sender)
+
+        def on_bulk_change(sender, **kwargs):
+            bulk_changes.append(kwargs["task_ids"])
+
+        post_delete.connect(on_delete, sender=Task)
+        tasks_bulk_changed.connect(on_bulk_change, sender=Task)
+
+        try:
+            # Employee, the tasks, the DELETE of their through rows and
+            # their own, the INSERT of their events and of their activity,
+            # and the savepoints and releases of the atomic blocks.
+            with django_assert_num_queries(
+                10
+            ), django_capture_on_commit_callbacks(execute=True):
+                self.post(employee_client, "delete", task_ids)
+        finally:
+            post_delete.disconnect(on_delete, sender=Task)
+            tasks_bulk_changed.disconnect(on_bulk_change, sender=Task)
+
+        assert not Task.objects.exists()
+        assert deletions == []
+        assert [set(changed) for changed in bulk_changes] == [set(task_ids)]
+        assert set(
+            TaskEvent.objects.filter(kind=TaskEvent.DELETED).values_list(
+                "task_id", flat=True
+            )
+        ) == set(task_ids)
+
+        activity.flush()
+
+        assert ActivityLog.objects.filter(
+            action=ActivityLog.DELETED
+        ).count() == len(task_ids)
+
+    @pytest.mark.django_db
+    def test_assign_requires_employee(self, task_data, employee_client):
+        response = self.post(employee_client, "assign", [1])
+
+        messages = [
+            str(message) for message in get_messages(response.wsgi_request)
+        ]
+
+        assert messages == ["employee: Choose an employee."]
+        assert not Task.objects.filter(assignees__isnull=True).exists()
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize("task_id", [2**64, 0, "one"])
+    def test_invalid_task_ids(self, task_data, employee_client, task_id):
+        response = self.post(employee_client, "complete", [1, task_id])
+
+        messages = [
+            str(message) for message in get_messages(response.wsgi_request)
+        ]
+
+        assert messages == ["tasks: Enter a list of IDs."]
+        assert not Task.objects.get(pk=1).is_completed
+
+    @pytest.mark.django_db
+    def test_redirects_back_to_local_pages_only(
+        self, task_data, employee_client
+    ):
+        response = self.post(
+            employee_client, "complete", [1], next="/tasks/?name=bug"
+        )
+
+        assertRedirects(
+            response, "/tasks/?name=bug", fetch_redirect_response=False
+        )
+
+        response = self.post(
+            employee_client, "complete", [1], next="https://example.com/"
+        )
+
+        assertRedirects(response, reverse("task_manager:task-list"))
+
+    @pytest.mark.django_db
+    def test_refreshes_cached_rows(self, task_data, employee_client):
+        url = reverse("task_manager:task-list")
+        employee_client.get(url)
+
+        self.post(employee_client, "set_priority", [1], priority="LO")
+
+        assert ">Low</td>" in employee_client.get(url).content.decode()
+
+
+class TestExportViews:
+    @pytest.mark.django_db
+    def test_export_tasks_csv(self, task_data, employee_client):
+        response = employee_client.get(
+            reverse("task_manager:task-export", args=["csv"])
+        )
+        lines = b"".join(response.streaming_content).decode().splitlines()
+
+        assert response["Content-Type"] == "text/csv"
+        assert lines[0] == (
+            "id,name,description,deadline,is_completed,priority,task_type,"
+            "assignees"
+        )
+        assert len(lines) == 4
+        assert "user_one;user_2;user_3" in lines[1]
+
+    @pytest.mark.django_db
+    def test_export_tasks_honors_search(self, task_data, employee_client):
+        response = employee_client.get(
+            reverse("task_manager:task-export", args=["ndjson"]),
+            {"name": "fea"},
+        )
+        rows = [
+            json.loads(line)
+            for line in b"".join(response.streaming_content).splitlines()
+        ]
+
+        assert [row["name"] for row in rows] == ["Test feature 1"]
+        assert rows[0]["task_type"] == "Feature request"
+        assert rows[0]["assignees"] == ["user_2", "user_3"]
+
+    @pytest.mark.django_db
+    def test_export_employees(self, employee_data, employee_client):
+        response = employee_client.get(
+            reverse("task_manager:employee-export", args=["ndjson"]),
+            {"username": "user_"},
+        )
+        rows = [
+            json.loads(line)
+            for line in b"".join(response.streaming_content).splitlines()
+        ]
+
+        assert [row["username"] for row in rows] == [
+            "user_one",
+            "user_2",
+            "user_3",
+        ]
+        assert rows[0]["position"] == "Intern"
+
+    @pytest.mark.django_db
+    def test_export_unknown_format(self, employee_client):
+        response = employee_client.get(
+            reverse("task_manager:task-export", args=["xml"])
+        )
+
+        assert response.status_code == 404
@@ -1,5 +1,7 @@
 from django.urls import path
 
+from . import api
+
 from .views import (
     index,
     TaskListView,
@@ -12,6 +14,8 @@ from .views import (
     EmployeeCreateView,
     EmployeePositionUpdateView,
     EmployeeDeleteView,
+    TaskHistoryView,
+    EmployeeHistoryView,
     TaskTypeListView,
     TaskTypeCreateView,
     TaskTypeUpdateView,
@@ -20,7 +24,14 @@ from .views import (
     PositionCreateView,
     PositionUpdateView,
     PositionDeleteView,
-    toggle_assign_to_task, task_toggle_completed,
+    toggle_assign_to_task,
+    toggle_assign_to_task_json,
+    task_toggle_completed,
+    task_bulk_action,
+    task_events,
+    export_tasks,
+    export_employees,
+    employee_autocomplete,
 )
 
 urlpatterns = [
@@ -68,17 +79,34 @@ urlpatterns = [
     path("tasks/", TaskListView.as_view(), name="task-list"),
     path("tasks/<int:pk>/", TaskDetailView.as_view(), name="task-detail"),
     path("tasks/create/", TaskCreateView.as_view(), name="task-create"),
+    path("tasks/bulk/", task_bulk_action, name="task-bulk"),
+    path("tasks/events/", task_events, name="task-events"),
+    path(
+        "tasks/export/<str:export_format>/",
+        export_tasks,
+        name="task-export",
+    ),
     path(
         "tasks/<int:pk>/update/", TaskUpdateView.as_view(), name="task-update"
     ),
     path(
         "tasks/<int:pk>/delete/", TaskDeleteView.as_view(), name="task-delete"
     ),
+    path(
+        "tasks/<int:pk>/history/",
+        TaskHistoryView.as_view(),
+        name="task-history",
+    ),
     path(
         "tasks/<int:pk>/toggle-assign/",
         toggle_assign_to_task,
         name="toggle-task-assign",
     ),
+    path(
+        "tasks/<int:pk>/toggle-assign/json/",
+        toggle_assign_to_task_json,
+        name="toggle-task-assign-json",
+    ),
     path(
         "tasks/<int:pk>/toggle-completed/",
         task_toggle_completed,
@@ -90,6 +118,21 @@ urlpatterns = [
         EmployeeDetailView.as_view(),
         name="employee-detail",
     ),
+    path(
+        "employees/<int:pk>/history/",
+        EmployeeHistoryView.as_view(),
+        name="employee-history",
+    ),
+    path(
+        "employees/autocomplete/",
+        employee_autocomplete,
+        name="employee-autocomplete",
+    ),
+    path(
+        "employees/export/<str:export_format>/",
+        export_employees,
+        name="employee-export",
+    ),
     path(
         "employees/create/",
         EmployeeCreateView.as_view(),
@@ -107,4 +150,25 @@ urlpatterns = [
     ),
 ]
 
+for resource, name in [
+    ("tasks", "task"),
+    ("employees", "employee"),
+    ("positions", "position"),
+    ("task-types", "task-type"),
+]:
+    urlpatterns += [
+        path(
+            f"api/{resource}/",
+            api.resource_list,
+            {"resource": resource},
+            name=f"api-{name}-list",
+        ),
+        path(
+            f"api/{resource}/<int:pk>/",
+            api.resource_detail,
+            {"resource": resource},
+            name=f"api-{name}-detail",
+        ),
+    ]
+
 app_name = "task_manager"
@@ -0,0 +1,31 @@
+"""
+URLs of the ASGI profile: the patterns of `urls.py`, with the read-heavy
+views replaced by their versions from `async_views.py`.
+"""
+
+from django.urls import path
+
+from . import async_views, urls
+
+ASYNC_VIEWS = {
+    "index": async_views.index,
+    "task-type-list": async_views.TaskTypeListView.as_view(),
+    "position-list": async_views.PositionListView.as_view(),
+    "task-list": async_views.TaskListView.as_view(),
+    "task-detail": async_views.TaskDetailView.as_view(),
+    "employee-list": async_views.EmployeeListView.as_view(),
+    "employee-detail": async_views.EmployeeDetailView.as_view(),
+    "task-events": async_views.task_events,
+}
+
+urlpatterns = [
+    path(
+        str(pattern.pattern),
+        ASYNC_VIEWS.get(pattern.name, pattern.callback),
+        pattern.default_args,
+        name=pattern.name,
+    )
+    for pattern in urls.urlpatterns
+]
+
+app_name = urls.app_name
@@ -1,44 +1,76 @@
 from datetime import date
 
-from django.contrib.auth import get_user_model
+from django import forms
+from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.http import HttpResponseRedirect
-from django.shortcuts import render
+from django.db.models import Prefetch, Q
+from django.http import (
+    Http404,
+    HttpResponse,
+    HttpResponseRedirect,
+    JsonResponse,
+    StreamingHttpResponse,
+)
+from django.shortcuts import get_object_or_404, render
+from django.template.defaultfilters import pluralize
 from django.urls import reverse_lazy
+from django.utils.functional import SimpleLazyObject, cached_property
+from django.utils.http import url_has_allowed_host_and_scheme
 from django.views import generic
+from django.views.decorators.http import require_POST
 from django.contrib.auth.mixins import LoginRequiredMixin
 
-from .models import Employee, Position, Task, TaskType
+from . import activity, events, exports, facets, fragments
+from .conditional import ConditionalResponseMixin
+from .counters import get_counters, workload_counts
+from .filters import filter_employees, filter_tasks, search_by_name
+from .models import (
+    ActivityLog,
+    ArchivedTask,
+    Employee,
+    Position,
+    Task,
+    TaskType,
+)
 from .forms import (
     EmployeeCreationForm,
     EmployeePositionUpdateForm,
     TaskForm,
+    TaskBulkActionForm,
+    TaskFilterForm,
     EmployeeSearchForm,
+    EmployeeWorkloadForm,
     ByNameSearchForm,
 )
+from .pagination import CursorPaginationMixin, MergedCursorPaginator
+from .query_budget import query_budget
 
+AUTOCOMPLETE_LIMIT = 10
+AUTOCOMPLETE_MAX_LIMIT = 50
 
-@login_required
-def index(request):
-    number_of_employees = get_user_model().objects.count()
 
-    tasks = Task.objects.filter(is_completed=False)
-    number_of_tasks = tasks.count()
-    urgent_tasks = tasks.filter(priority="UR").count()
-    outdated_tasks = tasks.filter(deadline__lt=date.today()).count()
+def include_archived(params) -> bool:
+    """The "Include archived" switch of the task pages."""
+    return forms.BooleanField().to_python(params.get("archived"))
 
-    context = {
-        "number_of_employees": number_of_employees,
-        "number_of_tasks": number_of_tasks,
-        "urgent_tasks": urgent_tasks,
-        "outdated_tasks": outdated_tasks,
-    }
+
+@query_budget(4)
+@login_required
+def index(request):
+    context = get_counters()
 
     return render(request, "task_manager/index.html", context=context)
 
 
-class TaskTypeListView(LoginRequiredMixin, generic.ListView):
+@query_budget(3)
+class TaskTypeListView(
+    LoginRequiredMixin,
+    ConditionalResponseMixin,
+    CursorPaginationMixin,
+    generic.ListView,
+):
     model = TaskType
+    conditional_models = (TaskType,)
     context_object_name = "task_type_list"
     template_name = "task_manager/task_type_list.html"
     paginate_by = 10
@@ -60,6 +92,7 @@ class TaskTypeListView(LoginRequiredMixin, generic.ListView):
         return self.queryset
 
 
+@query_budget(3)
 class TaskTypeCreateView(LoginRequiredMixin, generic.CreateView):
     model = TaskType
     context_object_name = "task_type"
@@ -68,6 +101,7 @@ class TaskTypeCreateView(LoginRequiredMixin, generic.CreateView):
     success_url = reverse_lazy("task_manager:task-type-list")
 
 
+@query_budget(4)
 class TaskTypeUpdateView(LoginRequiredMixin, generic.UpdateView):
     model = TaskType
     context_object_name = "task_type"
@@ -76,6 +110,7 @@ class TaskTypeUpdateView(LoginRequiredMixin, generic.UpdateView):
     success_url = reverse_lazy("task_manager:task-type-list")
 
 
+@query_budget(8)
 class TaskTypeDeleteView(LoginRequiredMixin, generic.DeleteView):
     model = TaskType
     context_object_name = "task_type"
@@ -83,8 +118,15 @@ class TaskTypeDeleteView(LoginRequiredMixin, generic.DeleteView):
     success_url = reverse_lazy("task_manager:task-type-list")
 
 
-class PositionListView(LoginRequiredMixin, generic.ListView):
+@query_budget(3)
+class PositionListView(
+    LoginRequiredMixin,
+    ConditionalResponseMixin,
+    CursorPaginationMixin,
+    generic.ListView,
+):
     model = Position
+    conditional_models = (Position,)
     paginate_by = 10
     queryset = Position.objects.all()
 
@@ -104,27 +146,48 @@ class PositionListView(LoginRequiredMixin, generic.ListView):
         return self.queryset
 
 
+@query_budget(3)
 class PositionCreateView(LoginRequiredMixin, generic.CreateView):
     model = Position
     fields = "__all__"
     success_url = reverse_lazy("task_manager:position-list")
 
 
+@query_budget(4)
 class PositionUpdateView(LoginRequiredMixin, generic.UpdateView):
     model = Position
     fields = "__all__"
     success_url = reverse_lazy("task_manager:position-list")
 
 
+@query_budget(8)
 class PositionDeleteView(LoginRequiredMixin, generic.DeleteView):
     model = Position
     success_url = reverse_lazy("task_manager:position-list")
 
 
-class TaskListView(LoginRequiredMixin, generic.ListView):
+@query_budget(5)
+class TaskListView(
+    LoginRequiredMixin,
+    ConditionalResponseMixin,
+    CursorPaginationMixin,
+    generic.ListView,
+):
     model = Task
+    # The tables of the facets too, see `facets._cache_key()`: the list
+    # filters and counts on assignees, and shows their usernames.
+    conditional_models = (
+        Task,
+        TaskType,
+        Task.assignees.through,
+        Employee,
+        ArchivedTask,
+        ArchivedTask.assignees.through,
+    )
     paginate_by = 10
+    cursor_ordering = TaskFilterForm.ORDERINGS["deadline"]
     queryset = Task.objects.select_related("task_type")
+    archived_queryset = ArchivedTask.objects.select_related("task_type")
 
     def get_context_data(self, *, object_list=None, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -132,70 +195,273 @@ class TaskListView(LoginRequiredMixin, generic.ListView):
         name = self.request.GET.get("name", "")
 
         context["search_form"] = ByNameSearchForm(initial={"name": name})
+        context["filter_form"] = self.filter_form
+        # Lazy, so the async view does not query from the event loop.
+        context["facets"] = SimpleLazyObject(
+            lambda: facets.get_task_facets(
+                search_by_name(Task.objects.all(), self.request.GET),
+                self.filter_form,
+                archive=(
+                    search_by_name(
+                        ArchivedTask.objects.all(), self.request.GET
+                    )
+                    if self.include_archived
+                    else None
+                ),
+            )
+        )
+        context["bulk_form"] = TaskBulkActionForm()
+        context["task_table_key"] = fragments.attach_versions(
+            context["task_list"]
+        )
 
         return context
 
-    def get_queryset(self):
-        if name := self.request.GET.get("name"):
-            return self.queryset.filter(name__icontains=name)
+    @cached_property
+    def filter_form(self):
+        form = TaskFilterForm(self.request.GET)
+        form.is_valid()
 
-        return self.queryset
+        return form
+
+    @cached_property
+    def include_archived(self) -> bool:
+        return include_archived(self.request.GET)
+
+    def get_etag_parts(self):
+        # The deadline facets and filters move at midnight.
+        return (*super().get_etag_parts(), date.today())
+
+    def get_cursor_ordering(self):
+        # Search results are ordered by relevance, so they use page
+        # numbers. Relevance does not compare across the task tables.
+        if self.request.GET.get("name") and not self.include_archived:
+            return None
 
+        return self.filter_form.get_ordering()
 
-class TaskDetailView(LoginRequiredMixin, generic.DetailView):
+    def get_cursor_paginator(self, queryset, page_size, ordering):
+        if self.include_archived:
+            return MergedCursorPaginator(
+                [
+                    queryset,
+                    filter_tasks(self.archived_queryset, self.request.GET),
+                ],
+                page_size,
+                ordering,
+            )
+
+        return super().get_cursor_paginator(queryset, page_size, ordering)
+
+    def get_queryset(self):
+        return filter_tasks(self.queryset, self.request.GET)
+
+
+@query_budget(5)
+class TaskDetailView(
+    LoginRequiredMixin, ConditionalResponseMixin, generic.DetailView
+):
     model = Task
+    conditional_models = (
+        Task,
+        TaskType,
+        Task.assignees.through,
+        Employee,
+        Position,
+        ArchivedTask,
+        ArchivedTask.assignees.through,
+    )
+    queryset = Task.objects.select_related("task_type").prefetch_related(
+        "assignees__position"
+    )
+    archived_queryset = ArchivedTask.objects.select_related(
+        "task_type"
+    ).prefetch_related("assignees__position")
+    # Archived tasks show on the same page.
+    context_object_name = "task"
+    template_name = "task_manager/task_detail.html"
+
+    def get_object(self, queryset=None):
+        try:
+            return super().get_object(queryset)
+        except Http404:
+            if not include_archived(self.request.GET):
+                raise
+
+        return super().get_object(self.archived_queryset)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+
+        context["assignees"] = self.object.assignees.all()
+        context["is_assigned"] = any(
+            employee.id == self.request.user.id
+            for employee in context["assignees"]
+        )
+
+        return context
 
 
+@query_budget(10)
 class TaskCreateView(LoginRequiredMixin, generic.CreateView):
     model = Task
     form_class = TaskForm
     success_url = reverse_lazy("task_manager:task-list")
 
+    def form_valid(self, form):
+        response = super().form_valid(form)
+        activity.record(ActivityLog.CREATED, [self.object], self.request.user)
 
+        return response
+
+
+@query_budget(13)
 class TaskUpdateView(LoginRequiredMixin, generic.UpdateView):
     model = Task
     form_class = TaskForm
     success_url = reverse_lazy("task_manager:task-list")
 
+    def form_valid(self, form):
+        response = super().form_valid(form)
+        form.log_activity(self.request.user)
+
+        return response
+
 
+@query_budget(8)
 class TaskDeleteView(LoginRequiredMixin, generic.DeleteView):
     model = Task
     success_url = reverse_lazy("task_manager:task-list")
 
+    def form_valid(self, form):
+        # `delete()` clears the primary key.
+        task = Task(id=self.object.id, name=self.object.name)
+        response = super().form_valid(form)
+        # Only once the task is gone: outside of a transaction, the entry
+        # is buffered at once.
+        activity.record(ActivityLog.DELETED, [task], self.request.user)
 
-class EmployeeListView(LoginRequiredMixin, generic.ListView):
+        return response
+
+
+@query_budget(3)
+class EmployeeListView(
+    LoginRequiredMixin,
+    ConditionalResponseMixin,
+    CursorPaginationMixin,
+    generic.ListView,
+):
     model = Employee
+    conditional_models = (Employee, Task, Task.assignees.through)
     paginate_by = 10
-    queryset = Employee.objects.prefetch_related("tasks")
+    queryset = Employee.objects.all()
 
     def get_context_data(self, *, object_list=None, **kwargs):
         context = super().get_context_data(**kwargs)
 
         username = self.request.GET.get("username", "")
+        sort = self.get_sort()
 
         context["search_form"] = EmployeeSearchForm(
             initial={"username": username}
         )
+        context["workload_form"] = self.workload_form
+        # Workloads sort in descending order first, busiest first.
+        context["workload_columns"] = [
+            {
+                "label": label,
+                "sort": field if sort == f"-{field}" else f"-{field}",
+                "sorted": sort.lstrip("-") == field,
+                "descending": sort == f"-{field}",
+            }
+            for field, label in EmployeeWorkloadForm.WORKLOAD_FIELDS
+        ]
 
         return context
 
-    def get_queryset(self):
-        if username := self.request.GET.get("username"):
-            return self.queryset.filter(username__icontains=username)
+    def get_etag_parts(self):
+        # Overdue counts change at midnight.
+        return (*super().get_etag_parts(), date.today())
 
-        return self.queryset
+    @cached_property
+    def workload_form(self):
+        form = EmployeeWorkloadForm(self.request.GET)
+        form.is_valid()
+
+        return form
+
+    def get_sort(self) -> str:
+        return self.workload_form.cleaned_data.get("sort", "")
+
+    def get_cursor_ordering(self):
+        if sort := self.get_sort():
+            return (sort, "-id" if sort.startswith("-") else "id")
+
+        return self.cursor_ordering
 
+    def get_queryset(self):
+        return self.workload_form.filter(
+            filter_employees(self.queryset, self.request.GET).annotate(
+                **workload_counts()
+            )
+        )
 
-class EmployeeDetailView(LoginRequiredMixin, generic.DetailView):
+
+@query_budget(6)
+class EmployeeDetailView(
+    LoginRequiredMixin, ConditionalResponseMixin, generic.DetailView
+):
     model = Employee
+    conditional_models = (
+        Employee,
+        Position,
+        Task,
+        TaskType,
+        Task.assignees.through,
+        ArchivedTask,
+        ArchivedTask.assignees.through,
+    )
     queryset = Employee.objects.prefetch_related("tasks__task_type")
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+
+        if include_archived(self.request.GET):
+            queryset = queryset.prefetch_related(
+                Prefetch(
+                    "archived_tasks",
+                    ArchivedTask.objects.select_related("task_type"),
+                )
+            )
+
+        return queryset
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+
+        context["include_archived"] = include_archived(self.request.GET)
+        context["task_list"] = list(self.object.tasks.all())
+
+        if context["include_archived"]:
+            context["task_list"] = sorted(
+                context["task_list"] + list(self.object.archived_tasks.all()),
+                key=lambda task: (task.is_completed, task.deadline, task.id),
+            )
+
+        context["task_table_key"] = fragments.attach_versions(
+            context["task_list"]
+        )
+
+        return context
+
 
+@query_budget(6)
 class EmployeeCreateView(LoginRequiredMixin, generic.CreateView):
     model = Employee
     form_class = EmployeeCreationForm
 
 
+@query_budget(6)
 class EmployeePositionUpdateView(LoginRequiredMixin, generic.UpdateView):
     model = Employee
     form_class = EmployeePositionUpdateForm
@@ -206,27 +472,239 @@ class EmployeePositionUpdateView(LoginRequiredMixin, generic.UpdateView):
         )
 
 
+@query_budget(8)
 class EmployeeDeleteView(LoginRequiredMixin, generic.DeleteView):
     model = Employee
     success_url = reverse_lazy("task_manager:employee-list")
 
 
+class ActivityListView(
+    LoginRequiredMixin, CursorPaginationMixin, generic.ListView
+):
+    """History of task changes, newest first, from `ActivityLog`."""
+
+    model = ActivityLog
+    paginate_by = 20
+    cursor_ordering = ("-ts", "-id")
+    context_object_name = "activity_list"
+    template_name = "task_manager/activity_list.html"
+
+    def get(self, request, *args, **kwargs):
+        # Show the changes still buffered by this process too.
+        activity.flush()
+
+        return super().get(request, *args, **kwargs)
+
+
+@query_budget(3)
+class TaskHistoryView(ActivityListView):
+    def get_queryset(self):
+        # Served by the `(task_id, ts, id)` index.
+        return ActivityLog.objects.filter(
+            task_id=self.kwargs["pk"]
+        ).select_related("actor")
+
+    def get_context_data(self, *, object_list=None, **kwargs):
+        context = super().get_context_data(**kwargs)
+
+        context["task_id"] = self.kwargs["pk"]
+
+        return context
+
+
+@query_budget(4)
+class EmployeeHistoryView(ActivityListView):
+    def get_queryset(self):
+        # Served by the `(actor_id, ts, id)` index.
+        return ActivityLog.objects.filter(
+            actor_id=self.kwargs["pk"]
+        ).select_related("actor")
+
+    def get_context_data(self, *, object_list=None, **kwargs):
+        context = super().get_context_data(**kwargs)
+
+        context["employee"] = get_object_or_404(Employee, pk=self.kwargs["pk"])
+
+        return context
+
+
+def toggle_assignee(request, task) -> bool:
+    """Assign or unassign the user of the request, and log it."""
+    assigned = task.toggle_assignee(request.user.id)
+    activity.record(
+        ActivityLog.ASSIGNED if assigned else ActivityLog.UNASSIGNED,
+        [task],
+        request.user,
+        employee=request.user.get_username(),
+    )
+
+    return assigned
+
+
+@query_budget(8)
 @login_required
 def toggle_assign_to_task(request, pk):
-    employee = Employee.objects.get(id=request.user.id)
-    if Task.objects.get(id=pk) in employee.tasks.all():
-        employee.tasks.remove(pk)
-    else:
-        employee.tasks.add(pk)
+    toggle_assignee(request, get_object_or_404(Task, pk=pk))
+
     return HttpResponseRedirect(
         reverse_lazy("task_manager:task-detail", args=[pk])
     )
 
 
+@query_budget(8)
+@login_required
+@require_POST
+def toggle_assign_to_task_json(request, pk):
+    assigned = toggle_assignee(request, get_object_or_404(Task, pk=pk))
+
+    return JsonResponse({"task": pk, "assigned": assigned})
+
+
+@query_budget(10)
+@login_required
+@require_POST
+def task_bulk_action(request):
+    form = TaskBulkActionForm(request.POST)
+
+    if form.is_valid():
+        count = form.save(actor=request.user)
+        messages.success(
+            request,
+            f"{dict(form.ACTION_CHOICES)[form.cleaned_data['action']]}: "
+            f"{count} task{pluralize(count)}.",
+        )
+    else:
+        for field, errors in form.errors.items():
+            for error in errors:
+                messages.error(request, f"{field}: {error}")
+
+    redirect_to = request.POST.get("next")
+
+    if not url_has_allowed_host_and_scheme(
+        redirect_to,
+        allowed_hosts={request.get_host()},
+        require_https=request.is_secure(),
+    ):
+        redirect_to = reverse_lazy("task_manager:task-list")
+
+    return HttpResponseRedirect(redirect_to)
+
+
+@query_budget(4)
 def task_toggle_completed(request, pk):
-    task = Task.objects.get(pk=pk)
+    task = Task.objects.select_related("task_type").get(pk=pk)
     task.toggle_completed()
+    activity.record(
+        ActivityLog.COMPLETED if task.is_completed else ActivityLog.REOPENED,
+        [task],
+        request.user,
+    )
 
     return HttpResponseRedirect(
         reverse_lazy("task_manager:task-detail", args=[pk])
     )
+
+
+@query_budget(3)
+@login_required
+def employee_autocomplete(request):
+    """
+    Employees whose username, first or last name start with each word of
+    `q`, as `{"results": [{"id": ..., "text": ...}]}`.
+    """
+    terms = request.GET.get("q", "").split()
+
+    try:
+        limit = int(request.GET.get("limit", AUTOCOMPLETE_LIMIT))
+    except ValueError:
+        limit = AUTOCOMPLETE_LIMIT
+
+    limit = max(1, min(limit, AUTOCOMPLETE_MAX_LIMIT))
+
+    if not terms:
+        return JsonResponse({"results": []})
+
+    condition = Q()
+
+    for term in terms:
+        condition &= (
+            Q(username__istartswith=term)
+            | Q(first_name__istartswith=term)
+            | Q(last_name__istartswith=term)
+        )
+
+    employees = (
+        Employee.objects.filter(condition)
+        .only("id", "username", "first_name", "last_name")
+        .order_by("username")[:limit]
+    )
+
+    return JsonResponse(
+        {
+            "results": [
+                {"id": employee.id, "text": str(employee)}
+                for employee in employees
+            ]
+        }
+    )
+
+
+def event_stream_response(body: str) -> HttpResponse:
+    response = HttpResponse(body, content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+
+    return response
+
+
+@query_budget(3)
+@login_required
+def task_events(request):
+    """
+    Server-Sent Events of the changes to tasks, as short polls: answers
+    at once with the events published since the client's last one, and
+    the client polls again after `events.RETRY`.
+    """
+    last_event_id = events.parse_last_event_id(request)
+
+    return event_stream_response(
+        events.render(last_event_id, list(events.events_after(last_event_id)))
+    )
+
+
+def _export_response(rows, fields, export_format, filename):
+    if export_format not in exports.FORMATS:
+        raise Http404("Unknown export format")
+
+    content_type, _ = exports.FORMATS[export_format]
+    response = StreamingHttpResponse(
+        exports.encode(rows, fields, export_format),
+        content_type=content_type,
+    )
+    response["Content-Disposition"] = (
+        f'attachment; filename="{filename}.{export_format}"'
+    )
+
+    return response
+
+
+@query_budget(4)
+@login_required
+def export_tasks(request, export_format):
+    tasks = filter_tasks(Task.objects.all(), request.GET)
+
+    return _export_response(
+        exports.task_rows(tasks), exports.TASK_FIELDS, export_format, "tasks"
+    )
+
+
+@query_budget(4)
+@login_required
+def export_employees(request, export_format):
+    employees = filter_employees(Employee.objects.all(), request.GET)
+
+    return _export_response(
+        exports.employee_rows(employees),
+        exports.EMPLOYEE_FIELDS,
+        export_format,
+        "employees",
+    )
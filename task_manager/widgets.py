@@ -0,0 +1,50 @@
+from django import forms
+
+
+class AutocompleteMixin:
+    """
+    Render only the selected options of a model choice field, and let
+    `js/autocomplete.js` fill in new ones from the JSON endpoint at `url`.
+    Rendering costs one query for the selected objects, whatever the size
+    of the field's queryset.
+    """
+
+    class Media:
+        js = ["js/autocomplete.js"]
+
+    def __init__(self, url, attrs=None):
+        super().__init__(attrs)
+        self.url = url
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        context["widget"]["attrs"]["data-autocomplete-url"] = str(self.url)
+
+        return context
+
+    def optgroups(self, name, value, attrs=None):
+        field = self.choices.field
+        selected = [pk for pk in value if str(pk).isdigit()]
+        options = [
+            self.create_option(
+                name,
+                field.prepare_value(obj),
+                field.label_from_instance(obj),
+                True,
+                index,
+                attrs=attrs,
+            )
+            for index, obj in enumerate(
+                field.queryset.filter(pk__in=selected) if selected else []
+            )
+        ]
+
+        return [(None, options, 0)]
+
+
+class AutocompleteSelect(AutocompleteMixin, forms.Select):
+    pass
+
+
+class AutocompleteSelectMultiple(AutocompleteMixin, forms.SelectMultiple):
+    pass